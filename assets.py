@@ -0,0 +1,356 @@
+# Общий кэш спрайтов: каждый PNG декодируется один раз за процесс
+#
+#   python assets.py --bake [--rotations]  - запечь атлас спрайтов в игровом масштабе
+import io
+import json
+import mmap
+import os
+import zipfile
+from collections import OrderedDict
+
+import pygame
+
+from settings import BLUE, RED, ROTATION_STEPS, ROTATION_BUDGET
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_ZIP = os.path.join(BASE_DIR, "assets.zip")
+ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+# Атлас: сырые пиксели RGBA всех спрайтов и индекс прямоугольников
+ATLAS_INDEX = os.path.join(BASE_DIR, "assets_atlas.json")
+ATLAS_PIXELS = os.path.join(BASE_DIR, "assets_atlas.rgba")
+ATLAS_VERSION = 1
+ATLAS_WIDTH = 1024
+
+# Спрайты, которые нужны в игре: (имя, масштаб)
+GAME_SPRITES = [
+    ("player", 0.3),
+    ("enemy", 0.3),
+    ("drunken_master", 0.3),
+    ("sniper", 0.3),
+    ("medkit", 0.5),
+    ("special", 0.6),
+]
+# Спрайты, которые поворачиваются
+ROTATED_SPRITES = GAME_SPRITES[:4]
+
+
+def source_signature(archive=ASSETS_ZIP):
+    # По размеру и времени изменения архива видно, что атлас устарел
+    if not os.path.exists(archive):
+        return None
+    stat = os.stat(archive)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+# Готовые спрайты из атласа: один файл без декодирования PNG,
+# спрайты - подповерхности одной большой поверхности
+class Atlas:
+    def __init__(self, surface, rects, buffer=None):
+        self.surface = surface
+        self.rects = rects  # (имя, масштаб, угол) -> (x, y, w, h)
+        self.buffer = buffer  # mmap с пикселями, пока поверхность на него ссылается
+        self.subsurfaces = {}
+
+    @classmethod
+    def load(cls, index=ATLAS_INDEX, pixels=ATLAS_PIXELS, archive=ASSETS_ZIP):
+        # None, если атлас не запечен или устарел: тогда спрайты грузятся из PNG
+        try:
+            with open(index) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != ATLAS_VERSION or meta.get("source") != source_signature(archive):
+            return None
+        width, height = meta["size"]
+        try:
+            with open(pixels, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(buffer) != width * height * 4:
+            buffer.close()
+            return None
+        surface = pygame.image.frombuffer(buffer, (width, height), "RGBA")
+        if pygame.display.get_surface() is not None:
+            # После конвертации поверхность владеет своими пикселями
+            surface = surface.convert_alpha()
+            buffer.close()
+            buffer = None
+        rects = {(name, scale, angle): tuple(rect) for name, scale, angle, *rect in meta["sprites"]}
+        return cls(surface, rects, buffer)
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def get(self, name, scale=0.3, angle=0):
+        key = (name, scale, angle)
+        surf = self.subsurfaces.get(key)
+        if surf is None:
+            rect = self.rects.get(key)
+            if rect is None:
+                return None
+            surf = self.surface.subsurface(rect)
+            self.subsurfaces[key] = surf
+        return surf
+
+
+class SpriteCache:
+    def __init__(self, archive=ASSETS_ZIP, directory=ASSETS_DIR, atlas=True,
+                 index=ATLAS_INDEX, pixels=ATLAS_PIXELS):
+        self.archive = archive
+        self.directory = directory
+        self.use_atlas = atlas
+        self.index = index
+        self.pixels = pixels
+        self.atlas = None  # Загружается при первом обращении
+        self.files = None  # имя файла -> байты (весь архив в памяти)
+        self.surfaces = {}  # (имя, масштаб, угол) -> Surface
+        self.hits = 0
+        self.misses = 0
+        self.disk_reads = 0
+
+    def _load_archive(self):
+        self.files = {}
+        if not os.path.exists(self.archive):
+            return
+        self.disk_reads += 1
+        with zipfile.ZipFile(self.archive) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    self.files[os.path.basename(info.filename)] = archive.read(info)
+
+    def read_file(self, filename):
+        if self.files is None:
+            self._load_archive()
+        data = self.files.get(filename)
+        if data is None:
+            # Запасной вариант - распакованная папка assets
+            path = os.path.join(self.directory, filename)
+            if not os.path.exists(path):
+                return None
+            self.disk_reads += 1
+            with open(path, "rb") as f:
+                data = f.read()
+            self.files[filename] = data
+        return data
+
+    def _decode(self, filename):
+        data = self.read_file(filename)
+        if data is None:
+            return None
+        try:
+            return pygame.image.load(io.BytesIO(data), filename)
+        except pygame.error:
+            return None
+
+    def get_atlas(self):
+        if self.use_atlas and self.atlas is None:
+            self.atlas = Atlas.load(self.index, self.pixels, self.archive)
+            self.use_atlas = self.atlas is not None
+        return self.atlas
+
+    def baked(self, name, scale=0.3, angle=0):
+        # Спрайт из атласа или None
+        atlas = self.get_atlas()
+        return atlas.get(name, scale, angle) if atlas is not None else None
+
+    def _build(self, name, scale, angle):
+        surf = self.baked(name, scale, angle)
+        if surf is not None:
+            return surf
+        image = self._decode(f"{name}.png")
+        if image is None:
+            # Если изображение не найдено, создаем заглушку
+            surf = pygame.Surface((30, 30), pygame.SRCALPHA)
+            pygame.draw.circle(surf, BLUE if "player" in name else RED, (15, 15), 15)
+            return surf
+
+        # Без окна (в тестах и инструментах) конвертация в формат экрана невозможна
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        if scale != 1.0:
+            size = image.get_size()
+            image = pygame.transform.scale(image, (int(size[0] * scale), int(size[1] * scale)))
+        if angle != 0:
+            image = pygame.transform.rotate(image, angle)
+        return image
+
+    def get(self, name, scale=0.3, angle=0):
+        key = (name, scale, angle)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self._build(name, scale, angle)
+        self.surfaces[key] = surf
+        return surf
+
+    def get_background(self, size):
+        key = ("background", size)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        self.misses += 1
+        image = self._decode("background.jpg")
+        if image is None:
+            surf = pygame.Surface(size)
+            surf.fill((50, 50, 50))  # Серый фон, если изображение не найдено
+        else:
+            if pygame.display.get_surface() is not None:
+                image = image.convert()
+            surf = pygame.transform.scale(image, size)
+        self.surfaces[key] = surf
+        return surf
+
+    def warm_up(self, sprites=GAME_SPRITES):
+        # Прогрев кэша до первого кадра (нужен уже созданный дисплей).
+        # Генератор: шаг на спрайт, чтобы прогрев можно было делить по кадрам
+        for name, scale in sprites:
+            self.get(name, scale)
+            yield
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_reads": self.disk_reads,
+            "surfaces": len(self.surfaces),
+            "atlas": self.atlas is not None,
+        }
+
+
+# Общий кэш на весь процесс
+sprites = SpriteCache()
+
+
+# Загрузка спрайтов
+def load_image(name, scale=0.3, angle=0):
+    return sprites.get(name, scale, angle)
+
+
+# Кэш поворотов одного спрайта: углы квантуются до steps шагов,
+# повернутые копии общие для всех экземпляров этого типа
+class RotationCache:
+    def __init__(self, image, steps=ROTATION_STEPS, budget=ROTATION_BUDGET, baked=None):
+        self.image = image
+        self.baked = baked  # угол -> готовый поворот из атласа или None
+        self.steps = steps
+        self.step = 360 / steps
+        self.budget = budget  # Максимум байт под повернутые копии
+        self.used = 0
+        self.frames = OrderedDict()  # индекс угла -> Surface (LRU)
+        self.hits = 0
+        self.misses = 0
+
+    def index(self, angle):
+        return int(round(angle / self.step)) % self.steps
+
+    def _rotate(self, index):
+        surf = self.baked(index * self.step) if self.baked is not None else None
+        if surf is None:
+            surf = pygame.transform.rotate(self.image, index * self.step)
+        size = surf.get_width() * surf.get_height() * surf.get_bytesize()
+        self.frames[index] = surf
+        self.used += size
+        # Вытесняем самые старые повороты при превышении бюджета
+        while self.used > self.budget and len(self.frames) > 1:
+            _, old = self.frames.popitem(last=False)
+            self.used -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surf
+
+    def get(self, angle):
+        # Аналог pygame.transform.rotate(image, angle)
+        index = self.index(angle)
+        surf = self.frames.get(index)
+        if surf is not None:
+            self.hits += 1
+            self.frames.move_to_end(index)
+            return surf
+        self.misses += 1
+        return self._rotate(index)
+
+    def build(self):
+        # Заранее строим все повороты (в пределах бюджета); генератор,
+        # шаг на поворот
+        for index in range(self.steps):
+            if index not in self.frames:
+                self._rotate(index)
+            yield
+
+
+rotation_caches = {}
+
+
+def get_rotations(name, scale=0.3):
+    key = (name, scale)
+    cache = rotation_caches.get(key)
+    if cache is None:
+        cache = RotationCache(sprites.get(name, scale),
+                              baked=lambda angle: sprites.baked(name, scale, angle))
+        rotation_caches[key] = cache
+    return cache
+
+
+def warm_up_rotations(sprites_list=ROTATED_SPRITES):
+    for name, scale in sprites_list:
+        yield from get_rotations(name, scale).build()
+
+
+def pack(sizes, width=ATLAS_WIDTH):
+    # Раскладка по полкам: самые высокие спрайты первыми, каждая полка - строка
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x = 0
+            y += shelf
+            shelf = 0
+        positions[i] = (x, y)
+        x += w + 1  # Зазор в пиксель между спрайтами
+        shelf = max(shelf, h + 1)
+    return positions, y + shelf
+
+
+def bake_atlas(rotations=False, index=ATLAS_INDEX, pixels=ATLAS_PIXELS, archive=ASSETS_ZIP):
+    # Спрайты собираются тем же кодом, что и в игре, поэтому пиксели совпадают
+    cache = SpriteCache(archive, atlas=False)
+    keys = [(name, scale, 0) for name, scale in GAME_SPRITES]
+    if rotations:
+        step = 360 / ROTATION_STEPS
+        keys += [(name, scale, index * step) for name, scale in ROTATED_SPRITES
+                 for index in range(1, ROTATION_STEPS)]
+    images = []
+    for name, scale, angle in keys:
+        image = cache.get(name, scale)
+        images.append(pygame.transform.rotate(image, angle) if angle else image)
+    positions, height = pack([image.get_size() for image in images])
+    atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+    entries = []
+    for (name, scale, angle), image, (x, y) in zip(keys, images, positions):
+        atlas.blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        entries.append([name, scale, angle, x, y, image.get_width(), image.get_height()])
+    with open(pixels, "wb") as f:
+        f.write(pygame.image.tobytes(atlas, "RGBA"))
+    with open(index, "w") as f:
+        json.dump({"version": ATLAS_VERSION, "source": source_signature(archive),
+                   "size": [ATLAS_WIDTH, height], "sprites": entries}, f)
+    return len(entries), ATLAS_WIDTH, height
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Атлас спрайтов")
+    parser.add_argument("--bake", action="store_true", help="запечь атлас из assets.zip")
+    parser.add_argument("--rotations", action="store_true", help="добавить в атлас все повороты")
+    args = parser.parse_args()
+    if args.bake:
+        count, width, height = bake_atlas(args.rotations)
+        print(f"{count} спрайтов, атлас {width}x{height} ({width * height * 4 // 1024} КБ)")
+    else:
+        atlas = Atlas.load()
+        print("атлас готов" if atlas is not None else "атлас не запечен или устарел")
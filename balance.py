@@ -0,0 +1,181 @@
+# Пакетный прогон игр без окна для подбора параметров появления врагов
+#
+#   python balance.py --games 1000 --grid drunken_chance=0.2,0.3,0.4 --grid enemy_interval=45,60
+#   python balance.py --policy random --max-seconds 300 --csv games.csv
+#
+# Каждая комбинация параметров из сетки играется --games раз на всех ядрах;
+# итоги по уже завершенным играм печатаются по мере поступления
+import argparse
+import csv
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from settings import WIDTH, HEIGHT, TICK_RATE
+from profiler import percentile
+from world import (World, SpawnRules, Controls, SPAWN_FIELDS, ENEMY_TYPES,
+                   nearest_enemy_policy, run_headless)
+
+
+# Случайный игрок: держит направление несколько тиков и стреляет куда попало
+class RandomPolicy:
+    def __init__(self, seed, hold=30, fire_chance=0.3):
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.fire_chance = fire_chance
+        self.keys = Controls()
+        self.timer = 0
+
+    def __call__(self, world):
+        rng = self.rng
+        self.timer -= world.dt
+        if self.timer <= 0:
+            self.keys = Controls(rng.random() < 0.5, rng.random() < 0.5, rng.random() < 0.5, rng.random() < 0.5)
+            self.timer = rng.randint(1, self.hold)
+        clicks = ()
+        # Шанс выстрела задан на тик; за шаг в dt тиков - хотя бы одна попытка из dt
+        chance = self.fire_chance if world.dt == 1 else 1 - (1 - self.fire_chance) ** world.dt
+        if rng.random() < chance:
+            x, y = world.camera.to_world(rng.randrange(WIDTH), rng.randrange(HEIGHT))
+            clicks = ((1, x, y),)
+        return self.keys, clicks
+
+
+POLICIES = {
+    "nearest": lambda seed: nearest_enemy_policy,
+    "random": RandomPolicy,
+}
+
+
+def play(params, seeds, policy, max_ticks, walls=0, tick_rate=TICK_RATE):
+    # Выполняется в процессе-работнике: несколько игр одной комбинации параметров
+    games = []
+    for seed in seeds:
+        world = World(seed, SpawnRules(**params), walls=walls, tick_rate=tick_rate)
+        world, _, _ = run_headless(max_ticks, POLICIES[policy](seed), world)
+        game = {"seed": seed, "survival": world.game_time / 60, "score": world.score,
+                "timeout": world.running}
+        for name in ENEMY_TYPES:
+            game["kills_" + name] = world.kills[name]
+        games.append(game)
+    return games
+
+
+METRICS = ("survival", "score") + tuple("kills_" + name for name in ENEMY_TYPES)
+
+
+def summarize(games):
+    summary = {"games": len(games), "timeouts": sum(game["timeout"] for game in games)}
+    for metric in METRICS:
+        values = [game[metric] for game in games]
+        summary[metric] = {
+            "mean": sum(values) / len(values),
+            "p10": percentile(values, 10),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+        }
+    return summary
+
+
+def parse_grid(items):
+    # "name=1,2,3" -> ("name", [1, 2, 3]); тип значения берется из SpawnRules
+    defaults = SpawnRules().as_dict()
+    grid = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        if name not in defaults:
+            raise SystemExit(f"неизвестный параметр {name!r}, доступны: {', '.join(SPAWN_FIELDS)}")
+        kind = type(defaults[name])
+        grid[name] = [kind(value) for value in values.split(",")]
+    return grid
+
+
+def combinations(grid):
+    names = list(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def label(params):
+    return " ".join(f"{name}={value}" for name, value in params.items()) or "по умолчанию"
+
+
+def print_table(rows):
+    header = f"{'параметры':40s} {'игр':>6s} {'таймаут':>7s}"
+    for metric in METRICS:
+        header += f" {metric:>22s}"
+    print(header)
+    for params, summary in rows:
+        line = f"{label(params):40s} {summary['games']:6d} {summary['timeouts']:7d}"
+        for metric in METRICS:
+            stats = summary[metric]
+            cell = f"{stats['mean']:.1f} ({stats['p10']:.0f}/{stats['p50']:.0f}/{stats['p90']:.0f})"
+            line += f" {cell:>22s}"
+        print(line)
+    print("в скобках p10/p50/p90; survival в секундах")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетный подбор параметров появления врагов")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2",
+                        help="значения параметра SpawnRules (можно повторять)")
+    parser.add_argument("--games", type=int, default=200, help="игр на каждую комбинацию")
+    parser.add_argument("--policy", choices=POLICIES, default="nearest")
+    parser.add_argument("--max-seconds", type=int, default=600, help="ограничение длины игры")
+    parser.add_argument("--walls", type=int, default=0, help="стен на площадь экрана")
+    parser.add_argument("--seed", type=int, default=0, help="seed первой игры")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE,
+                        help="шагов симуляции в секунду игры (делитель 60; 20-30 - быстрее, но грубее)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=10, help="игр в одном задании")
+    parser.add_argument("--csv", metavar="FILE", help="сохранить результаты каждой игры")
+    args = parser.parse_args(argv)
+    if args.tick_rate <= 0 or TICK_RATE % args.tick_rate:
+        parser.error(f"--tick-rate должен быть делителем {TICK_RATE}")
+
+    # Все комбинации играются на одних и тех же seed, так их проще сравнивать
+    configs = list(combinations(parse_grid(args.grid)))
+    seeds = list(range(args.seed, args.seed + args.games))
+    max_ticks = args.max_seconds * 60
+    results = [[] for _ in configs]
+    start = time.perf_counter()
+    total = len(configs) * len(seeds)
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {}
+        for index, params in enumerate(configs):
+            for first in range(0, len(seeds), args.chunk):
+                chunk = seeds[first:first + args.chunk]
+                future = executor.submit(play, params, chunk, args.policy, max_ticks, args.walls, args.tick_rate)
+                futures[future] = index
+        for future in as_completed(futures):
+            index = futures[future]
+            games = future.result()
+            results[index].extend(games)
+            done += len(games)
+            summary = summarize(results[index])
+            print(f"[{done}/{total} {time.perf_counter() - start:.1f} с] {label(configs[index])}: "
+                  f"{summary['games']} игр, выживание {summary['survival']['mean']:.1f} с, "
+                  f"счет {summary['score']['mean']:.1f}", flush=True)
+
+    print()
+    print_table([(params, summarize(games)) for params, games in zip(configs, results)])
+
+    if args.csv:
+        fields = list(SPAWN_FIELDS) + ["seed", "timeout"] + list(METRICS)
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fields)
+            writer.writeheader()
+            for params, games in zip(configs, results):
+                rules = SpawnRules(**params).as_dict()
+                for game in sorted(games, key=lambda game: game["seed"]):
+                    writer.writerow({**rules, **game})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+# Набор сценариев для замера времени кадра по фазам
+#
+#   python benchmark.py                        - все сценарии, итог в JSON
+#   python benchmark.py -o new.json --baseline old.json --tolerance 0.25
+#                                              - ошибка, если фаза стала медленнее
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+import pygame
+
+from settings import WIDTH, HEIGHT
+from projectiles import NORMAL, EXPLOSIVE, EXPLOSION_RADIUS, BULLET_SPEED
+from effects import EXPLOSION_TIME
+from entities import Enemy, DrunkenMaster, Sniper, Medkit, SpecialAttackItem
+from world import World, Controls
+from particles import ParticleSystem
+from display import Display, DISPLAY_MODES
+from profiler import percentile
+
+PHASES = ("events", "movement", "collision", "particles", "drawing", "flip")
+
+# Сценарии: враги каждого типа, живые пули игрока, взрывы, предметы, стены на экран,
+# частицы (поддерживается не меньше заданного числа)
+SCENARIOS = {
+    "idle": dict(enemies=0, drunken=0, snipers=0, bullets=0, explosions=0, pickups=0),
+    "early_wave": dict(enemies=10, drunken=0, snipers=0, bullets=5, explosions=0, pickups=1),
+    "late_wave": dict(enemies=60, drunken=20, snipers=10, bullets=40, explosions=2, pickups=4),
+    "bullet_hell": dict(enemies=20, drunken=0, snipers=20, bullets=2000, explosions=0, pickups=0),
+    "grenades": dict(enemies=40, drunken=0, snipers=0, bullets=0, explosions=8, pickups=0),
+    "horde": dict(enemies=700, drunken=200, snipers=100, bullets=200, explosions=2, pickups=4),
+    "maze": dict(enemies=300, drunken=60, snipers=20, bullets=40, explosions=0, pickups=0, walls=12),
+    "particles": dict(enemies=60, drunken=0, snipers=0, bullets=40, explosions=0, pickups=0, particles=20000),
+}
+
+
+class Scenario:
+    def __init__(self, name, enemies=0, drunken=0, snipers=0, bullets=0, explosions=0, pickups=0, walls=0,
+                 particles=0, seed=0):
+        self.name = name
+        self.counts = {Enemy: enemies, DrunkenMaster: drunken, Sniper: snipers}
+        self.bullets = bullets
+        self.explosions = explosions
+        self.pickups = pickups
+        self.world = World(seed, walls=walls)
+        self.world.spawning = False
+        self.world.particles = ParticleSystem(seed=seed)
+        self.particles = particles
+        self.rng = self.world.rng
+
+    def _place(self, entity):
+        # Враги расставляются по всему экрану, а не только по краям
+        entity.x = self.rng.uniform(0, WIDTH)
+        entity.y = self.rng.uniform(0, HEIGHT)
+        return entity
+
+    def refill(self):
+        # Поддерживаем заданное число объектов (вне замеряемых фаз)
+        world = self.world
+        world.player.health = world.player.max_health
+        world.running = True
+        have = {cls: 0 for cls in self.counts}
+        for enemy in world.enemies:
+            have[type(enemy)] += 1
+        for cls, count in self.counts.items():
+            for _ in range(count - have[cls]):
+                # Из пула, как в игре: убитые враги возвращаются новыми
+                if cls is Sniper:
+                    enemy = world.pool.acquire(Sniper, world.projectiles, self.rng, world.next_sniper_id())
+                else:
+                    enemy = world.pool.acquire(cls, self.rng)
+                world.enemies.append(self._place(enemy))
+
+        projectiles = world.projectiles
+        shots, _, grenades = projectiles.partition()
+        for _ in range(self.bullets - len(shots)):
+            angle = self.rng.uniform(0, 2 * math.pi)
+            projectiles.spawn(self.rng.uniform(0, WIDTH), self.rng.uniform(0, HEIGHT),
+                              math.cos(angle) * BULLET_SPEED, math.sin(angle) * BULLET_SPEED,
+                              radius=5, kind=NORMAL)
+        for _ in range(self.explosions - len(grenades)):
+            i = projectiles.spawn(self.rng.uniform(0, WIDTH), self.rng.uniform(0, HEIGHT), radius=10,
+                                  kind=EXPLOSIVE, timer=EXPLOSION_TIME, blast=EXPLOSION_RADIUS, contact=True)
+            projectiles.exploded[i] = True
+
+        while len(world.medkits) + len(world.special_items) < self.pickups:
+            if len(world.medkits) <= len(world.special_items):
+                world.medkits.append(world.pool.acquire(Medkit, self.rng))
+            else:
+                world.special_items.append(world.pool.acquire(SpecialAttackItem, self.rng))
+
+        while len(world.particles) < self.particles:
+            world.particles.explosion(self.rng.uniform(0, WIDTH), self.rng.uniform(0, HEIGHT), EXPLOSION_RADIUS)
+
+
+def summarize(samples):
+    # samples - время фазы в наносекундах по тикам; итог в миллисекундах
+    return {
+        "mean": sum(samples) / len(samples) / 1e6,
+        "p95": percentile(samples, 95) / 1e6,
+        "p99": percentile(samples, 99) / 1e6,
+    }
+
+
+def run_scenario(scenario, screen, renderer, ticks):
+    world = scenario.world
+    timings = {phase: [] for phase in PHASES}
+    keys = Controls()
+    clock = time.perf_counter_ns
+    for tick in range(ticks):
+        scenario.refill()
+        # Игрок бегает по кругу и стреляет
+        keys = Controls(left=tick % 120 < 60, right=tick % 120 >= 60)
+        clicks = ((1, WIDTH // 2, 0),)
+
+        t0 = clock()
+        pygame.event.pump()
+        t1 = clock()
+        world.handle_input(((keys, clicks),))
+        world.spawn()
+        world.update_items()
+        world.move_enemies()
+        t2 = clock()
+        world.collide()
+        t3 = clock()
+        world.update_particles()
+        t4 = clock()
+        renderer.draw(world)
+        t5 = clock()
+        renderer.present()
+        t6 = clock()
+
+        timings["events"].append(t1 - t0)
+        timings["movement"].append(t2 - t1)
+        timings["collision"].append(t3 - t2)
+        timings["particles"].append(t4 - t3)
+        timings["drawing"].append(t5 - t4)
+        timings["flip"].append(t6 - t5)
+    result = {phase: summarize(samples) for phase, samples in timings.items()}
+    frame = [sum(parts) for parts in zip(*timings.values())]
+    result["frame"] = summarize(frame)
+    return result
+
+
+def compare(results, baseline, tolerance):
+    # Регрессия: среднее или p95 фазы выросли больше чем на tolerance
+    failures = []
+    for name, phases in results["scenarios"].items():
+        old_phases = baseline.get("scenarios", {}).get(name)
+        if old_phases is None:
+            continue
+        for phase, stats in phases.items():
+            old = old_phases.get(phase)
+            if old is None:
+                continue
+            for metric in ("mean", "p95"):
+                limit = old[metric] * (1 + tolerance)
+                # Доли миллисекунды не считаются регрессией: это шум таймера
+                if stats[metric] > limit and stats[metric] - old[metric] > 0.05:
+                    failures.append(f"{name}/{phase} {metric}: {old[metric]:.3f} -> {stats[metric]:.3f} мс")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры времени кадра по фазам")
+    parser.add_argument("scenarios", nargs="*", help="имена сценариев (по умолчанию все)")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", metavar="FILE", help="сохранить результаты в JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="JSON предыдущего прогона для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимое замедление (0.25 = 25%%)")
+    parser.add_argument("--window", action="store_true", help="рисовать в настоящее окно")
+    parser.add_argument("--display", choices=DISPLAY_MODES, default="window", help="вывод кадра, как в игре")
+    parser.add_argument("--scale", type=int, default=2, help="масштаб для --display integer")
+    args = parser.parse_args(argv)
+
+    if not args.window:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    display = Display(args.display, args.scale)
+    screen = display.canvas
+    from render import Renderer
+    renderer = Renderer(screen, pygame.font.SysFont(None, 36), display)
+    renderer.warm_up(None)
+
+    names = args.scenarios or list(SCENARIOS)
+    results = {
+        "meta": {
+            "ticks": args.ticks,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "video_driver": pygame.display.get_driver(),
+            "display": args.display,
+            "window_size": list(display.window.get_size()),
+        },
+        "scenarios": {},
+        "pools": {},  # Сколько объектов создано и сколько взято из пула
+    }
+    for name in names:
+        scenario = Scenario(name, seed=args.seed, **SCENARIOS[name])
+        stats = run_scenario(scenario, screen, renderer, args.ticks)
+        results["scenarios"][name] = stats
+        pool = scenario.world.pool
+        results["pools"][name] = {"created": pool.created, "reused": pool.reused}
+        print(name)
+        for phase, values in stats.items():
+            print(f"  {phase:10s} mean {values['mean']:7.3f}  p95 {values['p95']:7.3f}  p99 {values['p99']:7.3f} мс")
+        print(f"  пул: создано {pool.created}, повторно {pool.reused}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.tolerance)
+        if failures:
+            print("Регрессия производительности:")
+            for line in failures:
+                print("  " + line)
+            return 1
+        print("Регрессий нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
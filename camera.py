@@ -0,0 +1,37 @@
+# Камера: видимая часть арены вокруг игрока
+from settings import WIDTH, HEIGHT, ARENA_WIDTH, ARENA_HEIGHT, ACTIVE_MARGIN, FAR_MARGIN
+
+
+class Camera:
+    def __init__(self, arena_width=ARENA_WIDTH, arena_height=ARENA_HEIGHT, width=WIDTH, height=HEIGHT):
+        # Арена не меньше экрана
+        self.arena_width = max(arena_width, width)
+        self.arena_height = max(arena_height, height)
+        self.width = width
+        self.height = height
+        self.scrolls = self.arena_width > width or self.arena_height > height
+        self.x = 0
+        self.y = 0
+
+    def follow(self, x, y):
+        # Игрок в центре экрана, но камера не выходит за края арены;
+        # координаты целые, чтобы спрайты не дрожали при прокрутке
+        self.x = min(max(0, int(x) - self.width // 2), self.arena_width - self.width)
+        self.y = min(max(0, int(y) - self.height // 2), self.arena_height - self.height)
+
+    def view(self, margin=0):
+        # (left, top, right, bottom) видимой области в координатах мира
+        return (self.x - margin, self.y - margin,
+                self.x + self.width + margin, self.y + self.height + margin)
+
+    def active_bounds(self):
+        # Где живут пули: экран с запасом, но не дальше краев арены
+        left, top, right, bottom = self.view(ACTIVE_MARGIN)
+        return max(0, left), max(0, top), min(self.arena_width, right), min(self.arena_height, bottom)
+
+    def far_bounds(self):
+        # За этими границами враги двигаются упрощенно; на арене в один экран их нет
+        return self.view(FAR_MARGIN) if self.scrolls else None
+
+    def to_world(self, x, y):
+        return x + self.x, y + self.y
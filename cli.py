@@ -0,0 +1,16 @@
+# Разбор аргументов командной строки, общий для игры и сервера. Модуль не
+# тянет pygame, чтобы сервер запускался без графики
+import argparse
+
+from settings import WIDTH, HEIGHT
+
+
+def arena_size(text):
+    # "3200x2400" -> (3200, 2400); координаты нажатий в записи - 16-битные
+    try:
+        width, height = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("ожидается WxH, например 3200x2400")
+    if not (WIDTH <= width <= 32767 and HEIGHT <= height <= 32767):
+        raise argparse.ArgumentTypeError(f"арена от {WIDTH}x{HEIGHT} до 32767x32767")
+    return width, height
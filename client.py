@@ -0,0 +1,352 @@
+# Клиент совместной игры: ввод уходит на сервер, а свой игрок двигается
+# сразу (предсказание) и поправляется по снимкам сервера; чужие игроки,
+# враги и пули рисуются по снимкам с небольшой задержкой и интерполяцией
+import argparse
+import math
+import random
+import socket
+import time
+from collections import deque
+
+import numpy as np
+
+from settings import TICK_RATE, NET_PORT, INTERP_DELAY
+from camera import Camera
+from enemy_ai import CHASER, DRUNKEN, SNIPER
+from entities import Player, Medkit, SpecialAttackItem
+from navigation import ObstacleMap
+from pipeline import Snapshot, EnemyFrame
+from projectiles import ProjectilePool, NORMAL, EXPLOSIVE, OWNER_PLAYER
+from world import Controls
+from net import (PROTOCOL, HELLO, WELCOME, FULL, SNAPSHOT, BYE, MAX_PACKET, HELLO_PACKET, WELCOME_PACKET,
+                 BYE_PACKET, SNAPSHOT_HEADER, SHOT_EXPLOSIVE, SHOT_ENEMY, SHOT_EXPLODED, VELOCITY_SCALE,
+                 LossyChannel, NetStats, pack_buttons, unpack_buttons, pack_input, decode_snapshot, angle_degrees)
+
+MAX_HEALTH = {CHASER: 30, DRUNKEN: 40, SNIPER: 30}  # Как у классов врагов
+PLAYER_HEALTH = 100  # Как у Player
+HELLO_INTERVAL = 0.5  # Секунд между попытками подключения
+FRAME_BUFFER = 16  # Сколько последних снимков держать для интерполяции
+MAX_PENDING = 256  # Больше неподтвержденных вводов - сервер, видимо, пропал
+
+
+# Игрок из снимка: только то, что нужно для отрисовки и HUD
+class RemotePlayer:
+    __slots__ = ("x", "y", "angle", "health", "max_health", "special_attacks")
+
+    def __init__(self, x, y, angle, health, special_attacks):
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.health = health
+        self.max_health = PLAYER_HEALTH
+        self.special_attacks = special_attacks
+
+
+def projectile_pool(shots):
+    # Снаряды снимка в пул, который умеет себя рисовать
+    n = len(shots)
+    pool = ProjectilePool(max(1, n))
+    pool.x[:n] = shots["x"]
+    pool.y[:n] = shots["y"]
+    pool.vx[:n] = shots["vx"] / VELOCITY_SCALE
+    pool.vy[:n] = shots["vy"] / VELOCITY_SCALE
+    flags = shots["flags"]
+    pool.kind[:n] = np.where(flags & SHOT_EXPLOSIVE, EXPLOSIVE, NORMAL)
+    pool.owner[:n] = np.where(flags & SHOT_ENEMY, OWNER_PLAYER + 1, OWNER_PLAYER)
+    pool.exploded[:n] = flags & SHOT_EXPLODED != 0
+    pool.radius[:n] = shots["radius"]
+    pool.timer[:n] = shots["timer"]
+    pool.blast[:n] = shots["blast"]
+    pool.alive[:n] = True
+    pool.count = n
+    return pool
+
+
+# Снимок сервера в том виде, в каком его рисует Renderer.draw_snapshot
+class NetFrame(Snapshot):
+    def __init__(self, data, slot, arena, obstacles):
+        self.time = time.perf_counter()
+        self.tick = data.tick
+        self.game_time = data.game_time
+        self.score = data.score
+        self.running = data.running
+        self.obstacles = obstacles
+        self.camera = Camera(*arena)
+        self.players = [RemotePlayer(int(p["x"]), int(p["y"]), float(angle_degrees(p["angle"])), int(p["health"]),
+                                     int(p["special"])) for p in data.players]
+        self.player = self.players[slot]
+        enemies = data.enemies
+        ai = enemies["ai"].astype(np.int8)
+        self.enemies = EnemyFrame(enemies["uid"].astype(np.int64), enemies["x"].astype(np.float64),
+                                  enemies["y"].astype(np.float64), angle_degrees(enemies["angle"]), ai,
+                                  enemies["health"].tolist(), [MAX_HEALTH[kind] for kind in ai.tolist()])
+        self.projectiles = projectile_pool(data.projectiles)
+        self.medkits = []
+        self.special_items = []
+        for kind, visible, x, y, timer in data.items.tolist():
+            item = Medkit() if kind == 0 else SpecialAttackItem()
+            item.x, item.y = x, y
+            item.visible = bool(visible)
+            if kind:
+                item.animation_timer = timer
+                self.special_items.append(item)
+            else:
+                self.medkits.append(item)
+        self.particles = None
+        self.particle_frame = None
+
+
+class NetClient:
+    def __init__(self, address, loss=0.0, latency=0, jitter=0, seed=None):
+        self.server = address
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("", 0))
+        self.sock.setblocking(False)
+        self.channel = LossyChannel(self.sock, loss, latency, jitter, seed)
+        self.nonce = random.getrandbits(32)
+        self.slot = None  # Номер своего игрока, известен после WELCOME
+        self.players = 0
+        self.arena = None
+        self.tick_rate = TICK_RATE  # Шагов в секунду: с этой частотой клиент шлет ввод
+        self.dt = 1  # Тиков по 1/60 с за шаг, как у мира на сервере
+        self.snapshot_every = 1
+        self.obstacles = None
+        self.player = None  # Свой игрок с предсказанным положением
+        self.pending = deque()  # Вводы (номер, кнопки, x, y), которые сервер еще не применил
+        self.seq = 0
+        self.states = {}  # Тик -> враги полученного снимка (базы для разностей)
+        self.frames = deque(maxlen=FRAME_BUFFER)
+        self.last_tick = 0
+        self.last_time = 0.0
+        self.last_hello = 0.0
+        self.full = False
+        self.finished = False  # Сервер сообщил о конце игры
+        self.snapshots = 0
+        self.lost_baselines = 0  # Снимки, которые не разобрать: нет базового
+        self.corrections = 0  # Расхождения предсказания с сервером
+        self.max_correction = 0.0
+        self.stats = NetStats()
+
+    def send(self, data):
+        self.stats.sent(len(data))
+        self.channel.send(data, self.server)
+
+    def poll(self):
+        while True:
+            try:
+                data, address = self.sock.recvfrom(MAX_PACKET)
+            except (BlockingIOError, InterruptedError):
+                break
+            except ConnectionResetError:
+                continue
+            if address != self.server or not data:
+                continue
+            self.stats.received(len(data))
+            kind = data[0]
+            if kind == WELCOME:
+                self.welcome(data)
+            elif kind == FULL:
+                self.full = True
+            elif kind == SNAPSHOT and self.slot is not None:
+                self.receive_snapshot(data)
+        self.channel.flush()
+
+    def welcome(self, data):
+        _, slot, players, nonce, width, height, tick_rate, snapshot_rate = WELCOME_PACKET.unpack(data)
+        if nonce != self.nonce or self.slot is not None:
+            return
+        self.slot = slot
+        self.players = players
+        self.arena = (width, height)
+        self.tick_rate = tick_rate
+        self.dt = TICK_RATE // tick_rate
+        self.snapshot_every = max(1, round(tick_rate / snapshot_rate))  # В шагах сервера
+        self.obstacles = ObstacleMap(width, height)  # Сервер играет без стен
+
+    def receive_snapshot(self, data):
+        # Снимки, пришедшие позже более нового, не нужны
+        if SNAPSHOT_HEADER.unpack_from(data)[1] <= self.last_tick:
+            return
+        snapshot = decode_snapshot(data, self.states)
+        if snapshot is None:
+            self.lost_baselines += 1
+            return
+        states = self.states
+        for tick in [tick for tick in states if tick < snapshot.baseline]:
+            del states[tick]
+        states[snapshot.tick] = snapshot.enemies
+        self.last_tick = snapshot.tick
+        self.last_time = time.perf_counter()
+        self.snapshots += 1
+        self.frames.append(NetFrame(snapshot, self.slot, self.arena, self.obstacles))
+        self.reconcile(snapshot)
+        if not snapshot.running:
+            self.finished = True
+
+    def reconcile(self, snapshot):
+        # Положение с сервера после ввода input_seq, поверх - еще не
+        # примененные сервером вводы; при точном предсказании ничего не меняется
+        own = snapshot.players[self.slot]
+        player = self.player
+        first = player is None
+        if first:
+            player = self.player = Player(arena=self.arena)
+        predicted = (player.x, player.y)
+        player.x, player.y = int(own["x"]), int(own["y"])
+        player.health = int(own["health"])
+        player.special_attacks = int(own["special"])
+        pending = self.pending
+        while pending and pending[0][0] <= snapshot.input_seq:
+            pending.popleft()
+        if player.health > 0:
+            for _, bits, x, y in pending:
+                player.move(unpack_buttons(bits, x, y)[0], self.dt)
+        error = math.hypot(player.x - predicted[0], player.y - predicted[1])
+        if error > 0 and not first:
+            self.corrections += 1
+            self.max_correction = max(self.max_correction, error)
+
+    def tick(self, keys, clicks=()):
+        # Один тик клиента: ввод сразу двигает своего игрока и уходит на сервер
+        if self.slot is None:
+            now = time.perf_counter()
+            if now - self.last_hello >= HELLO_INTERVAL:
+                self.last_hello = now
+                self.send(HELLO_PACKET.pack(HELLO, PROTOCOL, self.nonce))
+            self.channel.flush()
+            return
+        self.seq += 1
+        self.pending.append((self.seq,) + pack_buttons(keys, clicks))
+        if len(self.pending) > MAX_PENDING:
+            self.pending.popleft()
+        if self.player is not None and self.player.health > 0:
+            self.player.move(keys, self.dt)
+        self.send(pack_input(self.slot, self.last_tick, list(self.pending)))
+        self.channel.flush()
+
+    def view(self):
+        # (предыдущий снимок, следующий, доля) для кадра: мир показывается с
+        # отставанием INTERP_DELAY интервалов между снимками, свой игрок и
+        # камера - в предсказанном положении; None - снимков еще нет.
+        # Номера снимков - game_time сервера, то есть тики по 1/60 с
+        frames = self.frames
+        if not frames:
+            return None
+        now = time.perf_counter()
+        render_tick = (self.last_tick + (now - self.last_time) * TICK_RATE
+                       - INTERP_DELAY * self.snapshot_every * self.dt)
+        previous = current = None
+        for frame in frames:
+            if frame.tick <= render_tick:
+                previous = frame
+            else:
+                current = frame
+                break
+        if current is None:
+            current, previous, alpha = frames[-1], None, 1.0
+        elif previous is None:
+            alpha = 1.0
+        else:
+            alpha = (render_tick - previous.tick) / (current.tick - previous.tick)
+        player = self.player
+        for frame in (previous, current):
+            if frame is not None:
+                own = frame.players[self.slot]
+                own.x, own.y, own.angle = player.x, player.y, player.angle
+                frame.camera.follow(player.x, player.y)
+        return previous, current, alpha
+
+    def camera(self):
+        # Камера для перевода нажатий мыши в координаты арены
+        camera = Camera(*self.arena) if self.arena is not None else Camera()
+        if self.player is not None:
+            camera.follow(self.player.x, self.player.y)
+        return camera
+
+    def close(self):
+        # BYE мимо имитации сети: выход не должен теряться
+        if self.slot is not None:
+            for _ in range(3):
+                try:
+                    self.sock.sendto(BYE_PACKET.pack(BYE, self.slot), self.server)
+                except OSError:
+                    break
+        self.sock.close()
+
+    def report(self):
+        stats = self.stats
+        elapsed = stats.elapsed()
+        text = (f"игрок {self.slot + 1 if self.slot is not None else '?'}: "
+                f"снимков {self.snapshots / elapsed:.0f}/с, вх {stats.bytes_in / elapsed / 1024:.1f} КБ/с, "
+                f"исх {stats.bytes_out / elapsed / 1024:.1f} КБ/с, ввод без ответа {len(self.pending)}, "
+                f"поправок {self.corrections} (до {self.max_correction:.0f} px), "
+                f"без базы {self.lost_baselines}, потеряно исх {self.channel.dropped}")
+        stats.reset()
+        self.snapshots = 0
+        return text
+
+
+def parse_address(text):
+    # "host:port" или "host" (порт по умолчанию)
+    host, _, port = text.rpartition(":")
+    if not host:
+        return socket.gethostbyname(text), NET_PORT
+    return socket.gethostbyname(host), int(port)
+
+
+def bot_input(client, tick):
+    # Бот: ходит зигзагом и стреляет в ближайшего врага из последнего снимка
+    keys = Controls(left=tick % 120 < 60, right=tick % 120 >= 60, up=tick % 180 < 90, down=tick % 180 >= 90)
+    clicks = ()
+    if client.frames and client.player is not None:
+        enemies = client.frames[-1].enemies
+        if len(enemies):
+            dx = enemies.x - client.player.x
+            dy = enemies.y - client.player.y
+            i = int((dx * dx + dy * dy).argmin())
+            clicks = ((1, int(enemies.x[i]), int(enemies.y[i])),)
+    return keys, clicks
+
+
+def run_bot(address, seconds=30, loss=0.0, latency=0, jitter=0, seed=None, report_interval=1.0, log=print):
+    # Клиент без окна с фиксированным шагом сервера (до WELCOME - TICK_RATE):
+    # для проверки сервера и сети
+    client = NetClient(address, loss, latency, jitter, seed)
+    start = next_tick = next_report = time.perf_counter()
+    tick = 0
+    try:
+        while time.perf_counter() - start < seconds and not client.finished and not client.full:
+            client.poll()
+            now = time.perf_counter()
+            if now >= next_tick:
+                client.tick(*bot_input(client, tick))
+                tick += 1
+                next_tick += 1 / client.tick_rate
+            if report_interval and now >= next_report:
+                next_report = now + report_interval
+                if client.slot is not None:
+                    log(client.report())
+            time.sleep(max(0.0, min(next_tick, next_report) - time.perf_counter()))
+    finally:
+        client.close()
+    return client
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hotline Podolsk: бот совместной игры без окна")
+    parser.add_argument("server", nargs="?", default=f"127.0.0.1:{NET_PORT}", help="адрес сервера host:port")
+    parser.add_argument("--seconds", type=float, default=30, help="сколько играть")
+    parser.add_argument("--loss", type=float, default=0.0, help="доля теряемых исходящих пакетов (0-1)")
+    parser.add_argument("--latency", type=float, default=0, help="задержка исходящих пакетов, мс")
+    parser.add_argument("--jitter", type=float, default=0, help="случайная добавка к задержке, до мс")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    client = run_bot(parse_address(args.server), args.seconds, args.loss, args.latency, args.jitter, args.seed)
+    if client.full:
+        print("на сервере нет свободных мест")
+    elif client.slot is None:
+        print("сервер не ответил")
+
+
+if __name__ == "__main__":
+    main()
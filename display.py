@@ -0,0 +1,60 @@
+# Окно и внутреннее разрешение: игра всегда рисует кадр WIDTH x HEIGHT,
+# а на окно он попадает без перерисовки сцены в большем размере
+#
+#   window     - окно размером с кадр
+#   scaled     - pygame.SCALED: SDL увеличивает кадр на видеокарте (целый шаг под экран)
+#   fullscreen - pygame.SCALED на весь экран, с полосами по краям
+#   integer    - окно в scale раз больше, кадр увеличивается одним transform.scale
+import pygame
+
+from settings import WIDTH, HEIGHT
+
+DISPLAY_MODES = ("window", "scaled", "fullscreen", "integer")
+
+
+class Display:
+    def __init__(self, mode="window", scale=2, size=(WIDTH, HEIGHT)):
+        if mode not in DISPLAY_MODES:
+            raise ValueError(f"unknown display mode {mode!r}")
+        self.mode = mode
+        self.size = size
+        self.scale = scale if mode == "integer" else 1
+        if mode == "scaled":
+            self.window = pygame.display.set_mode(size, pygame.SCALED)
+        elif mode == "fullscreen":
+            self.window = pygame.display.set_mode(size, pygame.SCALED | pygame.FULLSCREEN)
+        else:
+            self.window = pygame.display.set_mode((size[0] * self.scale, size[1] * self.scale))
+        # При SCALED поверхность окна уже имеет внутреннее разрешение,
+        # и SDL сам пересчитывает координаты мыши
+        if self.scale == 1:
+            self.canvas = self.window
+        else:
+            self.canvas = pygame.Surface(size).convert()
+
+    def mouse_pos(self):
+        # Позиция мыши в координатах кадра
+        x, y = pygame.mouse.get_pos()
+        return x // self.scale, y // self.scale
+
+    def flip(self):
+        if self.scale != 1:
+            pygame.transform.scale(self.canvas, self.window.get_size(), self.window)
+        pygame.display.flip()
+
+    def update(self, rects):
+        # Как pygame.display.update: увеличиваются только измененные области
+        if self.scale == 1:
+            pygame.display.update(rects)
+            return
+        s = self.scale
+        bounds = self.canvas.get_rect()
+        dirty = []
+        for rect in rects:
+            area = bounds.clip(rect)
+            if area:
+                target = pygame.Rect(area.x * s, area.y * s, area.width * s, area.height * s)
+                pygame.transform.scale(self.canvas.subsurface(area), target.size,
+                                       self.window.subsurface(target))
+                dirty.append(target)
+        pygame.display.update(dirty)
@@ -0,0 +1,55 @@
+# Заранее отрисованные кадры визуальных эффектов
+import pygame
+
+EXPLOSION_TIME = 30
+EXPLOSION_RING_STEP = 10
+
+
+class ExplosionFrames:
+    # Кадры взрыва одного радиуса: по одной поверхности на каждое значение
+    # таймера, общие для всех одновременных взрывов
+    def __init__(self, radius, duration=EXPLOSION_TIME, ring_step=EXPLOSION_RING_STEP):
+        self.radius = radius
+        self.duration = duration
+        self.ring_step = ring_step
+        self.frames = [None] * (duration + 1)
+
+    def _bake(self, timer):
+        size = self.radius * 2
+        frame = pygame.Surface((size, size), pygame.SRCALPHA)
+        alpha = int(255 * timer / self.duration)
+        # Кольца от большего к меньшему, как при отрисовке по одному
+        for r in range(self.radius, 0, -self.ring_step):
+            color = (255, min(165, 165 + r), 0, alpha)
+            ring = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+            pygame.draw.circle(ring, color, (r, r), r)
+            frame.blit(ring, (self.radius - r, self.radius - r))
+        return frame
+
+    def frame(self, timer):
+        timer = max(0, min(self.duration, int(timer)))
+        surf = self.frames[timer]
+        if surf is None:
+            surf = self._bake(timer)
+            self.frames[timer] = surf
+        return surf
+
+    def build(self):
+        # Все кадры заранее; генератор, шаг на кадр (прогрев при запуске)
+        for timer in range(self.duration + 1):
+            self.frame(timer)
+            yield
+
+    def submit(self, queue, layer, x, y, timer):
+        queue.add(layer, self.frame(timer), (x - self.radius, y - self.radius))
+
+
+explosions = {}
+
+
+def get_explosion(radius):
+    frames = explosions.get(radius)
+    if frames is None:
+        frames = ExplosionFrames(radius)
+        explosions[radius] = frames
+    return frames
@@ -0,0 +1,270 @@
+# Хранилище состояния врагов в массивах и пакетное (векторное) управление ими
+import math
+
+import numpy as np
+
+from projectiles import NORMAL
+
+# Типы поведения
+CHASER = 0  # Идет прямо на игрока
+DRUNKEN = 1  # Шатается и уворачивается
+SNIPER = 2  # Держит дистанцию и стреляет
+
+WANDER_OFFSET = 50
+SNIPER_MIN_DISTANCE = 300
+SNIPER_MAX_DISTANCE = 400
+SNIPER_FIRE_DISTANCE = 500
+SNIPER_BULLET_SPEED = 7
+SNIPER_COOLDOWN = 60
+
+# Поля врага, которые хранятся в массивах хранилища
+FLOAT_FIELDS = ("x", "y", "speed", "angle", "radius", "dodge_dx", "dodge_dy", "random_angle")
+INT_FIELDS = ("dodge_timer", "direction_change_timer", "shoot_cooldown")
+
+
+class StoreField:
+    # Атрибут, который живет в объекте, пока враг не добавлен в хранилище,
+    # и в массиве хранилища после добавления
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.private = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj.store is None:
+            return getattr(obj, self.private)
+        return getattr(obj.store, self.name)[obj.slot].item()
+
+    def __set__(self, obj, value):
+        if obj.store is None:
+            setattr(obj, self.private, value)
+        else:
+            getattr(obj.store, self.name)[obj.slot] = value
+
+
+class StoredEnemy:
+    __slots__ = ("store", "slot", "uid") + tuple("_" + name for name in FLOAT_FIELDS + INT_FIELDS)
+    ai = CHASER
+
+    def __init__(self):
+        self.store = None
+        self.slot = -1
+        self.uid = 0  # Номер врага для сети; объект из пула получает новый
+
+    x = StoreField()
+    y = StoreField()
+    speed = StoreField()
+    angle = StoreField()
+    radius = StoreField()
+    dodge_dx = StoreField()
+    dodge_dy = StoreField()
+    random_angle = StoreField()
+    dodge_timer = StoreField()
+    direction_change_timer = StoreField()
+    shoot_cooldown = StoreField()
+
+    @property
+    def dodge_vector(self):
+        return [self.dodge_dx, self.dodge_dy]
+
+    @dodge_vector.setter
+    def dodge_vector(self, value):
+        self.dodge_dx, self.dodge_dy = value
+
+
+class EnemyStore:
+    def __init__(self, capacity=256, rng=None):
+        self.items = []
+        self.counts = [0, 0, 0]  # Количество врагов каждого типа
+        self.next_uid = 1
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        for name in FLOAT_FIELDS:
+            setattr(self, name, np.zeros(capacity, np.float64))
+        for name in INT_FIELDS:
+            setattr(self, name, np.zeros(capacity, np.int32))
+        self.ai = np.zeros(capacity, np.int8)
+
+    def _arrays(self):
+        return [getattr(self, name) for name in FLOAT_FIELDS + INT_FIELDS] + [self.ai]
+
+    def _grow(self):
+        old = self._arrays()
+        n = len(self.items)
+        self._allocate(self.capacity * 2)
+        for new, prev in zip(self._arrays(), old):
+            new[:n] = prev[:n]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __contains__(self, enemy):
+        return enemy.store is self
+
+    def append(self, enemy):
+        if len(self.items) == self.capacity:
+            self._grow()
+        slot = len(self.items)
+        for name in FLOAT_FIELDS + INT_FIELDS:
+            getattr(self, name)[slot] = getattr(enemy, "_" + name, 0)
+        self.ai[slot] = enemy.ai
+        self.counts[enemy.ai] += 1
+        enemy.uid = self.next_uid
+        self.next_uid += 1
+        enemy.store = self
+        enemy.slot = slot
+        self.items.append(enemy)
+
+    def remove(self, enemy):
+        if enemy.store is not self:
+            raise ValueError("enemy not in store")
+        slot = enemy.slot
+        # Возвращаем состояние в сам объект, чтобы его можно было читать дальше
+        for name in FLOAT_FIELDS + INT_FIELDS:
+            setattr(enemy, "_" + name, getattr(self, name)[slot].item())
+        enemy.store = None
+        enemy.slot = -1
+        self.counts[enemy.ai] -= 1
+        # Удаление обменом с последним элементом
+        last = len(self.items) - 1
+        if slot != last:
+            for a in self._arrays():
+                a[slot] = a[last]
+            moved = self.items[last]
+            moved.slot = slot
+            self.items[slot] = moved
+        self.items.pop()
+
+    def clear(self):
+        for enemy in self.items[::-1]:
+            self.remove(enemy)
+
+    def detach_all(self):
+        # Быстрая очистка без возврата полей в объекты: для восстановления
+        # состояния, когда поля все равно будут перезаписаны
+        items = self.items
+        for enemy in items:
+            enemy.store = None
+            enemy.slot = -1
+        self.items = []
+        self.counts = [0, 0, 0]
+        return items
+
+    def attach(self, enemies, fields):
+        # Враги занимают ячейки по порядку; fields - массивы полей
+        # FLOAT_FIELDS + INT_FIELDS в том же порядке (длиной len(enemies))
+        n = len(enemies)
+        while self.capacity < n:
+            self._grow()
+        for slot, enemy in enumerate(enemies):
+            enemy.store = self
+            enemy.slot = slot
+            self.counts[enemy.ai] += 1
+        self.items = list(enemies)
+        for name, values in zip(FLOAT_FIELDS + INT_FIELDS, fields):
+            getattr(self, name)[:n] = values
+        self.ai[:n] = [enemy.ai for enemy in enemies]
+
+    def update(self, player_x, player_y, projectiles=None, far_bounds=None, flow=None, dt=1):
+        # Один шаг движения всех врагов: обычные идут к игроку, пьяные
+        # мастера петляют и уворачиваются, снайперы держат дистанцию и
+        # стреляют. За пределами far_bounds
+        # (left, top, right, bottom) любой враг просто идет к игроку.
+        # flow - поле направлений (FlowField): враги обходят стены по нему;
+        # dt - тиков за шаг
+        n = len(self.items)
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        speed = self.speed[:n]
+        aim_x = dx = player_x - x
+        aim_y = dy = player_y - y
+        if flow is not None:
+            old_x, old_y = x.copy(), y.copy()
+            dx, dy = flow.steer(x, y, dx, dy)
+
+        if self.counts[DRUNKEN] == 0 and self.counts[SNIPER] == 0:
+            # Только обычные враги: идут прямо на игрока
+            distance = np.maximum(1, np.sqrt(dx * dx + dy * dy))
+            step = speed / distance
+            vx = dx * step
+            vy = dy * step
+            turn = (vx != 0) | (vy != 0)
+            self.angle[:n][turn] = np.degrees(np.arctan2(vy, vx))[turn] - 90
+            x += vx * dt
+            y += vy * dt
+            if flow is not None:
+                flow.obstacles.resolve(x, y, old_x, old_y)
+            return
+
+        ai = self.ai[:n]
+        dodge_timer = self.dodge_timer[:n]
+        change_timer = self.direction_change_timer[:n]
+        random_angle = self.random_angle[:n]
+        cooldown = self.shoot_cooldown[:n]
+
+        drunk = ai == DRUNKEN
+        sniper = ai == SNIPER
+        if far_bounds is not None:
+            # Далеко за экраном: без шатания, уворотов и стрельбы
+            left, top, right, bottom = far_bounds
+            near = (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+            drunk &= near
+            sniper &= near
+        dodging = drunk & (dodge_timer > 0)
+        wander = drunk & ~dodging
+
+        # Хаотичное движение: смена случайного направления
+        reset = wander & (change_timer <= 0)
+        k = int(np.count_nonzero(reset))
+        if k:
+            random_angle[reset] = self.rng.uniform(0, 2 * math.pi, k)
+            change_timer[reset] = self.rng.integers(10, 31, k)
+        change_timer[wander & ~reset] -= dt
+
+        dx = np.where(wander, dx + np.cos(random_angle) * WANDER_OFFSET, dx)
+        dy = np.where(wander, dy + np.sin(random_angle) * WANDER_OFFSET, dy)
+        distance = np.maximum(1, np.sqrt(dx * dx + dy * dy))
+
+        # Снайпер отходит, если слишком близко, и подходит, если слишком далеко
+        step = speed / distance
+        step = np.where(sniper & (distance < SNIPER_MIN_DISTANCE), -step, step)
+        step = np.where(sniper & (distance >= SNIPER_MIN_DISTANCE) & (distance <= SNIPER_MAX_DISTANCE), 0, step)
+        vx = dx * step
+        vy = dy * step
+
+        # Уворот пьяного мастера
+        vx = np.where(dodging, self.dodge_dx[:n], vx)
+        vy = np.where(dodging, self.dodge_dy[:n], vy)
+        dodge_timer[dodging] -= dt
+
+        # Угол поворота (снайпер всегда смотрит на игрока)
+        ax = np.where(sniper, aim_x, vx)
+        ay = np.where(sniper, aim_y, vy)
+        turn = (ax != 0) | (ay != 0)
+        self.angle[:n][turn] = np.degrees(np.arctan2(ay, ax))[turn] - 90
+
+        x += vx * dt
+        y += vy * dt
+        if flow is not None:
+            flow.obstacles.resolve(x, y, old_x, old_y)
+
+        # Стрельба снайперов
+        fire = sniper & (cooldown <= 0) & (distance < SNIPER_FIRE_DISTANCE)
+        cooldown[sniper & ~fire] -= dt
+        cooldown[fire] = SNIPER_COOLDOWN
+        if projectiles is not None:
+            for slot in np.flatnonzero(fire).tolist():
+                scale = SNIPER_BULLET_SPEED / distance[slot]
+                projectiles.spawn(x[slot], y[slot], aim_x[slot] * scale, aim_y[slot] * scale,
+                                  radius=5, kind=NORMAL, owner=self.items[slot].owner)
@@ -0,0 +1,334 @@
+# Игровые объекты: игрок, враги и предметы
+import math
+import random
+
+import pygame
+
+from settings import WIDTH, HEIGHT, RED, BLUE, YELLOW, CYAN
+from assets import load_image, get_rotations
+from projectiles import ProjectilePool, NORMAL, EXPLOSIVE, EXPLOSION_RADIUS, BULLET_SPEED
+from effects import EXPLOSION_TIME
+from enemy_ai import StoredEnemy, DRUNKEN, SNIPER
+from render_queue import LAYER_ITEMS, LAYER_PLAYER, LAYER_ENEMIES, get_health_bar
+
+# Видимая область арены в один экран (left, top, right, bottom)
+SCREEN = (0, 0, WIDTH, HEIGHT)
+
+
+# Отрисовка по значениям, а не по объектам: ими пользуются и сами объекты,
+# и снимки мира (pipeline.Snapshot); x, y - координаты на экране. Полоски
+# здоровья создаются при первой отрисовке: без окна поверхности не нужны
+def submit_player(queue, x, y, angle, health, max_health):
+    image = get_rotations("player").get(-angle)
+    queue.add(LAYER_PLAYER, image, image.get_rect(center=(x, y)))
+    get_health_bar(40).submit(queue, LAYER_PLAYER, x - 20, y - 30, health, max_health)
+
+
+def submit_enemy(queue, sprite, x, y, angle, health, max_health):
+    image = get_rotations(sprite).get(-angle)
+    queue.add(LAYER_ENEMIES, image, image.get_rect(center=(x, y)))
+    get_health_bar(30).submit(queue, LAYER_ENEMIES, x - 15, y - 25, health, max_health)
+
+
+def submit_item(queue, image, x, y):
+    queue.add(LAYER_ITEMS, image, image.get_rect(center=(x, y)))
+
+
+# Игрок
+class Player:
+    def __init__(self, bullets=None, arena=(WIDTH, HEIGHT), obstacles=None):
+        self.arena_width, self.arena_height = arena
+        self.obstacles = obstacles  # ObstacleMap или None
+        self.x = self.arena_width // 2
+        self.y = self.arena_height // 2
+        self.radius = 15
+        self.speed = 5
+        self.color = BLUE
+        self.health = 100
+        self.max_health = 100
+        self.bullets = bullets if bullets is not None else ProjectilePool()
+        self.shoot_cooldown = 0
+        self.special_attacks = 0
+        self.angle = 0
+        self.last_dx, self.last_dy = 0, 0
+
+    # Спрайт загружается только при отрисовке, симуляции он не нужен
+    @property
+    def image(self):
+        return get_rotations("player").get(-self.angle)
+
+    def move(self, keys, dt=1):
+        # dt - сколько тиков по 1/60 с проходит за шаг
+        dx, dy = 0, 0
+        speed = self.speed * dt
+        if keys[pygame.K_a] and self.x - self.radius > 0:
+            dx -= speed
+        if keys[pygame.K_d] and self.x + self.radius < self.arena_width:
+            dx += speed
+        if keys[pygame.K_w] and self.y - self.radius > 0:
+            dy -= speed
+        if keys[pygame.K_s] and self.y + self.radius < self.arena_height:
+            dy += speed
+
+        if dx != 0 or dy != 0:
+            self.last_dx, self.last_dy = dx, dy
+            self.angle = math.degrees(math.atan2(dy, dx)) - 90
+
+            # Стены останавливают движение по той оси, по которой мешают
+            obstacles = self.obstacles
+            if obstacles is not None:
+                if dx and obstacles.box_blocked(self.x + dx, self.y, self.radius):
+                    dx = 0
+                if dy and obstacles.box_blocked(self.x + dx, self.y + dy, self.radius):
+                    dy = 0
+
+        self.x += dx
+        self.y += dy
+
+    def shoot(self, target_x, target_y):
+        if self.shoot_cooldown <= 0:
+            dx = target_x - self.x
+            dy = target_y - self.y
+            distance = max(1, math.sqrt(dx * dx + dy * dy))
+            dx, dy = dx / distance * BULLET_SPEED, dy / distance * BULLET_SPEED  # Нормализация
+
+            self.bullets.spawn(self.x, self.y, dx, dy, radius=5, kind=NORMAL)
+            self.shoot_cooldown += 10  # Остаток от длинного шага не теряется
+
+    def use_special_attack(self, target_x, target_y):
+        if self.special_attacks > 0:
+            self.bullets.spawn(self.x, self.y, radius=10, kind=EXPLOSIVE, timer=EXPLOSION_TIME,
+                               tx=target_x, ty=target_y, blast=EXPLOSION_RADIUS, contact=True)
+            self.special_attacks -= 1
+
+    def update(self, dt=1):
+        if self.shoot_cooldown > 0:
+            self.shoot_cooldown -= dt
+
+    def submit(self, queue):
+        # Спрайт игрока и полоска здоровья над ним
+        submit_player(queue, self.x - queue.ox, self.y - queue.oy, self.angle, self.health, self.max_health)
+
+
+class Enemy(StoredEnemy):
+    __slots__ = ("rng", "color", "health", "max_health")
+    sprite = "enemy"
+
+    def __init__(self, rng=random, bounds=SCREEN):
+        super().__init__()
+        self.reset(rng, bounds)
+
+    def reset(self, rng=random, bounds=SCREEN):
+        # Начальное состояние; пул объектов вызывает reset повторно
+        # rng - генератор случайных чисел мира (для воспроизводимости)
+        # bounds - видимая область (left, top, right, bottom): враг появляется за ее краем
+        self.rng = rng
+        left, top, right, bottom = bounds
+        side = rng.randint(0, 3)
+        if side == 0:  # Сверху
+            self.x = rng.randint(left, right)
+            self.y = top - 20
+        elif side == 1:  # Справа
+            self.x = right + 20
+            self.y = rng.randint(top, bottom)
+        elif side == 2:  # Снизу
+            self.x = rng.randint(left, right)
+            self.y = bottom + 20
+        else:  # Слева
+            self.x = left - 20
+            self.y = rng.randint(top, bottom)
+
+        self.radius = 15
+        self.speed = rng.uniform(1.0, 3.0)
+        self.color = RED
+        self.health = 30
+        self.max_health = 30
+        self.angle = 0
+
+    @property
+    def image(self):
+        return get_rotations(self.sprite).get(-self.angle)
+
+    def submit(self, queue):
+        # Спрайт врага и полоска здоровья над ним
+        submit_enemy(queue, self.sprite, self.x - queue.ox, self.y - queue.oy, self.angle,
+                     self.health, self.max_health)
+
+
+# Пьяный мастер (уворачивается от первых двух пуль)
+DODGE_LOOKAHEAD = 10  # На сколько кадров вперед оценивается полет пули
+DODGE_DISTANCE = 50
+# Дальше этого расстояния пуля не может вызвать уворот
+DODGE_RANGE = DODGE_DISTANCE + BULLET_SPEED * DODGE_LOOKAHEAD
+
+
+class DrunkenMaster(Enemy):
+    __slots__ = ("dodge_count", "type")
+    ai = DRUNKEN
+    sprite = "drunken_master"
+
+    def reset(self, rng=random, bounds=SCREEN):
+        super().reset(rng, bounds)
+        self.color = CYAN
+        self.speed = rng.uniform(2.0, 4.0)
+        self.health = 40
+        self.max_health = 40
+        self.dodge_count = 2  # Количество уворотов от пуль
+        self.type = "drunken"
+        self.direction_change_timer = 0
+        self.random_angle = rng.uniform(0, 2 * math.pi)
+        self.dodge_vector = [0, 0]
+        self.dodge_timer = 0
+
+    def check_bullet_dodge(self, bullet_x, bullet_y, bullet_dx, bullet_dy):
+        if self.dodge_count <= 0 or self.dodge_timer > 0:
+            return False
+
+        # Проверка пули игрока
+        future_bullet_x = bullet_x + bullet_dx * DODGE_LOOKAHEAD
+        future_bullet_y = bullet_y + bullet_dy * DODGE_LOOKAHEAD
+        future_dist = math.sqrt((future_bullet_x - self.x) ** 2 + (future_bullet_y - self.y) ** 2)
+
+        if future_dist < DODGE_DISTANCE:  # Пуля близко и летит в нашу сторону
+            self.dodge(bullet_dx, bullet_dy)
+            return True
+        return False
+
+    def dodge(self, bullet_dx, bullet_dy):
+        # Уворот поперек полета пули; о том, что пуля опасна, решает вызывающий
+        # (check_bullet_dodge или прогноз SpatialHash.query_ahead в World)
+        bullet_angle = math.atan2(bullet_dy, bullet_dx)
+        dodge_angle = bullet_angle + (math.pi / 2 if self.rng.random() > 0.5 else -math.pi / 2)
+
+        self.dodge_vector = [
+            math.cos(dodge_angle) * self.speed * 2,
+            math.sin(dodge_angle) * self.speed * 2
+        ]
+        self.dodge_timer = 15  # Длительность уворота
+        self.dodge_count -= 1
+
+
+# Снайпер (атакует издалека)
+class Sniper(Enemy):
+    __slots__ = ("bullets", "owner")
+    ai = SNIPER
+    sprite = "sniper"
+
+    # owner - номер снайпера у его пуль; выдает мир (World.next_sniper_id),
+    # чтобы номера не зависели от других миров в том же процессе
+    def __init__(self, bullets, rng, owner, bounds=SCREEN):
+        StoredEnemy.__init__(self)
+        self.reset(bullets, rng, owner, bounds)
+
+    def reset(self, bullets, rng, owner, bounds=SCREEN):
+        super().reset(rng, bounds)
+        self.color = YELLOW
+        self.speed = 1.0
+        self.shoot_cooldown = 0
+        self.bullets = bullets  # Общий пул снарядов
+        self.owner = owner
+
+
+# Аптечка
+class Medkit:
+    __slots__ = ("x", "y", "radius", "heal_amount", "active", "lifetime", "blink_timer", "visible")
+
+    def __init__(self, rng=random, bounds=SCREEN):
+        self.reset(rng, bounds)
+
+    def reset(self, rng=random, bounds=SCREEN):
+        # Предмет появляется в видимой области bounds
+        left, top, right, bottom = bounds
+        self.x = rng.randint(left + 50, right - 50)
+        self.y = rng.randint(top + 50, bottom - 50)
+        self.radius = 10
+        self.heal_amount = 25
+        self.active = True
+        self.lifetime = 360  # 6 секунд (60 кадров/сек * 6 сек)
+        self.blink_timer = 0  # Таймер для мигания
+        self.visible = True  # Видимость при мигании
+
+    @property
+    def image(self):
+        return load_image("medkit", scale=0.5)
+
+    def update(self, dt=1):
+        if self.active:
+            self.lifetime -= dt
+            self.blink_timer += dt
+
+            # Мигание в последние 2 секунды (120 кадров)
+            if self.lifetime <= 120:
+                # Мигаем с частотой 10 кадров (5 раз в секунду)
+                self.visible = self.blink_timer % 10 < 5
+
+            if self.lifetime <= 0:
+                self.active = False
+
+    def submit(self, queue):
+        if self.active and self.visible:
+            submit_item(queue, self.image, self.x - queue.ox, self.y - queue.oy)
+
+
+# Кадры пульсации гранаты по значению animation_timer
+pulse_frames = {}
+
+
+# animation_timer пробегает 60 значений, каждый кадр масштабируется один раз
+def pulse_image(timer):
+    frame = pulse_frames.get(timer)
+    if frame is None:
+        image = load_image("special", scale=0.6)
+        pulse = 1 + 0.2 * math.sin(timer * 0.1)
+        frame = pygame.transform.scale(
+            image,
+            (int(image.get_width() * pulse),
+             int(image.get_height() * pulse))
+        )
+        pulse_frames[timer] = frame
+    return frame
+
+
+# Граната (специальная атака)
+class SpecialAttackItem:
+    __slots__ = ("x", "y", "radius", "active", "animation_timer", "lifetime", "blink_timer", "visible")
+
+    def __init__(self, rng=random, bounds=SCREEN):
+        self.reset(rng, bounds)
+
+    def reset(self, rng=random, bounds=SCREEN):
+        # Предмет появляется в видимой области bounds
+        left, top, right, bottom = bounds
+        self.x = rng.randint(left + 50, right - 50)
+        self.y = rng.randint(top + 50, bottom - 50)
+        self.radius = 12
+        self.active = True
+        self.animation_timer = 0
+        self.lifetime = 360  # 6 секунд
+        self.blink_timer = 0  # Таймер для мигания
+        self.visible = True  # Видимость при мигании
+
+    @property
+    def image(self):
+        return load_image("special", scale=0.6)
+
+    def update(self, dt=1):
+        if self.active:
+            self.animation_timer = (self.animation_timer + dt) % 60
+            self.lifetime -= dt
+            self.blink_timer += dt
+
+            # Мигание в последние 2 секунды (120 кадров)
+            if self.lifetime <= 120:
+                # Мигание с частотой 10 кадров (5 раз в секунду)
+                self.visible = self.blink_timer % 10 < 5
+
+            if self.lifetime <= 0:
+                self.active = False
+
+    def pulse_image(self):
+        return pulse_image(self.animation_timer)
+
+    def submit(self, queue):
+        if self.active and self.visible:
+            submit_item(queue, self.pulse_image(), self.x - queue.ox, self.y - queue.oy)
@@ -0,0 +1,362 @@
+# Hotline Podolsk: точка входа. Импорт модуля не открывает окно и не
+# инициализирует pygame - это делает main()
+import time
+
+IMPORT_START = time.perf_counter()
+
+import argparse
+
+import pygame
+
+from settings import WIDTH, HEIGHT, ARENA_WIDTH, ARENA_HEIGHT, WHITE, BLACK, TICK_RATE, MAX_TICKS_PER_FRAME
+from world import World, Controls
+from particles import ParticleSystem
+from pipeline import SimThread
+from client import NetClient, parse_address
+from rewind import RewindBuffer
+from render import Renderer, DirtyRectRenderer
+from display import Display, DISPLAY_MODES
+from replay import Recorder, Replay
+from profiler import FrameProfiler, no_mark
+from pools import GcPolicy, GC_MODES
+from cli import arena_size
+
+
+# Время этапов запуска (печатается с флагом --startup-profile)
+class StartupTimer:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = [("imports", time.perf_counter() - IMPORT_START)]
+        self.last = time.perf_counter()
+        self.done = False
+
+    def mark(self, stage):
+        if self.done:
+            return
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+    def report(self):
+        if self.done:
+            return
+        self.done = True
+        if not self.enabled:
+            return
+        total = sum(seconds for _, seconds in self.stages)
+        print("Запуск до первого кадра:")
+        for stage, seconds in self.stages:
+            print(f"  {stage:14s} {seconds * 1000:8.1f} мс")
+        print(f"  {'всего':14s} {total * 1000:8.1f} мс")
+
+
+def init_display(mode="window", scale=2):
+    # Только нужные подсистемы: без звука и джойстиков
+    pygame.display.init()
+    display = Display(mode, scale)
+    pygame.display.set_caption("Hotline Podolsk")
+    return display
+
+
+# Игровой цикл
+def game_loop(display, seed=None, record=None, replay=None, speed=1.0, telemetry=None, dirty_rects=False,
+              startup=None, gc_mode="auto", arena=(ARENA_WIDTH, ARENA_HEIGHT), walls=0, threaded=False):
+    startup = startup if startup is not None else StartupTimer()
+    screen = display.canvas  # Кадр во внутреннем разрешении
+    if replay is not None:
+        replay = Replay.load(replay)
+        world = World(replay.seed, arena=replay.arena, walls=replay.walls, swept=replay.swept)
+        inputs = iter(replay)
+    else:
+        world = World(seed, arena=arena, walls=walls)
+        inputs = None
+    world.particles = ParticleSystem(seed=world.seed)
+    recorder = Recorder(world.seed, arena, walls) if record is not None else None
+    # Перемотка (R) и быстрое сохранение (F5/F9) ломают запись, поэтому только в живой игре
+    rewind = RewindBuffer() if inputs is None and recorder is None else None
+    startup.mark("world")
+    pygame.font.init()
+    font = pygame.font.SysFont(None, 36)
+    startup.mark("font")
+    renderer = (DirtyRectRenderer if dirty_rects else Renderer)(screen, font, display)
+    startup.mark("renderer")
+    gc_policy = GcPolicy(gc_mode)
+    gc_policy.after_load()
+    # Профилировщик: F3 - оверлей, telemetry - запись в CSV/NDJSON
+    profiler = FrameProfiler(telemetry=telemetry)
+    profiler.watch("hud", renderer.hud.stats)
+    if rewind is not None:
+        profiler.watch("rewind", rewind.stats)
+    clock = pygame.time.Clock()
+    running = True
+    # Симуляция идет фиксированными тиками независимо от частоты кадров
+    tick_ms = 1000 / (TICK_RATE * speed)
+    accumulator = 0.0
+    clicks = []
+
+    if threaded:
+        # Симуляция идет в своем потоке, здесь только ввод и отрисовка
+        pipelined_loop(display, world, renderer, profiler, inputs, recorder, gc_policy, speed, startup, rewind)
+        running = False
+
+    while running:
+        profiling = profiler.enabled
+        mark = profiler.mark if profiling else no_mark
+        world.mark = renderer.mark = mark
+        if profiling:
+            profiler.begin_frame()
+
+        # Обработка событий
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5 and rewind is not None:
+                rewind.save(world)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and rewind is not None:
+                rewind.load(world)
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED) and dirty_rects:
+                renderer.invalidate()
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                # В мир и запись идут координаты арены, а не окна
+                mouse_x, mouse_y = world.camera.to_world(*display.mouse_pos())
+                clicks.append((event.button, mouse_x, mouse_y))
+
+        mark("events")
+
+        # Шаги симуляции
+        pressed = pygame.key.get_pressed()
+        keys = Controls.from_keys(pressed)
+        rewinding = rewind is not None and pressed[pygame.K_r]
+        steps = 0
+        while accumulator >= tick_ms and steps < MAX_TICKS_PER_FRAME and world.running:
+            if inputs is not None:
+                tick_input = next(inputs, None)
+                if tick_input is None:
+                    running = False
+                    break
+                world.step(*tick_input)
+            elif rewinding:
+                # Пока R зажата, время идет назад по тику за тик
+                rewind.rewind(world)
+                clicks = []
+            else:
+                # Нажатия мыши применяются в первом тике после события
+                tick_input = (keys, clicks)
+                if recorder is not None:
+                    tick_input = recorder.record(keys, clicks)
+                world.step(*tick_input)
+                clicks = []
+                if rewind is not None:
+                    rewind.record(world)
+            gc_policy.tick(world.game_time)
+            accumulator -= tick_ms
+            steps += 1
+        if steps == MAX_TICKS_PER_FRAME:
+            accumulator = 0.0
+        if not world.running:
+            running = False
+
+        # Отрисовка
+        renderer.draw(world)
+        renderer.add_dirty(profiler.draw_overlay(screen))
+        mark("overlay")
+
+        renderer.present()
+        mark("flip")
+        startup.mark("first_frame")
+        startup.report()
+        # Прогрев кэшей спрайтов и взрывов понемногу после первого кадра
+        renderer.warm_up()
+        if profiling:
+            profiler.count(world)
+            profiler.end_frame()
+        accumulator += clock.tick(60)
+
+    if recorder is not None:
+        recorder.save(record)
+    profiler.close()
+    gc_policy.restore()
+
+    # Конец игры
+    screen.fill(BLACK)
+    game_over_text = font.render(f"Игра окончена! Ваш счет: {world.score}", True, WHITE)
+    screen.blit(game_over_text, (WIDTH // 2 - 150, HEIGHT // 2))
+    display.flip()
+    pygame.time.wait(3000)
+
+
+def pipelined_loop(display, world, renderer, profiler, inputs, recorder, gc_policy, speed, startup, rewind=None):
+    screen = display.canvas
+    sim = SimThread(world, TICK_RATE * speed, inputs, recorder, gc_policy.tick, rewind)
+    sim.start()
+    clock = pygame.time.Clock()
+    running = True
+
+    while running and not sim.done:
+        profiling = profiler.enabled
+        mark = profiler.mark if profiling else no_mark
+        renderer.mark = mark
+        if profiling:
+            profiler.begin_frame()
+
+        previous, current, alpha = sim.latest()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5 and rewind is not None:
+                sim.call(rewind.save)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and rewind is not None:
+                sim.call(rewind.load)
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED) and isinstance(renderer, DirtyRectRenderer):
+                renderer.invalidate()
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                mouse_x, mouse_y = current.camera.to_world(*display.mouse_pos())
+                sim.press(event.button, mouse_x, mouse_y)
+        pressed = pygame.key.get_pressed()
+        sim.keys = Controls.from_keys(pressed)
+        sim.rewinding = rewind is not None and pressed[pygame.K_r]
+        mark("events")
+
+        renderer.draw_snapshot(current, previous, alpha)
+        renderer.add_dirty(profiler.draw_overlay(screen))
+        mark("overlay")
+
+        renderer.present()
+        mark("flip")
+        startup.mark("first_frame")
+        startup.report()
+        renderer.warm_up()
+        if profiling:
+            profiler.count(current)
+            profiler.end_frame()
+        clock.tick(60)
+
+    sim.stop()
+
+
+def net_loop(display, address, dirty_rects=False, startup=None):
+    # Совместная игра через сервер (server.py): здесь ввод, предсказание
+    # своего игрока и отрисовка снимков сервера
+    startup = startup if startup is not None else StartupTimer()
+    screen = display.canvas
+    client = NetClient(address)
+    pygame.font.init()
+    font = pygame.font.SysFont(None, 36)
+    renderer = (DirtyRectRenderer if dirty_rects else Renderer)(screen, font, display)
+    profiler = FrameProfiler()
+    profiler.watch("hud", renderer.hud.stats)
+    clock = pygame.time.Clock()
+    accumulator = 0.0
+    clicks = []
+    running = True
+
+    while running and not client.finished and not client.full:
+        profiling = profiler.enabled
+        mark = profiler.mark if profiling else no_mark
+        renderer.mark = mark
+        if profiling:
+            profiler.begin_frame()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED) and dirty_rects:
+                renderer.invalidate()
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                clicks.append((event.button,) + client.camera().to_world(*display.mouse_pos()))
+        mark("events")
+
+        client.poll()
+        keys = Controls.from_keys(pygame.key.get_pressed())
+        steps = 0
+        tick_ms = 1000 / client.tick_rate  # Ввод уходит с частотой шагов сервера
+        while accumulator >= tick_ms and steps < MAX_TICKS_PER_FRAME:
+            client.tick(keys, clicks)
+            clicks = []
+            accumulator -= tick_ms
+            steps += 1
+        if steps == MAX_TICKS_PER_FRAME:
+            accumulator = 0.0
+        mark("player")
+
+        view = client.view()
+        if view is None:
+            # Ждем ответа сервера и остальных игроков
+            screen.fill(BLACK)
+            text = "Подключение..." if client.slot is None else f"Игрок {client.slot + 1}, ждем остальных..."
+            screen.blit(font.render(text, True, WHITE), (WIDTH // 2 - 150, HEIGHT // 2))
+            if dirty_rects:
+                renderer.invalidate()
+        else:
+            previous, current, alpha = view
+            renderer.draw_snapshot(current, previous, alpha)
+        renderer.add_dirty(profiler.draw_overlay(screen))
+        mark("overlay")
+
+        renderer.present()
+        mark("flip")
+        startup.mark("first_frame")
+        startup.report()
+        renderer.warm_up()
+        if profiling:
+            if view is not None:
+                profiler.count(view[1])
+            profiler.end_frame()
+        accumulator += clock.tick(60)
+
+    client.close()
+    profiler.close()
+    screen.fill(BLACK)
+    if client.full:
+        text = "На сервере нет свободных мест"
+    else:
+        score = client.frames[-1].score if client.frames else 0
+        text = f"Игра окончена! Счет команды: {score}"
+    screen.blit(font.render(text, True, WHITE), (WIDTH // 2 - 150, HEIGHT // 2))
+    display.flip()
+    pygame.time.wait(3000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hotline Podolsk")
+    parser.add_argument("--seed", type=int, help="seed генератора случайных чисел мира")
+    parser.add_argument("--record", metavar="FILE", help="записать ввод в файл")
+    parser.add_argument("--replay", metavar="FILE", help="воспроизвести записанную игру")
+    parser.add_argument("--speed", type=float, default=1.0, help="скорость воспроизведения")
+    parser.add_argument("--telemetry", metavar="FILE", help="писать время фаз кадра в .csv или .ndjson")
+    parser.add_argument("--dirty-rects", action="store_true", help="перерисовывать только измененные области")
+    parser.add_argument("--startup-profile", action="store_true", help="показать время этапов запуска")
+    parser.add_argument("--gc", choices=GC_MODES, default="auto",
+                        help="режим сборщика мусора (freeze - заморозить после загрузки, manual - только между волнами)")
+    parser.add_argument("--arena", type=arena_size, default=(ARENA_WIDTH, ARENA_HEIGHT), metavar="WxH",
+                        help="размер арены (больше окна - камера следует за игроком)")
+    parser.add_argument("--walls", type=int, default=0, metavar="N",
+                        help="стен на площадь одного экрана (враги обходят их по полю направлений)")
+    parser.add_argument("--display", choices=DISPLAY_MODES, default="window",
+                        help="вывод кадра 800x600: window, scaled (SDL на видеокарте), fullscreen, integer")
+    parser.add_argument("--scale", type=int, default=2, help="во сколько раз увеличивать кадр в режиме integer")
+    parser.add_argument("--threaded", action="store_true",
+                        help="симуляция в отдельном потоке, кадр рисуется по снимкам с интерполяцией")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="совместная игра через сервер (server.py)")
+    args = parser.parse_args(argv)
+
+    startup = StartupTimer(args.startup_profile)
+    display = init_display(args.display, args.scale)
+    startup.mark("display")
+    if args.connect:
+        net_loop(display, parse_address(args.connect), args.dirty_rects, startup)
+        pygame.quit()
+        return
+    game_loop(display, args.seed, args.record, args.replay, args.speed, args.telemetry, args.dirty_rects, startup,
+              args.gc, args.arena, args.walls, args.threaded)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Интерфейс с кэшированием: текст перерисовывается только при изменении значения
+import pygame
+
+from settings import WHITE
+
+
+class HudLine:
+    def __init__(self, template, pos):
+        self.template = template
+        self.pos = pos  # Позиция на экране
+        self.value = None
+        self.surface = None
+
+
+class Hud:
+    def __init__(self, font, pos=(5, 5), size=(200, 140), color=(50, 50, 50), alpha=128):
+        self.font = font
+        self.pos = pos
+        # Полупрозрачная панель создается один раз
+        self.panel = pygame.Surface(size, pygame.SRCALPHA)
+        self.panel.fill(color + (alpha,))
+        self.lines = {}
+        self.surface = None
+        self.dirty = True
+        self.renders = 0  # Сколько раз растеризовался текст
+        self.cached = 0  # Сколько раз значение не изменилось и текст взят из кэша
+
+    def add_line(self, name, template, pos):
+        self.lines[name] = HudLine(template, pos)
+        self.dirty = True
+
+    def set(self, name, *value):
+        line = self.lines[name]
+        if line.value == value:
+            self.cached += 1
+            return
+        line.value = value
+        line.surface = self.font.render(line.template.format(*value), True, WHITE)
+        self.renders += 1
+        self.dirty = True
+
+    def compose(self):
+        # Собираем панель и текст в одну поверхность
+        if not self.dirty:
+            return self.surface
+        ox, oy = self.pos
+        width, height = self.panel.get_size()
+        for line in self.lines.values():
+            if line.surface is not None:
+                width = max(width, line.pos[0] - ox + line.surface.get_width())
+                height = max(height, line.pos[1] - oy + line.surface.get_height())
+        if self.surface is None or self.surface.get_size() != (width, height):
+            self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+        self.surface.blit(self.panel, (0, 0))
+        for line in self.lines.values():
+            if line.surface is not None:
+                self.surface.blit(line.surface, (line.pos[0] - ox, line.pos[1] - oy))
+        self.dirty = False
+        return self.surface
+
+    def stats(self):
+        # Для оверлея профилировщика
+        return {"renders": self.renders, "cached": self.cached}
+
+    def draw(self, screen):
+        return screen.blit(self.compose(), self.pos)
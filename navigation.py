@@ -0,0 +1,196 @@
+# Препятствия на арене и поле направлений к игроку (flow field): один обход
+# в ширину от клетки игрока, враги берут из поля направление за O(1)
+import math
+
+import numpy as np
+
+from settings import WIDTH, HEIGHT, NAV_CELL, FLOW_RADIUS
+
+# Соседи клетки: (строка, столбец); диагонали - последние четыре
+NEIGHBOURS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+class ObstacleMap:
+    def __init__(self, width, height, cell=NAV_CELL):
+        self.cell = cell
+        self.cols = -(-width // cell)
+        self.rows = -(-height // cell)
+        self.blocked = np.zeros((self.rows, self.cols), bool)
+        self.walls = []  # (x, y, w, h) в координатах мира
+
+    @classmethod
+    def generate(cls, width, height, count, rng, clear=None, cell=NAV_CELL):
+        # count стен: отрезки толщиной в клетку и небольшие блоки;
+        # вокруг точки clear (x, y) стен нет
+        obstacles = cls(width, height, cell)
+        keep = 4  # Свободных клеток вокруг clear
+        attempts = 0
+        while len(obstacles.walls) < count and attempts < count * 20:
+            attempts += 1
+            shape = rng.random()
+            if shape < 0.4:
+                cols, rows = rng.randint(3, 8), 1
+            elif shape < 0.8:
+                cols, rows = 1, rng.randint(3, 8)
+            else:
+                cols = rows = rng.randint(2, 3)
+            col = rng.randint(0, max(0, obstacles.cols - cols))
+            row = rng.randint(0, max(0, obstacles.rows - rows))
+            if clear is not None:
+                cc, cr = int(clear[0] // cell), int(clear[1] // cell)
+                if col - keep < cc < col + cols + keep and row - keep < cr < row + rows + keep:
+                    continue
+            obstacles.add_wall(col, row, cols, rows)
+        return obstacles
+
+    def add_wall(self, col, row, cols, rows):
+        self.blocked[row:row + rows, col:col + cols] = True
+        cell = self.cell
+        self.walls.append((col * cell, row * cell, cols * cell, rows * cell))
+
+    def blocked_at(self, x, y):
+        # Векторная проверка точек; за пределами арены препятствий нет
+        c = np.floor_divide(x, self.cell).astype(np.intp)
+        r = np.floor_divide(y, self.cell).astype(np.intp)
+        inside = (c >= 0) & (c < self.cols) & (r >= 0) & (r < self.rows)
+        result = np.zeros(inside.shape, bool)
+        result[inside] = self.blocked[r[inside], c[inside]]
+        return result
+
+    def box_blocked(self, x, y, radius):
+        # Задевает ли квадрат со стороной 2 * radius хоть одну стену
+        cell = self.cell
+        c0 = max(0, int((x - radius) // cell))
+        c1 = min(self.cols - 1, int((x + radius) // cell))
+        r0 = max(0, int((y - radius) // cell))
+        r1 = min(self.rows - 1, int((y + radius) // cell))
+        if c0 > c1 or r0 > r1:
+            return False
+        return bool(self.blocked[r0:r1 + 1, c0:c1 + 1].any())
+
+    def resolve(self, x, y, old_x, old_y):
+        # Шаг в стену отменяется по той оси, по которой мешает стена,
+        # поэтому враги скользят вдоль стен. Кто уже стоит в стене, выходит из нее
+        hit = self.blocked_at(x, y) & ~self.blocked_at(old_x, old_y)
+        if not hit.any():
+            return
+        slide_y = hit & ~self.blocked_at(old_x, y)
+        x[slide_y] = old_x[slide_y]
+        hit &= ~slide_y
+        slide_x = hit & ~self.blocked_at(x, old_y)
+        y[slide_x] = old_y[slide_x]
+        hit &= ~slide_x
+        x[hit] = old_x[hit]
+        y[hit] = old_y[hit]
+
+    def nearest_free(self, x, y):
+        # Ближайший центр свободной клетки (для предметов, попавших в стену)
+        cell = self.cell
+        c, r = int(x // cell), int(y // cell)
+        if not (0 <= c < self.cols and 0 <= r < self.rows) or not self.blocked[r, c]:
+            return x, y
+        for ring in range(1, max(self.cols, self.rows)):
+            for dr in range(-ring, ring + 1):
+                for dc in range(-ring, ring + 1):
+                    if max(abs(dr), abs(dc)) != ring:
+                        continue
+                    rr, cc = r + dr, c + dc
+                    if 0 <= rr < self.rows and 0 <= cc < self.cols and not self.blocked[rr, cc]:
+                        return (cc + 0.5) * cell, (rr + 0.5) * cell
+        return x, y
+
+
+class FlowField:
+    # Поле строится в окне radius вокруг игрока и только когда игрок
+    # переходит в другую клетку; дальние враги идут прямо (они упрощены)
+    def __init__(self, obstacles, radius=FLOW_RADIUS):
+        self.obstacles = obstacles
+        self.span = int(radius // obstacles.cell)
+        self.player_cell = None
+        self.origin = (0, 0)  # (столбец, строка) левой верхней клетки окна
+        self.dir_x = self.dir_y = np.zeros((0, 0))
+        self.dist = np.zeros((0, 0), np.int32)
+        self.builds = 0
+
+    def update(self, player_x, player_y):
+        cell = self.obstacles.cell
+        key = (int(player_x // cell), int(player_y // cell))
+        if key != self.player_cell:
+            self.player_cell = key
+            self._build(*key)
+
+    def _build(self, pc, pr):
+        obstacles = self.obstacles
+        span = self.span
+        c0 = max(0, pc - span)
+        r0 = max(0, pr - span)
+        c1 = min(obstacles.cols, pc + span + 1)
+        r1 = min(obstacles.rows, pr + span + 1)
+        self.origin = (c0, r0)
+        free = ~obstacles.blocked[r0:r1, c0:c1]
+        shape = free.shape
+        dist = np.full(shape, -1, np.int32)
+
+        # Обход в ширину волной: каждый шаг - сдвиги массива на клетку
+        frontier = np.zeros(shape, bool)
+        if 0 <= pr - r0 < shape[0] and 0 <= pc - c0 < shape[1]:
+            frontier[pr - r0, pc - c0] = True
+            dist[frontier] = 0
+        step = 0
+        while frontier.any():
+            step += 1
+            grown = np.zeros(shape, bool)
+            grown[1:] |= frontier[:-1]
+            grown[:-1] |= frontier[1:]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & free & (dist < 0)
+            dist[frontier] = step
+
+        # Направление - на соседа с наименьшим расстоянием; по диагонали
+        # только если обе соседние по сторонам клетки проходимы
+        cost = np.where(dist < 0, np.inf, dist.astype(np.float64))
+        padded = np.pad(cost, 1, constant_values=np.inf)
+        rows, cols = shape
+        options = []
+        for dr, dc in NEIGHBOURS:
+            neighbour = padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+            if dr and dc:
+                side_r = padded[1 + dr:1 + dr + rows, 1:1 + cols]
+                side_c = padded[1:1 + rows, 1 + dc:1 + dc + cols]
+                neighbour = np.where(np.isinf(side_r) | np.isinf(side_c), np.inf, neighbour)
+            options.append(neighbour)
+        options = np.stack(options)
+        best = options.argmin(axis=0)
+        better = options.min(axis=0) < cost
+        offsets = np.array(NEIGHBOURS, np.float64)
+        length = np.hypot(offsets[:, 0], offsets[:, 1])
+        # Рядом с игроком и в недостижимых клетках направления нет: идем прямо
+        use = better & (dist > 1)
+        self.dir_x = np.where(use, (offsets[:, 1] / length)[best], 0.0)
+        self.dir_y = np.where(use, (offsets[:, 0] / length)[best], 0.0)
+        self.dist = dist
+        self.builds += 1
+
+    def steer(self, x, y, dx, dy):
+        # Вектор к игроку (dx, dy) заменяется направлением поля той же длины
+        cell = self.obstacles.cell
+        c0, r0 = self.origin
+        c = np.floor_divide(x, cell).astype(np.intp) - c0
+        r = np.floor_divide(y, cell).astype(np.intp) - r0
+        rows, cols = self.dir_x.shape
+        inside = (c >= 0) & (c < cols) & (r >= 0) & (r < rows)
+        fx = np.zeros(x.shape)
+        fy = np.zeros(y.shape)
+        fx[inside] = self.dir_x[r[inside], c[inside]]
+        fy[inside] = self.dir_y[r[inside], c[inside]]
+        use = (fx != 0) | (fy != 0)
+        if not use.any():
+            return dx, dy
+        length = np.sqrt(dx * dx + dy * dy)
+        return np.where(use, fx * length, dx), np.where(use, fy * length, dy)
+
+
+def wall_count(width, height, density):
+    # Число стен на арене при density стен на площадь одного экрана
+    return int(math.ceil(width * height / (WIDTH * HEIGHT) * density))
@@ -0,0 +1,399 @@
+# Сетевая игра: формат пакетов UDP, квантование состояния мира, сжатие
+# снимков разностью с последним подтвержденным снимком и имитация плохой
+# сети (потери, задержка) для проверки на одной машине
+import heapq
+import random
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from projectiles import EXPLOSIVE, OWNER_PLAYER
+from world import Controls
+
+PROTOCOL = 1
+
+# Типы пакетов (первый байт)
+HELLO = 1  # Клиент -> сервер: подключение
+WELCOME = 2  # Сервер -> клиент: номер игрока и параметры игры
+FULL = 3  # Сервер -> клиент: свободных мест нет
+INPUT = 4  # Клиент -> сервер: ввод последних тиков
+SNAPSHOT = 5  # Сервер -> клиент: мир вокруг игрока
+BYE = 6  # Клиент -> сервер: выход
+
+MAX_PACKET = 65507
+INPUT_REDUNDANCY = 32  # Сколько последних неподтвержденных вводов повторяется в каждом пакете
+
+HELLO_PACKET = struct.Struct("<BBI")  # тип, версия, метка клиента
+WELCOME_PACKET = struct.Struct("<BBBIHHHH")  # тип, игрок, игроков, метка, арена, тиков/с, снимков/с
+FULL_PACKET = struct.Struct("<BI")  # тип, метка
+BYE_PACKET = struct.Struct("<BB")  # тип, игрок
+INPUT_HEADER = struct.Struct("<BBIIB")  # тип, игрок, последний полученный снимок, номер первого ввода, вводов
+AIM = struct.Struct("<hh")  # Точка прицела: только у вводов с нажатием
+SNAPSHOT_HEADER = struct.Struct("<BIIIB")  # тип, тик, базовый тик (0 - полный), последний ввод, флаги
+SNAPSHOT_WORLD = struct.Struct("<IIBBBHHH")  # счет, время, идет ли игра, длины разделов
+
+COMPRESSED = 1  # Флаг снимка: тело сжато zlib
+
+# Кнопки ввода
+KEY_LEFT = 1
+KEY_RIGHT = 2
+KEY_UP = 4
+KEY_DOWN = 8
+FIRE = 16
+SPECIAL = 32
+
+# Квантованные записи: координаты - целые пиксели, угол - 256 шагов на оборот
+PLAYER = np.dtype([("slot", "u1"), ("x", "<i2"), ("y", "<i2"), ("angle", "u1"), ("health", "<i2"),
+                   ("special", "u1")])
+ENEMY = np.dtype([("uid", "<u4"), ("x", "<i2"), ("y", "<i2"), ("angle", "u1"), ("health", "u1"), ("ai", "u1")])
+ITEM = np.dtype([("kind", "u1"), ("visible", "u1"), ("x", "<i2"), ("y", "<i2"), ("timer", "u1")])
+PROJECTILE = np.dtype([("x", "<i2"), ("y", "<i2"), ("vx", "i1"), ("vy", "i1"), ("flags", "u1"),
+                       ("radius", "u1"), ("timer", "u1"), ("blast", "u1")])
+VELOCITY_SCALE = 8  # Скорость пули в 1/8 пикселя за тик
+
+# Флаги снаряда
+SHOT_EXPLOSIVE = 1
+SHOT_ENEMY = 2
+SHOT_EXPLODED = 4
+
+# Поля врага в разностном снимке: маска на запись, затем столбцы полей
+ABSOLUTE = 1  # x, y целиком (int16)
+MOVE = 2  # Сдвиг x, y от базового снимка (int8)
+ANGLE = 4
+HEALTH = 8
+AI = 16
+NEW_ENEMY = ABSOLUTE | ANGLE | HEALTH | AI
+
+
+def quantize_position(values):
+    return np.clip(np.round(values), -32768, 32767).astype(np.int16)
+
+
+def quantize_angle(values):
+    return (np.round(np.asarray(values, np.float64) * 256 / 360).astype(np.int64) % 256).astype(np.uint8)
+
+
+def angle_degrees(values):
+    return values.astype(np.float64) * 360 / 256
+
+
+def pack_buttons(keys, clicks):
+    # Клавиши и нажатия тика -> (кнопки, x, y); прицел - точка последнего нажатия
+    bits = ((KEY_LEFT if keys.left else 0) | (KEY_RIGHT if keys.right else 0)
+            | (KEY_UP if keys.up else 0) | (KEY_DOWN if keys.down else 0))
+    x = y = 0
+    for button, cx, cy in clicks:
+        bits |= FIRE if button == 1 else SPECIAL if button == 3 else 0
+        x, y = cx, cy
+    return bits, int(np.clip(x, -32768, 32767)), int(np.clip(y, -32768, 32767))
+
+
+def unpack_buttons(bits, x, y):
+    keys = Controls(bool(bits & KEY_LEFT), bool(bits & KEY_RIGHT), bool(bits & KEY_UP), bool(bits & KEY_DOWN))
+    clicks = []
+    if bits & FIRE:
+        clicks.append((1, x, y))
+    if bits & SPECIAL:
+        clicks.append((3, x, y))
+    return keys, clicks
+
+
+def pack_input(slot, ack, inputs):
+    # inputs - (номер, кнопки, x, y) подряд по номерам; на ввод - байт
+    # кнопок и прицел, если было нажатие
+    inputs = inputs[-INPUT_REDUNDANCY:]
+    parts = [INPUT_HEADER.pack(INPUT, slot, ack, inputs[0][0] if inputs else 0, len(inputs))]
+    for _, bits, x, y in inputs:
+        parts.append(bytes((bits,)))
+        if bits & (FIRE | SPECIAL):
+            parts.append(AIM.pack(x, y))
+    return b"".join(parts)
+
+
+def unpack_input(data):
+    _, slot, ack, first, count = INPUT_HEADER.unpack_from(data)
+    offset = INPUT_HEADER.size
+    inputs = []
+    for seq in range(first, first + count):
+        bits = data[offset]
+        offset += 1
+        x = y = 0
+        if bits & (FIRE | SPECIAL):
+            x, y = AIM.unpack_from(data, offset)
+            offset += AIM.size
+        inputs.append((seq, bits, x, y))
+    return slot, ack, inputs
+
+
+# Весь мир одного тика в квантованных массивах; снимки отдельных клиентов -
+# выборки из него
+class WorldFrame:
+    def __init__(self, world):
+        self.score = world.score
+        self.game_time = world.game_time
+        self.running = world.running
+
+        players = world.players
+        self.players = np.zeros(len(players), PLAYER)
+        self.players["slot"] = np.arange(len(players))
+        self.players["x"] = quantize_position([player.x for player in players])
+        self.players["y"] = quantize_position([player.y for player in players])
+        self.players["angle"] = quantize_angle([player.angle for player in players])
+        self.players["health"] = [max(-32768, player.health) for player in players]
+        self.players["special"] = [min(255, player.special_attacks) for player in players]
+
+        enemies = world.enemies
+        n = len(enemies)
+        items = enemies.items
+        self.enemies = np.zeros(n, ENEMY)
+        self.enemies["uid"] = [enemy.uid for enemy in items]
+        self.enemies["x"] = quantize_position(enemies.x[:n])
+        self.enemies["y"] = quantize_position(enemies.y[:n])
+        self.enemies["angle"] = quantize_angle(enemies.angle[:n])
+        self.enemies["health"] = np.clip([enemy.health for enemy in items], 0, 255)
+        self.enemies["ai"] = enemies.ai[:n]
+        self.enemies.sort(order="uid")  # Порядок по номеру нужен для разности
+
+        pickups = world.medkits + world.special_items
+        self.items = np.zeros(len(pickups), ITEM)
+        self.items["kind"] = [0] * len(world.medkits) + [1] * len(world.special_items)
+        self.items["visible"] = [item.active and item.visible for item in pickups]
+        self.items["x"] = quantize_position([item.x for item in pickups])
+        self.items["y"] = quantize_position([item.y for item in pickups])
+        self.items["timer"] = [getattr(item, "animation_timer", 0) for item in pickups]
+
+        pool = world.projectiles
+        index = np.flatnonzero(pool.alive[:pool.count])
+        shots = self.projectiles = np.zeros(len(index), PROJECTILE)
+        shots["x"] = quantize_position(pool.x[index])
+        shots["y"] = quantize_position(pool.y[index])
+        shots["vx"] = np.clip(np.round(pool.vx[index] * VELOCITY_SCALE), -127, 127)
+        shots["vy"] = np.clip(np.round(pool.vy[index] * VELOCITY_SCALE), -127, 127)
+        shots["flags"] = ((pool.kind[index] == EXPLOSIVE) * SHOT_EXPLOSIVE
+                          | (pool.owner[index] != OWNER_PLAYER) * SHOT_ENEMY
+                          | pool.exploded[index] * SHOT_EXPLODED)
+        shots["radius"] = np.clip(pool.radius[index], 0, 255)
+        shots["timer"] = np.clip(pool.timer[index], 0, 255)
+        shots["blast"] = np.clip(pool.blast[index], 0, 255)
+
+    def near(self, view):
+        # Враги, предметы и снаряды внутри view (left, top, right, bottom)
+        left, top, right, bottom = view
+
+        def inside(records):
+            x, y = records["x"], records["y"]
+            return records[(x >= left) & (x <= right) & (y >= top) & (y <= bottom)]
+
+        return inside(self.enemies), inside(self.items), inside(self.projectiles)
+
+
+def enemy_delta(current, base):
+    # Разность врагов с базовым снимком: (ушедшие номера, номера, маски, столбцы)
+    removed = np.setdiff1d(base["uid"], current["uid"], assume_unique=True)
+    if len(base):
+        pos = np.minimum(np.searchsorted(base["uid"], current["uid"]), len(base) - 1)
+        found = base["uid"][pos] == current["uid"]
+        old = base[pos]
+    else:
+        found = np.zeros(len(current), bool)
+        old = current
+    dx = current["x"].astype(np.int32) - old["x"]
+    dy = current["y"].astype(np.int32) - old["y"]
+    moved = (dx != 0) | (dy != 0)
+    small = (np.abs(dx) <= 127) & (np.abs(dy) <= 127)
+    mask = np.where(moved & small, MOVE, 0) | np.where(moved & ~small, ABSOLUTE, 0)
+    mask |= np.where(current["angle"] != old["angle"], ANGLE, 0)
+    mask |= np.where(current["health"] != old["health"], HEALTH, 0)
+    mask = np.where(found, mask, NEW_ENEMY).astype(np.uint8)
+    changed = mask != 0
+    mask = mask[changed]
+    rows, dx, dy = current[changed], dx[changed], dy[changed]
+    columns = [
+        rows["x"][mask & ABSOLUTE != 0], rows["y"][mask & ABSOLUTE != 0],
+        dx[mask & MOVE != 0].astype(np.int8), dy[mask & MOVE != 0].astype(np.int8),
+        rows["angle"][mask & ANGLE != 0], rows["health"][mask & HEALTH != 0], rows["ai"][mask & AI != 0],
+    ]
+    return removed, rows["uid"], mask, columns
+
+
+def encode_snapshot(tick, baseline, input_seq, frame, view, base=None):
+    # Снимок для одного клиента: мир внутри view, враги - разностью с base
+    # (врагами снимка baseline). Возвращает (пакет, враги этого снимка)
+    enemies, items, shots = frame.near(view)
+    if base is None:
+        baseline = 0
+        base = np.zeros(0, ENEMY)
+    removed, uids, mask, columns = enemy_delta(enemies, base)
+    body = b"".join([
+        SNAPSHOT_WORLD.pack(frame.score, frame.game_time, frame.running, len(frame.players), len(items),
+                            len(shots), len(removed), len(uids)),
+        frame.players.tobytes(), items.tobytes(), shots.tobytes(),
+        removed.astype("<u4").tobytes(), uids.astype("<u4").tobytes(), mask.tobytes(),
+    ] + [column.tobytes() for column in columns])
+    flags = 0
+    if len(body) > 128:
+        packed = zlib.compress(body, 1)
+        if len(packed) < len(body):
+            body = packed
+            flags |= COMPRESSED
+    return SNAPSHOT_HEADER.pack(SNAPSHOT, tick, baseline, input_seq, flags) + body, enemies
+
+
+# Разобранный снимок
+class SnapshotData:
+    def __init__(self, tick, baseline, input_seq, score, game_time, running, players, enemies, items, projectiles):
+        self.tick = tick
+        self.baseline = baseline
+        self.input_seq = input_seq
+        self.score = score
+        self.game_time = game_time
+        self.running = running
+        self.players = players
+        self.enemies = enemies
+        self.items = items
+        self.projectiles = projectiles
+
+
+def decode_snapshot(data, states):
+    # states - враги уже полученных снимков по тикам; None, если базового
+    # снимка у клиента нет
+    _, tick, baseline, input_seq, flags = SNAPSHOT_HEADER.unpack_from(data)
+    body = data[SNAPSHOT_HEADER.size:]
+    if flags & COMPRESSED:
+        body = zlib.decompress(body)
+    if baseline:
+        base = states.get(baseline)
+        if base is None:
+            return None
+    else:
+        base = np.zeros(0, ENEMY)
+    score, game_time, running, n_players, n_items, n_shots, n_removed, n_changed = SNAPSHOT_WORLD.unpack_from(body)
+    offset = SNAPSHOT_WORLD.size
+
+    def read(dtype, count):
+        nonlocal offset
+        values = np.frombuffer(body, dtype, count, offset)
+        offset += values.nbytes
+        return values
+
+    players = read(PLAYER, n_players)
+    items = read(ITEM, n_items)
+    shots = read(PROJECTILE, n_shots)
+    removed = read("<u4", n_removed)
+    uids = read("<u4", n_changed)
+    mask = read("u1", n_changed)
+    absolute = mask & ABSOLUTE != 0
+    move = mask & MOVE != 0
+
+    # Базовый снимок без ушедших врагов, поверх - измененные и новые
+    enemies = base[~np.isin(base["uid"], removed)]
+    rows = np.zeros(n_changed, ENEMY)
+    rows["uid"] = uids
+    if len(enemies):
+        pos = np.minimum(np.searchsorted(enemies["uid"], uids), len(enemies) - 1)
+        found = enemies["uid"][pos] == uids
+        rows[found] = enemies[pos[found]]
+    else:
+        pos = found = np.zeros(n_changed, bool)
+    rows["x"][absolute] = read("<i2", int(absolute.sum()))
+    rows["y"][absolute] = read("<i2", int(absolute.sum()))
+    rows["x"][move] += read("i1", int(move.sum()))
+    rows["y"][move] += read("i1", int(move.sum()))
+    for bit, name in ((ANGLE, "angle"), (HEALTH, "health"), (AI, "ai")):
+        selected = mask & bit != 0
+        rows[name][selected] = read("u1", int(selected.sum()))
+    if len(enemies):
+        enemies = enemies.copy()
+        enemies[pos[found]] = rows[found]
+        rows = rows[~found]
+    enemies = np.concatenate([enemies, rows])
+    enemies.sort(order="uid")
+    return SnapshotData(tick, baseline, input_seq, score, game_time, bool(running), players, enemies, items, shots)
+
+
+# Отправка через сокет с имитацией сети: доля потерянных пакетов loss,
+# задержка latency мс и случайная добавка к ней до jitter мс (пакеты с
+# разной задержкой приходят не по порядку)
+class LossyChannel:
+    def __init__(self, sock, loss=0.0, latency=0, jitter=0, seed=None):
+        self.sock = sock
+        self.loss = loss
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.queue = []  # (время отправки, порядковый номер, данные, адрес)
+        self.counter = 0
+        self.dropped = 0
+
+    def send(self, data, address):
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = (self.latency + self.rng.uniform(0, self.jitter)) / 1000
+        if delay <= 0:
+            self._send(data, address)
+            return
+        heapq.heappush(self.queue, (time.perf_counter() + delay, self.counter, data, address))
+        self.counter += 1
+
+    def flush(self):
+        # Отправляет пакеты, чья задержка истекла
+        now = time.perf_counter()
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            _, _, data, address = heapq.heappop(queue)
+            self._send(data, address)
+
+    def next_due(self):
+        return self.queue[0][0] if self.queue else None
+
+    def _send(self, data, address):
+        try:
+            self.sock.sendto(data, address)
+        except OSError:
+            pass  # Адресат ушел: для UDP это не ошибка
+
+
+# Счетчики трафика и времени тика за текущее окно
+class NetStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.start = time.perf_counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.packets_in = 0
+        self.packets_out = 0
+        self.ticks = 0
+        self.tick_ms = 0.0
+        self.tick_max = 0.0
+        self.encodes = 0  # Рассылок снимков
+        self.encode_ms = 0.0
+
+    def received(self, size):
+        self.bytes_in += size
+        self.packets_in += 1
+
+    def sent(self, size):
+        self.bytes_out += size
+        self.packets_out += 1
+
+    def tick(self, seconds):
+        ms = seconds * 1000
+        self.ticks += 1
+        self.tick_ms += ms
+        self.tick_max = max(self.tick_max, ms)
+
+    def elapsed(self):
+        return max(1e-9, time.perf_counter() - self.start)
+
+    def summary(self):
+        elapsed = self.elapsed()
+        ticks = max(1, self.ticks)
+        return (f"тик {self.tick_ms / ticks:.2f} мс (макс {self.tick_max:.2f}), "
+                f"рассылка снимков {self.encode_ms / max(1, self.encodes):.2f} мс, "
+                f"исх {self.bytes_out / elapsed / 1024:.1f} КБ/с ({self.packets_out / elapsed:.0f} пак/с), "
+                f"вх {self.bytes_in / elapsed / 1024:.1f} КБ/с ({self.packets_in / elapsed:.0f} пак/с)")
@@ -0,0 +1,168 @@
+# Частицы на массивах NumPy: искры от попаданий, брызги при гибели врагов,
+# обломки взрывов. Хранилище выделяется один раз; новые частицы пишутся по
+# кругу, поэтому при переполнении вытесняются самые старые
+import math
+
+import numpy as np
+import pygame
+
+from settings import MAX_PARTICLES
+
+PARTICLE_SIZE = 2  # Сторона квадрата частицы в пикселях
+DRAG = 0.92  # Затухание скорости за тик
+SHADES = 8  # Оттенков на палитру: частица темнеет к концу жизни
+
+# Палитры: цвет в начале и в конце жизни частицы
+PALETTES = {
+    "spark": ((255, 240, 150), (200, 60, 0)),
+    "blood": ((220, 20, 20), (70, 0, 0)),
+    "fire": ((255, 255, 200), (120, 40, 0)),
+    "smoke": ((110, 100, 90), (35, 30, 30)),
+    "dust": ((190, 190, 200), (70, 70, 80)),
+}
+PALETTE_INDEX = {name: index for index, name in enumerate(PALETTES)}
+
+
+def shade_table():
+    # (палитра, оттенок) -> RGB
+    table = np.zeros((len(PALETTES), SHADES, 3), np.uint8)
+    t = np.linspace(0, 1, SHADES)[:, None]
+    for index, (start, end) in enumerate(PALETTES.values()):
+        table[index] = np.round(np.array(start) * (1 - t) + np.array(end) * t)
+    return table
+
+
+class ParticleSystem:
+    def __init__(self, capacity=MAX_PARTICLES, seed=None):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.vx = np.zeros(capacity, np.float32)
+        self.vy = np.zeros(capacity, np.float32)
+        self.age = np.zeros(capacity, np.int32)
+        self.life = np.zeros(capacity, np.int32)  # age >= life - частица мертва
+        self.palette = np.zeros(capacity, np.uint8)
+        self.head = 0  # Куда писать следующую частицу
+        self.count = 0  # Живых частиц после последнего update
+        self.rng = np.random.default_rng(seed)
+        self.colors = shade_table()
+        self.mapped = None  # Цвета в формате пикселей поверхности
+        self.mapped_surface = None
+        self.glyphs = {}
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.life[:] = 0
+        self.count = 0
+
+    def burst(self, x, y, count, palette, speed=(1.0, 4.0), life=(15, 40), angle=None, spread=math.pi):
+        # count частиц из точки (x, y); angle - направление разлета
+        # (None - во все стороны), spread - половина угла конуса
+        count = min(count, self.capacity)
+        rng = self.rng
+        index = (self.head + np.arange(count)) % self.capacity
+        self.head = (self.head + count) % self.capacity
+        if angle is None:
+            angles = rng.uniform(-math.pi, math.pi, count)
+        else:
+            angles = angle + rng.uniform(-spread, spread, count)
+        speeds = rng.uniform(speed[0], speed[1], count)
+        self.x[index] = x
+        self.y[index] = y
+        self.vx[index] = np.cos(angles) * speeds
+        self.vy[index] = np.sin(angles) * speeds
+        self.age[index] = 0
+        self.life[index] = rng.integers(life[0], life[1], count, endpoint=True)
+        self.palette[index] = PALETTE_INDEX[palette]
+        self.count = min(self.capacity, self.count + count)
+
+    # Эмиттеры игровых событий
+
+    def hit(self, x, y, vx, vy):
+        # Искры отлетают назад от пули
+        self.burst(x, y, 10, "spark", (1.0, 3.5), (8, 18), math.atan2(-vy, -vx), 0.9)
+
+    def wound(self, x, y):
+        self.burst(x, y, 12, "blood", (0.5, 3.0), (15, 30))
+
+    def death(self, x, y):
+        self.burst(x, y, 40, "blood", (1.0, 5.0), (20, 45))
+
+    def dust(self, x, y, vx, vy):
+        self.burst(x, y, 8, "dust", (0.5, 2.5), (10, 25), math.atan2(-vy, -vx), 1.2)
+
+    def explosion(self, x, y, radius):
+        # Скорость такая, чтобы обломки долетали примерно до края взрыва
+        reach = radius * (1 - DRAG) / 1.2
+        self.burst(x, y, 300, "fire", (reach * 0.3, reach * 1.2), (20, 40))
+        self.burst(x, y, 120, "smoke", (reach * 0.1, reach * 0.6), (40, 70))
+
+    def update(self):
+        if self.count == 0:
+            return
+        alive = self.age < self.life
+        self.x += self.vx
+        self.y += self.vy
+        self.vx *= DRAG
+        self.vy *= DRAG
+        self.age += alive
+        self.count = int(np.count_nonzero(self.age < self.life))
+
+    def _map(self, screen):
+        # Палитры в значения пикселей поверхности (один раз на поверхность)
+        if self.mapped_surface is not screen:
+            colors = self.colors.reshape(-1, 3).tolist()
+            self.mapped = np.array([screen.map_rgb(c) for c in colors], np.uint32).reshape(self.colors.shape[:2])
+            self.mapped_surface = screen
+            self.glyphs = {}
+        return self.mapped
+
+    def frame(self):
+        # Живые частицы: копии (x, y, палитра, оттенок) для отрисовки в другом потоке
+        index = np.flatnonzero(self.age < self.life)
+        return (self.x[index], self.y[index], self.palette[index],
+                (self.age[index] * SHADES // self.life[index]).astype(np.uint8))
+
+    def draw(self, screen, ox=0, oy=0):
+        # Возвращает прямоугольник экрана с частицами (None - ничего не нарисовано)
+        if self.count == 0:
+            return None
+        return self.draw_frame(screen, self.frame(), ox, oy)
+
+    def draw_frame(self, screen, frame, ox=0, oy=0):
+        x, y, palette, shade = frame
+        width, height = screen.get_size()
+        size = PARTICLE_SIZE
+        sx = x.astype(np.intp) - ox
+        sy = y.astype(np.intp) - oy
+        inside = (sx >= 0) & (sx <= width - size) & (sy >= 0) & (sy <= height - size)
+        if not inside.any():
+            return None
+        sx, sy, palette, shade = sx[inside], sy[inside], palette[inside], shade[inside]
+        if screen.get_bytesize() == 3:
+            # surfarray не работает с 24-битными поверхностями: один blits
+            self._blit(screen, palette, shade, sx, sy)
+        else:
+            colors = self._map(screen)[palette, shade]
+            pixels = pygame.surfarray.pixels2d(screen)
+            for dx in range(size):
+                for dy in range(size):
+                    pixels[sx + dx, sy + dy] = colors
+            del pixels  # Снимает блокировку поверхности
+        left, top = int(sx.min()), int(sy.min())
+        return pygame.Rect(left, top, int(sx.max()) - left + size, int(sy.max()) - top + size)
+
+    def _blit(self, screen, palette, shade, sx, sy):
+        self._map(screen)
+        glyphs = self.glyphs
+        items = []
+        for p, s, x, y in zip(palette.tolist(), shade.tolist(), sx.tolist(), sy.tolist()):
+            glyph = glyphs.get((p, s))
+            if glyph is None:
+                glyph = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE), 0, screen)
+                glyph.fill(self.colors[p, s].tolist())
+                glyphs[(p, s)] = glyph
+            items.append((glyph, (x, y)))
+        screen.blits(items, False)
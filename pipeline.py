@@ -0,0 +1,225 @@
+# Конвейер: симуляция в отдельном потоке с фиксированным шагом, отрисовка в
+# главном. После каждого тика поток публикует неизменяемый снимок мира, а
+# главный поток рисует последний снимок, интерполируя положения между двумя
+# последними тиками. blit/transform и NumPy отпускают GIL, поэтому отрисовка
+# и симуляция идут одновременно
+import copy
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from settings import TICK_RATE, MAX_TICKS_PER_FRAME
+from enemy_ai import CHASER, DRUNKEN, SNIPER
+from entities import Enemy, DrunkenMaster, Sniper, submit_player, submit_enemy
+from projectiles import NORMAL
+from world import Controls
+
+SPRITES = {CHASER: Enemy.sprite, DRUNKEN: DrunkenMaster.sprite, SNIPER: Sniper.sprite}
+TELEPORT = 64  # Сдвиг за тик больше этого - новый объект из пула, а не движение
+
+
+class EnemyFrame:
+    # Враги одного тика в массивах; ids связывают врага между снимками
+    def __init__(self, ids, x, y, angle, ai, health, max_health):
+        self.ids = ids
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.ai = ai
+        self.health = health
+        self.max_health = max_health
+
+    @classmethod
+    def capture(cls, enemies):
+        # Копия хранилища врагов; id объекта - номер врага в снимке
+        n = len(enemies)
+        items = enemies.items
+        return cls(np.array([id(enemy) for enemy in items], np.int64), enemies.x[:n].copy(),
+                   enemies.y[:n].copy(), enemies.angle[:n].copy(), enemies.ai[:n].copy(),
+                   [enemy.health for enemy in items], [enemy.max_health for enemy in items])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def positions(self, previous, alpha):
+        # Положения в доле alpha от previous к этому снимку; враги, которых в
+        # previous не было (или которые перескочили), рисуются где есть
+        x, y = self.x, self.y
+        if previous is None or alpha >= 1 or not len(self) or not len(previous):
+            return x, y
+        order = np.argsort(previous.ids)
+        pos = np.searchsorted(previous.ids, self.ids, sorter=order)
+        pos = order[np.minimum(pos, len(order) - 1)]
+        px, py = previous.x[pos], previous.y[pos]
+        moved = (previous.ids[pos] == self.ids) & (np.abs(x - px) + np.abs(y - py) < TELEPORT)
+        t = np.where(moved, alpha, 1.0)
+        return px + (x - px) * t, py + (y - py) * t
+
+
+class Snapshot:
+    # Копия того, что нужно для кадра, HUD и счетчиков профилировщика;
+    # по набору полей похожа на World, поэтому ее принимает FrameProfiler.count
+    def __init__(self, world):
+        self.time = time.perf_counter()
+        self.game_time = world.game_time
+        self.score = world.score
+        self.running = world.running
+        self.obstacles = world.obstacles  # Не меняется после создания мира
+        self.camera = copy.copy(world.camera)
+        self.players = [copy.copy(player) for player in world.players]
+        self.player = self.players[0]
+        self.enemies = EnemyFrame.capture(world.enemies)
+        self.projectiles = world.projectiles.copy()
+        self.medkits = [copy.copy(item) for item in world.medkits]
+        self.special_items = [copy.copy(item) for item in world.special_items]
+        self.particles = world.particles
+        self.particle_frame = world.particles.frame() if world.particles is not None else None
+
+    @property
+    def health(self):
+        return self.player.health
+
+    @property
+    def special_attacks(self):
+        return self.player.special_attacks
+
+    def camera_at(self, previous, alpha):
+        if previous is None or alpha >= 1:
+            return self.camera
+        camera = copy.copy(self.camera)
+        camera.x = round(previous.camera.x + (self.camera.x - previous.camera.x) * alpha)
+        camera.y = round(previous.camera.y + (self.camera.y - previous.camera.y) * alpha)
+        return camera
+
+    def submit(self, queue, previous=None, alpha=1.0):
+        # Порядок и слои те же, что в Renderer.draw
+        for item in self.medkits + self.special_items:
+            if queue.visible(item.x, item.y):
+                item.submit(queue)
+
+        coop = len(self.players) > 1
+        for index, player in enumerate(self.players):
+            if coop and player.health <= 0:
+                continue  # Выбывший в совместной игре игрок
+            x, y = player.x, player.y
+            if previous is not None:
+                last = previous.players[index]
+                x = last.x + (x - last.x) * alpha
+                y = last.y + (y - last.y) * alpha
+            submit_player(queue, x - queue.ox, y - queue.oy, player.angle, player.health, player.max_health)
+
+        # Пули летят по прямой: их положение внутри тика известно и без previous
+        projectiles = self.projectiles
+        if alpha < 1 and projectiles.count:
+            projectiles = projectiles.copy()
+            n = projectiles.count
+            straight = projectiles.kind[:n] == NORMAL
+            back = 1 - alpha
+            projectiles.x[:n][straight] -= projectiles.vx[:n][straight] * back
+            projectiles.y[:n][straight] -= projectiles.vy[:n][straight] * back
+        projectiles.submit(queue)
+
+        enemies = self.enemies
+        if len(enemies):
+            x, y = enemies.positions(previous.enemies if previous is not None else None, alpha)
+            left, top, right, bottom = queue.view
+            visible = (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+            ox, oy = queue.ox, queue.oy
+            for i in np.flatnonzero(visible).tolist():
+                submit_enemy(queue, SPRITES[enemies.ai[i]], x[i] - ox, y[i] - oy, enemies.angle[i],
+                             enemies.health[i], enemies.max_health[i])
+
+    def draw_particles(self, screen, camera):
+        return self.particles.draw_frame(screen, self.particle_frame, camera.x, camera.y)
+
+
+class SimThread(threading.Thread):
+    # inputs - ввод записи (итератор из Replay) или None для живого ввода:
+    # главный поток пишет клавиши в keys и нажатия через press()
+    # rewind - RewindBuffer: пока rewinding, время идет назад
+    def __init__(self, world, tick_rate=TICK_RATE, inputs=None, recorder=None, on_tick=None, rewind=None):
+        super().__init__(name="simulation", daemon=True)
+        self.world = world
+        self.tick_seconds = 1 / tick_rate
+        self.inputs = inputs
+        self.recorder = recorder
+        self.on_tick = on_tick  # Вызывается после каждого тика с world.game_time
+        self.rewind = rewind
+        self.rewinding = False
+        self.keys = Controls()
+        self.clicks = deque()
+        self.calls = deque()  # Функции от мира, которые выполнятся в потоке симуляции
+        self.stopping = threading.Event()
+        self.done = False
+        self.ticks = 0
+        self.dropped = 0  # Тики, пропущенные, когда симуляция не успевала
+        first = Snapshot(world)
+        # Двойной буфер: (предыдущий, последний); кортеж заменяется целиком,
+        # поэтому читатель всегда видит согласованную пару
+        self.snapshots = (first, first)
+
+    def press(self, button, x, y):
+        self.clicks.append((button, x, y))
+
+    def call(self, function):
+        self.calls.append(function)
+
+    def run(self):
+        world = self.world
+        step = self.tick_seconds
+        next_tick = time.perf_counter()
+        while not self.stopping.is_set() and world.running:
+            now = time.perf_counter()
+            if now < next_tick:
+                self.stopping.wait(next_tick - now)
+                continue
+            # Как и в обычном цикле: после долгой паузы не догоняем больше MAX_TICKS_PER_FRAME
+            if now - next_tick > MAX_TICKS_PER_FRAME * step:
+                self.dropped += int((now - next_tick) / step)
+                next_tick = now
+            if not self.step():
+                break
+            next_tick += step
+        self.done = True
+
+    def step(self):
+        world = self.world
+        while self.calls:
+            self.calls.popleft()(world)
+        if self.inputs is not None:
+            tick_input = next(self.inputs, None)
+            if tick_input is None:
+                return False
+            world.step(*tick_input)
+        elif self.rewinding and self.rewind is not None:
+            self.rewind.rewind(world)
+            self.clicks.clear()
+        else:
+            # Нажатия мыши применяются в первом тике после события
+            clicks = []
+            while self.clicks:
+                clicks.append(self.clicks.popleft())
+            tick_input = (self.keys, clicks)
+            if self.recorder is not None:
+                tick_input = self.recorder.record(*tick_input)
+            world.step(*tick_input)
+            if self.rewind is not None:
+                self.rewind.record(world)
+        if self.on_tick is not None:
+            self.on_tick(world.game_time)
+        self.snapshots = (self.snapshots[1], Snapshot(world))
+        self.ticks += 1
+        return True
+
+    def latest(self):
+        # (предыдущий снимок, последний, доля тика с момента последнего)
+        previous, current = self.snapshots
+        alpha = min(1.0, (time.perf_counter() - current.time) / self.tick_seconds)
+        return previous, current, alpha
+
+    def stop(self):
+        self.stopping.set()
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,78 @@
+# Пулы объектов и управление сборщиком мусора
+import gc
+
+
+class EntityPool:
+    # Свободные (погибшие) объекты по классам; acquire возвращает старый
+    # объект после reset вместо создания нового
+    def __init__(self, limit=1024):
+        self.limit = limit  # Максимум свободных объектов одного класса
+        self.free = {}
+        self.created = 0  # Счетчики для отчета benchmark.py
+        self.reused = 0
+
+    def acquire(self, cls, *args):
+        free = self.free.get(cls)
+        if free:
+            obj = free.pop()
+            obj.reset(*args)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return cls(*args)
+
+    def release(self, obj):
+        free = self.free.setdefault(type(obj), [])
+        if len(free) < self.limit:
+            free.append(obj)
+
+
+def swap_remove(items, index):
+    # Удаление за O(1): на место удаляемого ставится последний элемент
+    last = items.pop()
+    if index < len(items):
+        items[index] = last
+
+
+# Режимы сборщика мусора:
+#   auto   - как в Python по умолчанию
+#   freeze - после загрузки все объекты замораживаются (gc.freeze),
+#            сборщик не обходит их при каждой сборке
+#   manual - автоматическая сборка выключена, молодые поколения собираются
+#            раз в interval тиков игрового времени, полная сборка - в конце
+GC_MODES = ("auto", "freeze", "manual")
+
+
+class GcPolicy:
+    def __init__(self, mode="auto", interval=600):
+        if mode not in GC_MODES:
+            raise ValueError(f"unknown gc mode: {mode}")
+        self.mode = mode
+        self.interval = interval
+        self.was_enabled = gc.isenabled()
+        self.collections = 0
+        self.next_collect = interval
+
+    def after_load(self):
+        if self.mode == "auto":
+            return
+        gc.collect()
+        gc.freeze()
+        if self.mode == "manual":
+            gc.disable()
+
+    def tick(self, game_time):
+        # game_time растет на world.dt за шаг, поэтому сравнение, а не
+        # кратность; после перемотки или загрузки время может уйти назад
+        if self.mode == "manual" and not self.next_collect - self.interval <= game_time < self.next_collect:
+            gc.collect(1)
+            self.collections += 1
+            self.next_collect = game_time - game_time % self.interval + self.interval
+
+    def restore(self):
+        if self.mode == "auto":
+            return
+        gc.unfreeze()
+        if self.was_enabled:
+            gc.enable()
+        gc.collect()
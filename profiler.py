@@ -0,0 +1,162 @@
+# Замер фаз кадра, экранный оверлей и выгрузка телеметрии в CSV/NDJSON
+import json
+import time
+from collections import deque
+
+import pygame
+
+from settings import WHITE
+from assets import sprites
+
+PHASES = ("events", "player", "spawn", "items", "enemy_move", "collision", "particles",
+          "draw_background", "draw_items", "draw_player", "draw_projectiles", "draw_enemies",
+          "draw_flush", "draw_particles", "draw_hud", "overlay", "flip")
+COUNTERS = ("enemies", "player_bullets", "enemy_bullets", "grenades", "pickups", "particles")
+SHADES = " .:-=+*#%@"  # Высота столбика гистограммы в оверлее
+
+
+def no_mark(name):
+    pass
+
+
+def percentile(values, q):
+    # q-й перцентиль (0-100) ближайшим значением; общий для профилировщика,
+    # benchmark.py и balance.py
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class FrameProfiler:
+    def __init__(self, window=300, telemetry=None, refresh=30):
+        self.window = window  # Сколько последних кадров хранится
+        self.samples = {phase: deque(maxlen=window) for phase in PHASES + ("frame",)}
+        self.current = dict.fromkeys(PHASES, 0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.frame = 0
+        self.start = self.last = 0
+        self.overlay = False
+        self.refresh = refresh  # Текст оверлея обновляется раз в refresh кадров
+        self.overlay_surface = None
+        self.font = None
+        self.sink = None
+        self.csv = False
+        # Счетчики кэшей в оверлее: имя -> функция, возвращающая словарь
+        self.sources = {"sprites": sprites.stats}
+        if telemetry is not None:
+            self.open(telemetry)
+
+    def open(self, path):
+        self.sink = open(path, "w", buffering=1 << 16)
+        self.csv = path.endswith(".csv")
+        if self.csv:
+            self.sink.write(",".join(("frame", "time_ns") + PHASES + ("frame_ns",) + COUNTERS) + "\n")
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
+
+    @property
+    def enabled(self):
+        return self.overlay or self.sink is not None
+
+    def begin_frame(self):
+        self.start = self.last = time.perf_counter_ns()
+        for phase in self.current:
+            self.current[phase] = 0
+
+    def mark(self, name):
+        # Время с предыдущей отметки записывается на фазу name
+        now = time.perf_counter_ns()
+        self.current[name] += now - self.last
+        self.last = now
+
+    def count(self, world):
+        projectiles = world.projectiles
+        shots, enemy_shots, grenades = projectiles.partition()
+        self.counters["enemies"] = len(world.enemies)
+        self.counters["player_bullets"] = len(shots)
+        self.counters["enemy_bullets"] = len(enemy_shots)
+        self.counters["grenades"] = len(grenades)
+        self.counters["pickups"] = len(world.medkits) + len(world.special_items)
+        self.counters["particles"] = len(world.particles) if world.particles is not None else 0
+
+    def end_frame(self):
+        total = self.last - self.start
+        for phase, value in self.current.items():
+            self.samples[phase].append(value)
+        self.samples["frame"].append(total)
+        self.frame += 1
+        if self.sink is not None:
+            self._export(total)
+
+    def _export(self, total):
+        if self.csv:
+            row = [self.frame, self.start] + [self.current[p] for p in PHASES] + [total]
+            row += [self.counters[c] for c in COUNTERS]
+            self.sink.write(",".join(map(str, row)) + "\n")
+        else:
+            record = {"frame": self.frame, "time_ns": self.start, "frame_ns": total}
+            record.update(self.current)
+            record.update(self.counters)
+            self.sink.write(json.dumps(record) + "\n")
+
+    def stats(self, phase):
+        # Среднее, 95-й перцентиль и максимум за окно, мс
+        values = self.samples[phase]
+        if not values:
+            return 0.0, 0.0, 0.0
+        mean = sum(values) / len(values)
+        return mean / 1e6, percentile(values, 95) / 1e6, max(values) / 1e6
+
+    def histogram(self, phase, bucket_ms=1.0, buckets=20):
+        # Гистограмма времени фазы за окно: число кадров в каждой корзине,
+        # последняя корзина - все, что дольше
+        counts = [0] * buckets
+        for value in self.samples[phase]:
+            counts[min(buckets - 1, int(value / 1e6 / bucket_ms))] += 1
+        return counts
+
+    def histogram_line(self, phase, bucket_ms=2.0, buckets=20):
+        # Гистограмма одной строкой текста: столбик на корзину
+        counts = self.histogram(phase, bucket_ms, buckets)
+        top = max(counts) or 1
+        bars = "".join(SHADES[-(-count * (len(SHADES) - 1) // top)] for count in counts)
+        return f"{phase} 0-{bucket_ms * buckets:.0f} мс |{bars}|"
+
+    def watch(self, name, stats):
+        self.sources[name] = stats
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.overlay_surface = None
+
+    def draw_overlay(self, screen):
+        if not self.overlay:
+            return None
+        if self.overlay_surface is None or self.frame % self.refresh == 0:
+            self.overlay_surface = self._render_overlay()
+        return screen.blit(self.overlay_surface, (screen.get_width() - self.overlay_surface.get_width() - 5, 5))
+
+    def _render_overlay(self):
+        if self.font is None:
+            self.font = pygame.font.SysFont("monospace", 14)
+        lines = ["фаза            ср    p95    макс"]
+        for phase in PHASES + ("frame",):
+            mean, p95, peak = self.stats(phase)
+            lines.append(f"{phase:16s}{mean:5.2f} {p95:6.2f} {peak:7.2f}")
+        lines.append(self.histogram_line("frame"))
+        lines.append(" ".join(f"{name}={value}" for name, value in self.counters.items()))
+        for source, stats in self.sources.items():
+            lines.append(f"{source}: " + " ".join(f"{name}={value}" for name, value in stats().items()))
+        rendered = [self.font.render(line, True, WHITE) for line in lines]
+        width = max(surf.get_width() for surf in rendered) + 10
+        height = sum(surf.get_height() for surf in rendered) + 10
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 160))
+        y = 5
+        for surf in rendered:
+            surface.blit(surf, (5, y))
+            y += surf.get_height()
+        return surface
@@ -0,0 +1,199 @@
+# Пул снарядов на массивах NumPy: все пули обновляются одним векторным шагом
+import numpy as np
+
+from settings import WIDTH, HEIGHT, BLACK, ORANGE, YELLOW
+from effects import get_explosion
+from render_queue import LAYER_PROJECTILES, get_dot
+
+# Типы снарядов
+NORMAL = 0
+EXPLOSIVE = 1
+
+# Владелец 0 - игрок, остальные номера - снайперы
+OWNER_PLAYER = 0
+
+BULLET_SPEED = 10
+GRENADE_SPEED = 8
+EXPLOSION_RADIUS = 100
+
+
+class ProjectilePool:
+    def __init__(self, capacity=1024):
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, np.float64)
+        self.y = np.zeros(capacity, np.float64)
+        self.vx = np.zeros(capacity, np.float64)
+        self.vy = np.zeros(capacity, np.float64)
+        self.tx = np.zeros(capacity, np.float64)  # Цель гранаты
+        self.ty = np.zeros(capacity, np.float64)
+        self.radius = np.zeros(capacity, np.int32)
+        self.blast = np.zeros(capacity, np.int32)  # Радиус взрыва
+        self.kind = np.zeros(capacity, np.int8)
+        self.timer = np.zeros(capacity, np.int32)
+        self.owner = np.zeros(capacity, np.int32)
+        self.exploded = np.zeros(capacity, np.bool_)
+        self.contact = np.zeros(capacity, np.bool_)  # Взрыв при касании
+        self.alive = np.zeros(capacity, np.bool_)
+
+    def _arrays(self):
+        return (self.x, self.y, self.vx, self.vy, self.tx, self.ty, self.radius, self.blast,
+                self.kind, self.timer, self.owner, self.exploded, self.contact, self.alive)
+
+    def _grow(self):
+        old = self._arrays()
+        n = self.count
+        self._allocate(self.capacity * 2)
+        for new, prev in zip(self._arrays(), old):
+            new[:n] = prev[:n]
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, vx=0.0, vy=0.0, radius=5, kind=NORMAL, owner=OWNER_PLAYER,
+              timer=0, tx=0.0, ty=0.0, blast=0, contact=False):
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i], self.y[i] = x, y
+        self.vx[i], self.vy[i] = vx, vy
+        self.tx[i], self.ty[i] = tx, ty
+        self.radius[i] = radius
+        self.blast[i] = blast
+        self.kind[i] = kind
+        self.timer[i] = timer
+        self.owner[i] = owner
+        self.exploded[i] = False
+        self.contact[i] = contact
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    def kill(self, i):
+        self.alive[i] = False
+
+    def kill_owner(self, owner):
+        n = self.count
+        self.alive[:n] &= self.owner[:n] != owner
+
+    def clear(self):
+        self.count = 0
+
+    def copy(self):
+        # Пул с копией живых снарядов (для снимков мира)
+        n = self.count
+        pool = ProjectilePool(max(1, n))
+        for new, prev in zip(pool._arrays(), self._arrays()):
+            new[:n] = prev[:n]
+        pool.count = n
+        return pool
+
+    def partition(self):
+        # Живые пули игрока, пули врагов и гранаты одним проходом
+        n = self.count
+        if n == 0:
+            return [], [], []
+        alive = self.alive[:n]
+        normal = alive & (self.kind[:n] == NORMAL)
+        mine = self.owner[:n] == OWNER_PLAYER
+        return (np.flatnonzero(normal & mine).tolist(),
+                np.flatnonzero(normal & ~mine).tolist(),
+                np.flatnonzero(alive & ~normal).tolist())
+
+    def compact(self):
+        # Сдвигаем живые снаряды в начало массивов без создания списков
+        n = self.count
+        keep = self.alive[:n]
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        keep = keep.copy()
+        for a in self._arrays():
+            a[:k] = a[:n][keep]
+        self.count = k
+
+    def update(self, bounds=(0, 0, WIDTH, HEIGHT), dt=1):
+        # bounds - (left, top, right, bottom) области, где пули еще живут;
+        # dt - тиков за шаг (скорости заданы за один тик)
+        left, top, right, bottom = bounds
+        self.compact()
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        alive = self.alive[:n]
+        explosive = self.kind[:n] == EXPLOSIVE
+
+        def inside(x, y):
+            inside = (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+            if dt > 1:
+                # Как при шаге в один тик: пуля, вылетевшая за область уже
+                # на первом тике шага, исчезает, даже если к концу шага вернулась
+                back = dt - 1
+                x, y = x - vx * back, y - vy * back
+                inside &= (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+            return inside
+
+        if not explosive.any():
+            # Только обычные пули: летят по прямой и исчезают за пределами области
+            x += vx * dt
+            y += vy * dt
+            alive &= inside(x, y)
+            self.compact()
+            return
+        exploded = self.exploded[:n]
+
+        # Обычные пули летят по прямой и исчезают за пределами области
+        straight = ~explosive
+        x[straight] += vx[straight] * dt
+        y[straight] += vy[straight] * dt
+        alive &= ~straight | inside(x, y)
+
+        # Анимация взрыва; взрыв живет, пока в шаг попадает хоть один его тик
+        burning = explosive & exploded
+        self.timer[:n][burning] -= dt
+        alive &= ~(burning & (self.timer[:n] <= 1 - dt))
+
+        # Гранаты летят к цели, не перелетая ее; скорость за тик сохраняется
+        # в vx, vy, чтобы по ней находить касания за шаг
+        flying = explosive & ~exploded
+        if flying.any():
+            dx = self.tx[:n][flying] - x[flying]
+            dy = self.ty[:n][flying] - y[flying]
+            dist = np.maximum(1, np.sqrt(dx * dx + dy * dy))
+            arrived = dist < 10  # Достиг цели
+            step = np.where(arrived, 0, np.minimum(GRENADE_SPEED * dt, dist) / dist)
+            x[flying] += dx * step
+            y[flying] += dy * step
+            self.vx[:n][flying] = dx * step / dt
+            self.vy[:n][flying] = dy * step / dt
+            exploded[np.flatnonzero(flying)[arrived]] = True
+
+        self.compact()
+
+    def submit(self, queue):
+        # Пули и гранаты - готовые круги, взрыв - один готовый кадр анимации;
+        # снаряды за пределами экрана пропускаются
+        n = self.count
+        ox, oy = queue.ox, queue.oy
+        x, y = self.x[:n], self.y[:n]
+        visible = self.alive[:n]
+        if queue.view is not None:
+            left, top, right, bottom = queue.view
+            visible = visible & (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+        for i in np.flatnonzero(visible).tolist():
+            radius = int(self.radius[i])
+            if self.kind[i] == NORMAL:
+                color = BLACK if self.owner[i] == OWNER_PLAYER else YELLOW
+            elif not self.exploded[i]:
+                color = ORANGE
+            else:
+                get_explosion(int(self.blast[i])).submit(queue, LAYER_PROJECTILES,
+                                                         self.x[i] - ox, self.y[i] - oy, self.timer[i])
+                continue
+            queue.add(LAYER_PROJECTILES, get_dot(color, radius),
+                      (int(self.x[i]) - radius - ox, int(self.y[i]) - radius - oy))
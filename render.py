@@ -0,0 +1,251 @@
+# Отрисовка мира поверх симуляции (необязательный слой)
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from assets import sprites, warm_up_rotations
+from effects import get_explosion
+from hud import Hud
+from projectiles import EXPLOSION_RADIUS
+from profiler import no_mark
+from render_queue import RenderQueue
+from settings import CHUNK_SIZE, CHUNK_CACHE, WALL_COLOR
+
+
+def paint_walls(surface, walls, x0=0, y0=0):
+    # Стены (x, y, w, h) в координатах мира; (x0, y0) - угол поверхности в мире.
+    # Прямоугольник обрезается заранее: fill с отрицательными координатами
+    # закрашивает лишнее
+    bounds = surface.get_rect()
+    for x, y, w, h in walls:
+        rect = bounds.clip((x - x0, y - y0, w, h))
+        if rect:
+            surface.fill(WALL_COLOR, rect)
+
+
+# Фон арены больше экрана: картинка фона повторяется плиткой, на экран идут
+# готовые куски chunk_size x chunk_size. Куски строятся, только когда попадают
+# на экран, и в памяти остается не больше limit последних
+class ChunkedBackground:
+    def __init__(self, tile, chunk_size=CHUNK_SIZE, limit=CHUNK_CACHE, walls=()):
+        self.tile = tile
+        self.walls = walls
+        self.chunk_size = chunk_size
+        self.limit = limit
+        self.chunks = OrderedDict()
+        self.built = 0
+
+    def chunk(self, cx, cy):
+        key = (cx, cy)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self.chunks.move_to_end(key)
+            return surface
+        size = self.chunk_size
+        tile_width, tile_height = self.tile.get_size()
+        surface = pygame.Surface((size, size), 0, self.tile)
+        for y in range(-(cy * size % tile_height), size, tile_height):
+            for x in range(-(cx * size % tile_width), size, tile_width):
+                surface.blit(self.tile, (x, y))
+        paint_walls(surface, self.walls, cx * size, cy * size)
+        self.chunks[key] = surface
+        self.built += 1
+        if len(self.chunks) > self.limit:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def draw(self, screen, camera, area=None):
+        # area - часть экрана, которую нужно закрасить (None - весь экран)
+        area = screen.get_rect() if area is None else screen.get_rect().clip(area)
+        if not area:
+            return
+        size = self.chunk_size
+        left = camera.x + area.left
+        top = camera.y + area.top
+        items = []
+        for cy in range(top // size, (top + area.height - 1) // size + 1):
+            for cx in range(left // size, (left + area.width - 1) // size + 1):
+                items.append((self.chunk(cx, cy), (cx * size - camera.x, cy * size - camera.y)))
+        screen.set_clip(area)
+        screen.blits(items, False)
+        screen.set_clip(None)
+
+
+class Renderer:
+    def __init__(self, screen, font, output=None):
+        # output - куда показывать кадр: pygame.display или Display с масштабом
+        self.screen = screen
+        self.output = output if output is not None else pygame.display
+        self.font = font
+        # До первого кадра нужен только фон, остальное прогревается потом
+        self.background = sprites.get_background(screen.get_size())
+        self.chunks = None  # Фон по кускам, если арена больше экрана
+        self.obstacles = None
+        self.arena_background = self.background  # Фон со стенами
+        self.warm_up_tasks = self._warm_up_tasks()
+        self.hud = Hud(font)
+        self.hud.add_line("score", "Счет: {}", (10, 10))
+        self.hud.add_line("health", "Здоровье: {}", (10, 50))
+        self.hud.add_line("special", "Гранаты: {}", (10, 90))
+        self.hud.add_line("time", "Время: {:02d}:{:02d}", (10, 130))
+        self.queue = RenderQueue()
+        self.mark = no_mark
+        self.rects = []  # Области, измененные в текущем кадре
+
+    def _warm_up_tasks(self):
+        yield from sprites.warm_up()
+        yield from warm_up_rotations()
+        yield from get_explosion(EXPLOSION_RADIUS).build()
+
+    def warm_up(self, budget_ms=2.0):
+        # Прогрев кэшей порциями не дольше budget_ms за вызов (None - целиком)
+        if self.warm_up_tasks is None:
+            return
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        for _ in self.warm_up_tasks:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+        self.warm_up_tasks = None
+
+    def set_obstacles(self, obstacles):
+        # Стены рисуются прямо в фон: в статичный или в куски большой арены
+        self.obstacles = obstacles
+        self.chunks = None
+        self.arena_background = self.background
+        if obstacles.walls:
+            self.arena_background = self.background.copy()
+            paint_walls(self.arena_background, obstacles.walls)
+
+    def fill_background(self, camera, area=None):
+        if not camera.scrolls:
+            if area is None:
+                self.screen.blit(self.arena_background, (0, 0))
+            else:
+                self.screen.blit(self.arena_background, area, area)
+            return
+        if self.chunks is None:
+            walls = self.obstacles.walls if self.obstacles is not None else ()
+            self.chunks = ChunkedBackground(self.background, walls=walls)
+        self.chunks.draw(self.screen, camera, area)
+
+    def clear(self, camera):
+        self.fill_background(camera)
+
+    def add_dirty(self, rect):
+        if rect is not None:
+            self.rects.append(rect)
+
+    def begin(self, camera, obstacles):
+        if obstacles is not self.obstacles:
+            self.set_obstacles(obstacles)
+        self.queue.look_at(camera)
+        self.rects = []
+        self.clear(camera)
+        self.mark("draw_background")
+
+    def draw(self, world):
+        screen = self.screen
+        mark = self.mark
+        queue = self.queue
+        camera = world.camera
+        self.begin(camera, world.obstacles)
+
+        # Объекты только складываются в очередь по слоям: предметы, игрок,
+        # снаряды, враги; на экран все уходит в flush. Все, что дальше
+        # запаса за краем экрана, пропускается
+        for medkit in world.medkits:
+            if queue.visible(medkit.x, medkit.y):
+                medkit.submit(queue)
+
+        for special in world.special_items:
+            if queue.visible(special.x, special.y):
+                special.submit(queue)
+        mark("draw_items")
+
+        world.player.submit(queue)
+        mark("draw_player")
+        world.projectiles.submit(queue)
+        mark("draw_projectiles")
+
+        enemies = world.enemies
+        n = len(enemies)
+        if n:
+            left, top, right, bottom = queue.view
+            x, y = enemies.x[:n], enemies.y[:n]
+            visible = (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+            items = enemies.items
+            for i in np.flatnonzero(visible).tolist():
+                items[i].submit(queue)
+        mark("draw_enemies")
+
+        self.rects += queue.flush(screen)
+        mark("draw_flush")
+
+        # Частицы пишутся прямо в пиксели кадра поверх объектов
+        if world.particles is not None:
+            self.add_dirty(world.particles.draw(screen, camera.x, camera.y))
+        mark("draw_particles")
+        self.draw_hud(world.score, world.player.health, world.player.special_attacks, world.game_time)
+
+    def draw_snapshot(self, snapshot, previous=None, alpha=1.0):
+        # Кадр по снимку мира из потока симуляции (pipeline.Snapshot):
+        # положения между previous и snapshot в доле alpha тика
+        camera = snapshot.camera_at(previous, alpha)
+        self.begin(camera, snapshot.obstacles)
+        snapshot.submit(self.queue, previous, alpha)
+        self.mark("draw_enemies")
+        self.rects += self.queue.flush(self.screen)
+        self.mark("draw_flush")
+        if snapshot.particles is not None:
+            self.add_dirty(snapshot.draw_particles(self.screen, camera))
+        self.mark("draw_particles")
+        self.draw_hud(snapshot.score, snapshot.health, snapshot.special_attacks, snapshot.game_time)
+
+    def draw_hud(self, score, health, special_attacks, game_time):
+        # Отрисовка интерфейса (текст обновляется только при изменении значений)
+        hud = self.hud
+        hud.set("score", score)
+        hud.set("health", health)
+        hud.set("special", special_attacks)
+        hud.set("time", game_time // 3600, (game_time % 3600) // 60)
+        self.add_dirty(hud.draw(self.screen))
+        self.mark("draw_hud")
+
+    def present(self):
+        self.output.flip()
+
+
+# Рисует заново только области, где объекты были в прошлом кадре или есть
+# сейчас: фон восстанавливается по старым прямоугольникам, на экран
+# отправляются только измененные прямоугольники
+class DirtyRectRenderer(Renderer):
+    def __init__(self, screen, font, output=None):
+        super().__init__(screen, font, output)
+        self.previous = []
+        self.full_redraw = True
+        self.camera_pos = None
+
+    def invalidate(self):
+        # Следующий кадр будет нарисован и показан целиком
+        self.full_redraw = True
+
+    def clear(self, camera):
+        # Сдвиг камеры меняет весь экран
+        if (camera.x, camera.y) != self.camera_pos:
+            self.camera_pos = (camera.x, camera.y)
+            self.full_redraw = True
+        if self.full_redraw:
+            self.fill_background(camera)
+            return
+        for rect in self.previous:
+            self.fill_background(camera, rect)
+
+    def present(self):
+        if self.full_redraw:
+            self.output.flip()
+            self.full_redraw = False
+        else:
+            self.output.update(self.previous + self.rects)
+        self.previous = self.rects
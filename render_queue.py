@@ -0,0 +1,100 @@
+# Очередь отрисовки: объекты сдают пары (поверхность, позиция), а на экран
+# они уходят одним вызовом screen.blits() на слой, снизу вверх
+import pygame
+
+from settings import RED, GREEN
+
+# Слои в порядке отрисовки
+LAYER_ITEMS = 0
+LAYER_PLAYER = 1
+LAYER_PROJECTILES = 2
+LAYER_ENEMIES = 3
+LAYER_COUNT = 4
+
+COLORKEY = (255, 0, 255)
+CULL_MARGIN = 128  # Запас за краем экрана: половина спрайта, полоска здоровья, взрыв
+
+
+class RenderQueue:
+    def __init__(self, layers=LAYER_COUNT):
+        self.layers = [[] for _ in range(layers)]
+        # Левый верхний угол экрана в координатах мира и область, которую стоит рисовать
+        self.ox = 0
+        self.oy = 0
+        self.view = None
+
+    def look_at(self, camera, margin=CULL_MARGIN):
+        self.ox = camera.x
+        self.oy = camera.y
+        self.view = camera.view(margin)
+
+    def visible(self, x, y):
+        left, top, right, bottom = self.view
+        return left <= x <= right and top <= y <= bottom
+
+    def add(self, layer, surface, dest, area=None):
+        if area is None:
+            self.layers[layer].append((surface, dest))
+        else:
+            self.layers[layer].append((surface, dest, area))
+
+    def __len__(self):
+        return sum(len(items) for items in self.layers)
+
+    def clear(self):
+        for items in self.layers:
+            items.clear()
+
+    def flush(self, screen):
+        # Возвращает список измененных областей экрана
+        rects = []
+        for items in self.layers:
+            if items:
+                rects += screen.blits(items)
+                items.clear()
+        return rects
+
+
+# Полоска здоровья из двух готовых отрезков: красный фон и зеленая часть,
+# от которой берется кусок нужной длины
+class HealthBar:
+    def __init__(self, width, height=5):
+        self.width = width
+        self.height = height
+        self.back = pygame.Surface((width, height))
+        self.back.fill(RED)
+        self.front = pygame.Surface((width, height))
+        self.front.fill(GREEN)
+
+    def submit(self, queue, layer, x, y, health, max_health):
+        queue.add(layer, self.back, (x, y))
+        fill = self.width * (health / max_health)
+        if fill >= 1:
+            queue.add(layer, self.front, (x, y), pygame.Rect(0, 0, fill, self.height))
+
+
+health_bars = {}
+
+
+def get_health_bar(width):
+    bar = health_bars.get(width)
+    if bar is None:
+        bar = HealthBar(width)
+        health_bars[width] = bar
+    return bar
+
+
+# Круг заданного цвета и радиуса: вместо pygame.draw.circle на каждую пулю
+dots = {}
+
+
+def get_dot(color, radius):
+    key = (color, radius)
+    dot = dots.get(key)
+    if dot is None:
+        dot = pygame.Surface((2 * radius, 2 * radius))
+        dot.fill(COLORKEY)
+        dot.set_colorkey(COLORKEY)
+        pygame.draw.circle(dot, color, (radius, radius), radius)
+        dots[key] = dot
+    return dot
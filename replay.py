@@ -0,0 +1,205 @@
+# Запись и воспроизведение ввода по тикам в компактном двоичном формате
+#
+# Формат: заголовок (магия, версия, seed мира, размер арены, плотность стен),
+# затем записи тиков.
+# Байт записи: младшие 4 бита - клавиши WASD, флаг CLICKS - за ним
+# количество нажатий и (кнопка, x, y) для каждого, флаг RUN - за ним
+# varint с числом одинаковых тиков подряд (простой без нажатий).
+import hashlib
+import struct
+import time
+
+from settings import WIDTH, HEIGHT, ARENA_WIDTH, ARENA_HEIGHT
+from world import World, Controls
+
+MAGIC = b"HPRP"
+VERSION = 4  # С версии 4 мир считает столкновения по пути за шаг (World.swept)
+HEADER = struct.Struct("<4sBQHHH")  # Версии 3 и 4
+HEADER_V2 = struct.Struct("<4sBQHH")  # Без стен
+HEADER_V1 = struct.Struct("<4sBQ")  # Без размера арены: арена в один экран
+CLICK = struct.Struct("<Bhh")
+
+KEY_LEFT = 0x01
+KEY_RIGHT = 0x02
+KEY_UP = 0x04
+KEY_DOWN = 0x08
+CLICKS = 0x10
+RUN = 0x20
+
+
+def keys_mask(keys):
+    controls = keys if isinstance(keys, Controls) else Controls.from_keys(keys)
+    mask = 0
+    if controls.left:
+        mask |= KEY_LEFT
+    if controls.right:
+        mask |= KEY_RIGHT
+    if controls.up:
+        mask |= KEY_UP
+    if controls.down:
+        mask |= KEY_DOWN
+    return mask
+
+
+def mask_controls(mask):
+    return Controls(bool(mask & KEY_LEFT), bool(mask & KEY_RIGHT), bool(mask & KEY_UP), bool(mask & KEY_DOWN))
+
+
+def normalize_clicks(clicks):
+    # В записи координаты целые, поэтому и в мир передаются целые
+    return tuple((int(button), int(round(x)), int(round(y))) for button, x, y in clicks)
+
+
+def write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recorder:
+    def __init__(self, seed, arena=(ARENA_WIDTH, ARENA_HEIGHT), walls=0):
+        self.seed = seed
+        self.arena = arena
+        self.walls = walls
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, seed, *arena, walls))
+        self.ticks = 0
+        self.run_mask = None  # Клавиши текущей серии тиков без нажатий
+        self.run_length = 0
+
+    def _flush_run(self):
+        if self.run_length == 1:
+            self.data.append(self.run_mask)
+        elif self.run_length > 1:
+            self.data.append(self.run_mask | RUN)
+            write_varint(self.data, self.run_length)
+        self.run_mask = None
+        self.run_length = 0
+
+    def record(self, keys, clicks=()):
+        # Возвращает ввод в том виде, в каком он будет воспроизведен
+        mask = keys_mask(keys)
+        clicks = normalize_clicks(clicks)
+        self.ticks += 1
+        if not clicks:
+            if mask != self.run_mask:
+                self._flush_run()
+                self.run_mask = mask
+            self.run_length += 1
+        else:
+            self._flush_run()
+            self.data.append(mask | CLICKS)
+            self.data.append(len(clicks))
+            for click in clicks:
+                self.data += CLICK.pack(*click)
+        return mask_controls(mask), clicks
+
+    def getvalue(self):
+        self._flush_run()
+        return bytes(self.data)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.getvalue())
+
+
+class Replay:
+    def __init__(self, data):
+        magic, version, self.seed = HEADER_V1.unpack_from(data)
+        if magic != MAGIC or version not in (1, 2, 3, VERSION):
+            raise ValueError("not a Hotline Podolsk replay")
+        self.walls = 0
+        self.swept = version >= 4  # Старые записи воспроизводятся старыми столкновениями
+        if version == 1:
+            self.arena = (WIDTH, HEIGHT)
+            self.start = HEADER_V1.size
+        elif version == 2:
+            self.arena = HEADER_V2.unpack_from(data)[3:]
+            self.start = HEADER_V2.size
+        else:
+            *_, width, height, self.walls = HEADER.unpack_from(data)
+            self.arena = (width, height)
+            self.start = HEADER.size
+        self.data = data
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def __iter__(self):
+        # Выдает (клавиши, нажатия) для каждого тика
+        data = self.data
+        pos = self.start
+        while pos < len(data):
+            flags = data[pos]
+            pos += 1
+            controls = mask_controls(flags)
+            if flags & CLICKS:
+                count = data[pos]
+                pos += 1
+                clicks = []
+                for _ in range(count):
+                    clicks.append(CLICK.unpack_from(data, pos))
+                    pos += CLICK.size
+                yield controls, tuple(clicks)
+            elif flags & RUN:
+                length, pos = read_varint(data, pos)
+                for _ in range(length):
+                    yield controls, ()
+            else:
+                yield controls, ()
+
+    def play(self, world=None, on_tick=None):
+        # Воспроизведение с любой скоростью: задержки добавляет on_tick
+        world = world if world is not None else World(self.seed, arena=self.arena, walls=self.walls,
+                                                      swept=self.swept)
+        for keys, clicks in self:
+            if not world.running:
+                break
+            world.step(keys, clicks)
+            if on_tick is not None:
+                on_tick(world)
+        return world
+
+
+def state_digest(world):
+    # Отпечаток состояния мира для сравнения прогонов. Координаты игрока
+    # приводятся к float: после загрузки состояния они дробные
+    digest = hashlib.sha1()
+    player = world.player
+    digest.update(repr((float(player.x), float(player.y), player.health, player.special_attacks,
+                        world.score, world.game_time)).encode())
+    n = len(world.enemies)
+    for array in (world.enemies.x, world.enemies.y, world.enemies.angle):
+        digest.update(array[:n].tobytes())
+    n = world.projectiles.count
+    for array in (world.projectiles.x, world.projectiles.y, world.projectiles.timer):
+        digest.update(array[:n].tobytes())
+    return digest.hexdigest()
+
+
+if __name__ == "__main__":
+    import sys
+
+    replay = Replay.load(sys.argv[1])
+    start = time.perf_counter()
+    world = replay.play()
+    elapsed = time.perf_counter() - start
+    print(f"{world.game_time} тиков за {elapsed:.2f} с, счет {world.score}, "
+          f"отпечаток {state_digest(world)}")
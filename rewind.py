@@ -0,0 +1,362 @@
+# Перемотка времени и быстрое сохранение. Состояние мира (игрок, враги,
+# предметы, снаряды, таймеры и генераторы случайных чисел) упаковывается в
+# два плоских массива: дробные и целые значения. История - кольцо последних
+# секунд: каждые REWIND_KEYFRAME тиков ключевой кадр, между ними сжатая
+# разность (XOR) с предыдущим тиком
+import random
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+
+from settings import TICK_RATE, REWIND_SECONDS, REWIND_KEYFRAME
+from enemy_ai import FLOAT_FIELDS, INT_FIELDS, CHASER, DRUNKEN, SNIPER
+from entities import Enemy, DrunkenMaster, Sniper, Medkit, SpecialAttackItem
+from world import ENEMY_TYPES
+
+ENEMY_CLASSES = {CHASER: Enemy, DRUNKEN: DrunkenMaster, SNIPER: Sniper}
+SCRATCH = random.Random(0)  # Для reset новых объектов: генераторы мира не трогаются
+SAVE_HEADER = struct.Struct("<4sII")
+SAVE_MAGIC = b"HPSV"
+
+
+def split128(value):
+    return [(value >> shift) & 0xFFFFFFFF for shift in (0, 32, 64, 96)]
+
+
+def join128(words):
+    return sum(int(word) << shift for word, shift in zip(words, (0, 32, 64, 96)))
+
+
+PROJECTILE_INTS = ("radius", "blast", "kind", "timer", "owner", "exploded", "contact", "alive")
+PROJECTILE_FLOATS = ("x", "y", "vx", "vy", "tx", "ty")
+# Целые заголовка: поля мира, убийства по типам, поля игрока, размеры
+# массивов, затем состояния генераторов
+WORLD_INTS = ("game_time", "score", "enemy_spawn_timer", "item_spawn_timer", "running", "sniper_count")
+PLAYER_INTS = ("health", "shoot_cooldown", "special_attacks")
+COUNT_INTS = ("enemies", "projectiles", "medkits", "specials", "enemy_size", "projectile_size")
+RANDOM_INTS = 2 + 625  # random.Random: версия, есть ли gauss, 624 слова и позиция
+PCG_INTS = 4 + 4 + 2  # PCG64: state и inc по 128 бит, has_uint32, uinteger
+HEADER_INTS = (len(WORLD_INTS) + len(ENEMY_TYPES) + len(PLAYER_INTS) + len(COUNT_INTS)
+               + RANDOM_INTS + PCG_INTS)
+BLOCK = 64  # Массивы объектов дополняются до кратного BLOCK
+
+
+def padded(count):
+    return -(-count // BLOCK) * BLOCK
+
+
+def block(array, count, size):
+    # Первые count значений array, дополненные нулями до size
+    if count == size:
+        return array[:size]
+    result = np.zeros(size, array.dtype)
+    result[:count] = array[:count]
+    return result
+
+
+def pack_state(world):
+    # -> (floats, ints): массивы float64 и int64. Массивы врагов и снарядов
+    # дополняются до кратного BLOCK, а предметы идут в конце, чтобы при смене
+    # числа объектов остальные значения обычно не сдвигались и разность с
+    # прошлым тиком оставалась почти нулевой
+    player = world.player
+    enemies = world.enemies
+    projectiles = world.projectiles
+    n = len(enemies)
+    m = projectiles.count
+    enemy_size = padded(n)
+    projectile_size = padded(m)
+    version, words, gauss = world.rng.getstate()
+    generator = enemies.rng.bit_generator.state
+
+    header = [getattr(world, name) for name in WORLD_INTS]
+    header += [world.kills[name] for name in ENEMY_TYPES]
+    header += [getattr(player, name) for name in PLAYER_INTS]
+    header += [n, m, len(world.medkits), len(world.special_items), enemy_size, projectile_size]
+    header += [version, gauss is not None]
+    header += words
+    header += split128(generator["state"]["state"]) + split128(generator["state"]["inc"])
+    header += [generator["has_uint32"], generator["uinteger"]]
+
+    # Поля врагов, которые живут в объектах, а не в хранилище
+    attributes = np.zeros((4, enemy_size), np.int64)
+    if n:
+        attributes[:, :n] = np.array([(enemy.health, enemy.max_health, getattr(enemy, "dodge_count", 0),
+                                       getattr(enemy, "owner", 0)) for enemy in enemies.items]).T
+    item_ints = []
+    for item in world.medkits:
+        item_ints += [item.lifetime, item.blink_timer, item.visible]
+    for item in world.special_items:
+        item_ints += [item.animation_timer, item.lifetime, item.blink_timer, item.visible]
+    item_floats = []
+    for item in world.medkits + world.special_items:
+        item_floats += [item.x, item.y]
+
+    ints = np.concatenate([np.array(header, np.int64), block(enemies.ai, n, enemy_size), attributes.ravel()]
+                          + [block(getattr(enemies, name), n, enemy_size) for name in INT_FIELDS]
+                          + [block(getattr(projectiles, name), m, projectile_size) for name in PROJECTILE_INTS]
+                          + [np.array(item_ints, np.int64)], dtype=np.int64)
+    # Координаты и направление игрока дробные: в целых они бы округлялись
+    floats = np.concatenate([np.array([player.angle, gauss if gauss is not None else 0.0,
+                                       player.x, player.y, player.last_dx, player.last_dy])]
+                            + [block(getattr(enemies, name), n, enemy_size) for name in FLOAT_FIELDS]
+                            + [block(getattr(projectiles, name), m, projectile_size)
+                               for name in PROJECTILE_FLOATS]
+                            + [np.array(item_floats, np.float64)], dtype=np.float64)
+    return floats, ints
+
+
+def unpack_state(world, floats, ints):
+    player = world.player
+    values = ints[:HEADER_INTS].tolist()
+    for name, value in zip(WORLD_INTS, values):
+        setattr(world, name, value)
+    world.running = bool(world.running)
+    pos = len(WORLD_INTS)
+    for name in ENEMY_TYPES:
+        world.kills[name] = values[pos]
+        pos += 1
+    for name in PLAYER_INTS:
+        setattr(player, name, values[pos])
+        pos += 1
+    n, m, medkits, specials, enemy_size, projectile_size = values[pos:pos + len(COUNT_INTS)]
+    pos += len(COUNT_INTS)
+    player.angle = float(floats[0])
+    player.x, player.y, player.last_dx, player.last_dy = floats[2:6].tolist()
+    version, has_gauss = values[pos:pos + 2]
+    world.rng.setstate((version, tuple(values[pos + 2:pos + RANDOM_INTS]), float(floats[1]) if has_gauss else None))
+    pos += RANDOM_INTS
+    generator = world.enemies.rng.bit_generator
+    state = generator.state
+    state["state"] = {"state": join128(values[pos:pos + 4]), "inc": join128(values[pos + 4:pos + 8])}
+    state["has_uint32"], state["uinteger"] = values[pos + 8:pos + 10]
+    generator.state = state
+    pos = HEADER_INTS
+    fpos = 6
+
+    # Враги: объекты того же класса берутся из текущих, недостающие - из пула
+    store = world.enemies
+    ai = ints[pos:pos + n].tolist()
+    pos += enemy_size
+    health, max_health, dodge_count, owner = ints[pos:pos + 4 * enemy_size].reshape(4, -1)[:, :n].tolist()
+    pos += 4 * enemy_size
+    spare = {}
+    for enemy in store.detach_all():
+        spare.setdefault(type(enemy), []).append(enemy)
+    restored = []
+    for i, kind in enumerate(ai):
+        cls = ENEMY_CLASSES[kind]
+        free = spare.get(cls)
+        if free:
+            enemy = free.pop()
+        elif cls is Sniper:
+            enemy = world.pool.acquire(cls, world.projectiles, SCRATCH, owner[i])
+        else:
+            enemy = world.pool.acquire(cls, SCRATCH)
+        enemy.rng = world.rng
+        enemy.health = health[i]
+        enemy.max_health = max_health[i]
+        if cls is DrunkenMaster:
+            enemy.dodge_count = dodge_count[i]
+        elif cls is Sniper:
+            enemy.owner = owner[i]
+        restored.append(enemy)
+    for free in spare.values():
+        for enemy in free:
+            world.pool.release(enemy)
+    fields = []
+    for _ in FLOAT_FIELDS:
+        fields.append(floats[fpos:fpos + n])
+        fpos += enemy_size
+    for _ in INT_FIELDS:
+        fields.append(ints[pos:pos + n])
+        pos += enemy_size
+    store.attach(restored, fields)
+
+    # Снаряды
+    projectiles = world.projectiles
+    while projectiles.capacity < m:
+        projectiles._grow()
+    projectiles.count = m
+    for name in PROJECTILE_INTS:
+        getattr(projectiles, name)[:m] = ints[pos:pos + m]
+        pos += projectile_size
+    for name in PROJECTILE_FLOATS:
+        getattr(projectiles, name)[:m] = floats[fpos:fpos + m]
+        fpos += projectile_size
+
+    # Предметы
+    item_values = ints[pos:].tolist()
+    item_xy = floats[fpos:].tolist()
+    for item in world.medkits + world.special_items:
+        world.pool.release(item)
+    world.medkits = []
+    world.special_items = []
+    k = 0
+    for i in range(medkits + specials):
+        if i < medkits:
+            item = world.pool.acquire(Medkit, SCRATCH)
+            item.lifetime, item.blink_timer, visible = item_values[k:k + 3]
+            k += 3
+            world.medkits.append(item)
+        else:
+            item = world.pool.acquire(SpecialAttackItem, SCRATCH)
+            item.animation_timer, item.lifetime, item.blink_timer, visible = item_values[k:k + 4]
+            k += 4
+            world.special_items.append(item)
+        item.visible = bool(visible)
+        item.x, item.y = item_xy[2 * i], item_xy[2 * i + 1]
+
+    world.camera.follow(player.x, player.y)
+    world.removed.clear()
+    if world.particles is not None:
+        world.particles.clear()
+
+
+def encode(floats, ints):
+    # Байты чисел раскладываются по плоскостям (все первые байты, все вторые...):
+    # у соседних значений старшие байты совпадают, и zlib сжимает их лучше
+    return np.concatenate((floats.view(np.uint8).reshape(-1, 8).T.ravel(),
+                           ints.view(np.uint8).reshape(-1, 8).T.ravel()))
+
+
+def decode(raw, float_count, int_count):
+    split = float_count * 8
+    floats = raw[:split].reshape(8, float_count).T.copy().view(np.float64).ravel()
+    ints = raw[split:].reshape(8, int_count).T.copy().view(np.int64).ravel()
+    return floats, ints
+
+
+def xor(a, b):
+    # Побайтный XOR; более короткий массив дополняется нулями
+    if len(a) < len(b):
+        a, b = b, a
+    result = a.copy()
+    result[:len(b)] ^= b
+    return result
+
+
+def frame_size(frame):
+    return (frame[1] + frame[2]) * 8
+
+
+def save_state(world):
+    # Полное состояние мира одной строкой байтов (быстрое сохранение)
+    floats, ints = pack_state(world)
+    return SAVE_HEADER.pack(SAVE_MAGIC, len(floats), len(ints)) + zlib.compress(encode(floats, ints).tobytes(), 1)
+
+
+def load_state(world, data):
+    magic, float_count, int_count = SAVE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise ValueError("not a world state")
+    raw = np.frombuffer(zlib.decompress(data[SAVE_HEADER.size:]), np.uint8)
+    unpack_state(world, *decode(raw, float_count, int_count))
+
+
+class RewindBuffer:
+    def __init__(self, seconds=REWIND_SECONDS, keyframe=REWIND_KEYFRAME, tick_rate=TICK_RATE):
+        # Кадр истории: (game_time, число дробных, число целых, сжатые байты,
+        # ключевой ли кадр). В кольцо должен влезать хотя бы один ключевой
+        # кадр со своими разностями, иначе record выбросит все кадры
+        length = int(seconds * tick_rate)
+        if length < keyframe:
+            raise ValueError(f"rewind history of {length} ticks is shorter than keyframe interval {keyframe}")
+        self.frames = deque(maxlen=length)
+        self.tick_rate = tick_rate
+        self.keyframe = keyframe
+        self.since_key = keyframe  # Первый же кадр будет ключевым
+        self.previous = None  # Байты последнего записанного кадра
+        self.quicksave = None
+
+    def __len__(self):
+        return len(self.frames)
+
+    def clear(self):
+        self.frames.clear()
+        self.since_key = self.keyframe
+        self.previous = None
+
+    def memory(self):
+        # Копия кольца: в конвейерном режиме его пополняет поток симуляции
+        return sum(len(frame[3]) for frame in list(self.frames))
+
+    def stats(self):
+        # Для оверлея профилировщика
+        return {"seconds": round(len(self.frames) / self.tick_rate, 1), "kb": self.memory() // 1024}
+
+    def record(self, world):
+        # Вызывается после каждого тика
+        floats, ints = pack_state(world)
+        raw = encode(floats, ints)
+        frames = self.frames
+        key = self.since_key >= self.keyframe
+        if key:
+            data = raw
+            self.since_key = 1
+        else:
+            # Большая часть состояния за тик не меняется, после XOR это нули
+            data = xor(raw, self.previous)
+            self.since_key += 1
+        self.previous = raw
+        frames.append((world.game_time, len(floats), len(ints), zlib.compress(data.tobytes(), 1), key))
+        # Разности, чей ключевой кадр вытеснен из кольца, уже не восстановить
+        while not frames[0][4]:
+            frames.popleft()
+
+    def _raw(self, index):
+        # Байты кадра frames[index]: от ближайшего ключевого кадра вперед по разностям
+        frames = self.frames
+        start = index
+        while not frames[start][4]:
+            start -= 1
+        raw = np.frombuffer(zlib.decompress(frames[start][3]), np.uint8)
+        for i in range(start + 1, index + 1):
+            raw = xor(raw, np.frombuffer(zlib.decompress(frames[i][3]), np.uint8))[:frame_size(frames[i])]
+        return raw
+
+    def rewind(self, world, ticks=1):
+        # Возврат на ticks тиков назад; более поздняя история отбрасывается.
+        # False - дальше истории нет
+        frames = self.frames
+        if not frames:
+            return False
+        raw = self.previous  # Байты frames[-1]
+        steps = min(ticks, len(frames) - 1)
+        if steps >= self.keyframe:
+            # Далеко назад быстрее вперед от ключевого кадра
+            for _ in range(steps):
+                frames.pop()
+            raw = None
+        for _ in range(steps if raw is not None else 0):
+            frame = frames.pop()
+            if frame[4] or raw is None:
+                raw = self._raw(len(frames) - 1)
+            else:
+                # XOR обратим: шаг назад - одна распаковка
+                raw = xor(raw, np.frombuffer(zlib.decompress(frame[3]), np.uint8))[:frame_size(frames[-1])]
+        if raw is None:
+            raw = self._raw(len(frames) - 1)
+        frame = frames[-1]
+        unpack_state(world, *decode(raw, frame[1], frame[2]))
+        # Запись продолжается от этого кадра
+        self.previous = raw
+        index = len(frames) - 1
+        start = index
+        while not frames[start][4]:
+            start -= 1
+        self.since_key = index - start + 1
+        return steps > 0
+
+    def save(self, world):
+        self.quicksave = save_state(world)
+
+    def load(self, world):
+        # История после загрузки начинается заново
+        if self.quicksave is None:
+            return False
+        load_state(world, self.quicksave)
+        self.clear()
+        return True
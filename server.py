@@ -0,0 +1,271 @@
+# Сервер совместной игры: мир без окна с фиксированным шагом, 1-4 игрока
+# подключаются по UDP. Все решает сервер: клиенты присылают только ввод и
+# получают снимки мира вокруг своего игрока
+import argparse
+import select
+import socket
+import struct
+import time
+
+from settings import (ARENA_WIDTH, ARENA_HEIGHT, TICK_RATE, MAX_TICKS_PER_FRAME, NET_PORT, SNAPSHOT_RATE,
+                      NET_MARGIN, NET_TIMEOUT)
+from camera import Camera
+from world import World, Controls
+from cli import arena_size
+from net import (PROTOCOL, HELLO, WELCOME, FULL, INPUT, BYE, MAX_PACKET, HELLO_PACKET, WELCOME_PACKET,
+                 FULL_PACKET, WorldFrame, LossyChannel, NetStats, unpack_input, unpack_buttons, encode_snapshot)
+
+MAX_PLAYERS = 4
+HISTORY = 64  # Сколько отправленных снимков клиента помнить для разностей
+INPUT_BACKLOG = 30  # Больше непримененных вводов - самые старые отбрасываются
+GAME_OVER_SECONDS = 1  # Столько еще рассылаются снимки после конца игры
+
+
+# Подключенный игрок: его ввод и отправленные ему снимки
+class RemoteClient:
+    def __init__(self, slot, address, nonce):
+        self.slot = slot
+        self.address = address
+        self.nonce = nonce
+        self.connected = True
+        self.inputs = {}  # Номер ввода -> (кнопки, x, y), еще не примененные
+        self.last_input = 0  # Последний примененный ввод
+        self.acked = 0  # Последний снимок, который дошел до клиента
+        self.history = {}  # Тик -> враги отправленного снимка
+        self.last_seen = time.perf_counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def add_inputs(self, inputs):
+        for seq, bits, x, y in inputs:
+            if seq > self.last_input:
+                self.inputs.setdefault(seq, (bits, x, y))
+
+    def next_input(self):
+        # Один ввод на тик по порядку номеров; пока вводов нет, игрок стоит,
+        # а опоздавшие вводы применятся в следующих тиках
+        inputs = self.inputs
+        if not inputs:
+            return Controls(), ()
+        if len(inputs) > INPUT_BACKLOG:
+            for seq in sorted(inputs)[:-INPUT_BACKLOG]:
+                del inputs[seq]
+        seq = min(inputs)
+        self.last_input = seq
+        return unpack_buttons(*inputs.pop(seq))
+
+    def baseline(self):
+        # Враги последнего подтвержденного снимка (None - слать полный)
+        return self.history.get(self.acked)
+
+    def remember(self, tick, enemies):
+        history = self.history
+        history[tick] = enemies
+        for old in [old for old in history if old < self.acked]:
+            del history[old]
+        while len(history) > HISTORY:
+            del history[next(iter(history))]
+
+
+class GameServer:
+    def __init__(self, players=2, port=NET_PORT, seed=None, arena=(ARENA_WIDTH, ARENA_HEIGHT), tick_rate=TICK_RATE,
+                 snapshot_rate=SNAPSHOT_RATE, loss=0.0, latency=0, jitter=0, host="127.0.0.1", log=print):
+        if not 1 <= players <= MAX_PLAYERS:
+            raise ValueError(f"players must be 1..{MAX_PLAYERS}")
+        self.world = World(seed, arena=arena, players=players, tick_rate=tick_rate)
+        self.tick_rate = tick_rate
+        self.snapshot_rate = snapshot_rate
+        self.snapshot_every = max(1, round(tick_rate / snapshot_rate))  # В шагах мира
+        self.steps = 0  # Шаги с начала игры: game_time идет по world.dt за шаг
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.channel = LossyChannel(self.sock, loss, latency, jitter, seed)
+        self.clients = [None] * players
+        self.camera = Camera(*arena)  # Экран игрока, для которого собирается снимок
+        self.stats = NetStats()
+        self.started = False  # Игра идет, когда подключились все игроки
+        self.stopping = False
+        self.log = log  # События игры и счетчики раз в секунду, как у run_bot
+
+    def send(self, client, data):
+        client.bytes_out += len(data)
+        self.stats.sent(len(data))
+        self.channel.send(data, client.address)
+
+    def client_at(self, address):
+        for client in self.clients:
+            if client is not None and client.connected and client.address == address:
+                return client
+        return None
+
+    def receive(self):
+        while True:
+            try:
+                data, address = self.sock.recvfrom(MAX_PACKET)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue  # Windows сообщает так о недоставленном пакете
+            self.stats.received(len(data))
+            try:
+                self.handle(data, address)
+            except (struct.error, IndexError):
+                pass  # Битый или чужой пакет
+
+    def handle(self, data, address):
+        kind = data[0]
+        if kind == HELLO:
+            _, version, nonce = HELLO_PACKET.unpack_from(data)
+            if version == PROTOCOL:
+                self.join(address, nonce)
+            return
+        client = self.client_at(address)
+        if client is None:
+            return
+        client.last_seen = time.perf_counter()
+        client.bytes_in += len(data)
+        if kind == INPUT:
+            _, ack, inputs = unpack_input(data)
+            client.acked = max(client.acked, ack)
+            client.add_inputs(inputs)
+        elif kind == BYE:
+            self.leave(client, "вышел")
+
+    def join(self, address, nonce):
+        # Повторный HELLO (ответ потерялся) получает то же место
+        client = self.client_at(address)
+        if client is None:
+            slot = next((slot for slot, client in enumerate(self.clients) if client is None), None)
+            if slot is None:
+                self.channel.send(FULL_PACKET.pack(FULL, nonce), address)
+                return
+            client = self.clients[slot] = RemoteClient(slot, address, nonce)
+            self.log(f"игрок {slot + 1} подключился с {address[0]}:{address[1]}")
+        camera = self.world.camera
+        self.send(client, WELCOME_PACKET.pack(WELCOME, client.slot, len(self.clients), nonce, camera.arena_width,
+                                              camera.arena_height, self.tick_rate, self.snapshot_rate))
+        if not self.started and None not in self.clients:
+            self.started = True
+            self.log("все игроки на месте, игра началась")
+
+    def leave(self, client, reason):
+        # Ушедший игрок выбывает из игры
+        client.connected = False
+        self.world.players[client.slot].health = 0
+        self.log(f"игрок {client.slot + 1} {reason}")
+
+    def check_timeouts(self):
+        deadline = time.perf_counter() - NET_TIMEOUT
+        for client in self.clients:
+            if client is not None and client.connected and client.last_seen < deadline:
+                self.leave(client, "не отвечает")
+
+    def step(self):
+        start = time.perf_counter()
+        inputs = [client.next_input() if client is not None and client.connected else (Controls(), ())
+                  for client in self.clients]
+        self.world.step_players(inputs)
+        self.stats.tick(time.perf_counter() - start)
+        self.steps += 1
+        if self.steps % self.snapshot_every == 0 or not self.world.running:
+            self.send_snapshots()
+
+    def send_snapshots(self):
+        # Мир квантуется один раз, каждому игроку - своя выборка и разность
+        start = time.perf_counter()
+        world = self.world
+        frame = WorldFrame(world)
+        for client in self.clients:
+            if client is None or not client.connected:
+                continue
+            player = world.players[client.slot]
+            self.camera.follow(player.x, player.y)
+            data, enemies = encode_snapshot(world.game_time, client.acked, client.last_input, frame,
+                                            self.camera.view(NET_MARGIN), client.baseline())
+            client.remember(world.game_time, enemies)
+            self.send(client, data)
+        self.stats.encodes += 1
+        self.stats.encode_ms += (time.perf_counter() - start) * 1000
+
+    def report(self):
+        stats = self.stats
+        elapsed = stats.elapsed()
+        lines = [f"{self.world.game_time // 60} с, врагов {len(self.world.enemies)}: {stats.summary()}"]
+        for client in self.clients:
+            if client is not None and client.connected:
+                lines.append(f"  игрок {client.slot + 1}: исх {client.bytes_out / elapsed / 1024:.1f} КБ/с, "
+                             f"вх {client.bytes_in / elapsed / 1024:.1f} КБ/с, "
+                             f"вводов в очереди {len(client.inputs)}")
+                client.bytes_in = client.bytes_out = 0
+        stats.reset()
+        return "\n".join(lines)
+
+    def run(self, report_interval=1.0):
+        # Фиксированный шаг; между тиками сервер ждет пакеты в select
+        step = 1 / self.tick_rate
+        next_tick = time.perf_counter()
+        next_report = next_tick + report_interval
+        game_over = 0
+        while not self.stopping:
+            self.receive()
+            now = time.perf_counter()
+            if now >= next_tick:
+                if now - next_tick > MAX_TICKS_PER_FRAME * step:
+                    next_tick = now  # После долгой паузы не догоняем
+                next_tick += step
+                if self.started and self.world.running:
+                    self.step()
+                elif self.started:
+                    # Конец игры: последние снимки с running=False еще какое-то время
+                    self.send_snapshots()
+                    game_over += 1
+                    if game_over >= GAME_OVER_SECONDS * self.tick_rate:
+                        break
+                self.check_timeouts()
+            self.channel.flush()
+            if report_interval and now >= next_report:
+                next_report = now + report_interval
+                if self.started:
+                    self.log(self.report())
+            wake = next_tick
+            due = self.channel.next_due()
+            if due is not None:
+                wake = min(wake, due)
+            select.select([self.sock], [], [], max(0.0, wake - time.perf_counter()))
+        self.log(f"игра окончена, счет {self.world.score}")
+
+    def close(self):
+        self.sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hotline Podolsk: сервер совместной игры")
+    parser.add_argument("--players", type=int, default=2, help=f"сколько игроков ждать (1-{MAX_PLAYERS})")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес, на котором слушать")
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--seed", type=int, help="seed генератора случайных чисел мира")
+    parser.add_argument("--arena", type=arena_size, default=(ARENA_WIDTH, ARENA_HEIGHT), metavar="WxH")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="тиков симуляции в секунду")
+    parser.add_argument("--snapshot-rate", type=int, default=SNAPSHOT_RATE, help="снимков в секунду каждому игроку")
+    parser.add_argument("--loss", type=float, default=0.0, help="доля теряемых исходящих пакетов (0-1)")
+    parser.add_argument("--latency", type=float, default=0, help="задержка исходящих пакетов, мс")
+    parser.add_argument("--jitter", type=float, default=0, help="случайная добавка к задержке, до мс")
+    parser.add_argument("--quiet", action="store_true", help="не печатать счетчики раз в секунду")
+    args = parser.parse_args(argv)
+
+    server = GameServer(args.players, args.port, args.seed, args.arena, args.tick_rate, args.snapshot_rate,
+                        args.loss, args.latency, args.jitter, args.host)
+    host, port = server.address
+    print(f"сервер на {host}:{port}, ждем игроков: {args.players}")
+    try:
+        server.run(0 if args.quiet else 1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
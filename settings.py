@@ -0,0 +1,49 @@
+# Общие настройки игры
+
+# Настройки окна
+WIDTH, HEIGHT = 800, 600
+
+# Арена: мир может быть больше окна, камера следует за игроком
+ARENA_WIDTH, ARENA_HEIGHT = WIDTH, HEIGHT  # По умолчанию арена - один экран
+ACTIVE_MARGIN = 200  # Пули исчезают дальше этого расстояния за краем экрана
+FAR_MARGIN = 500  # Дальше от экрана враги двигаются упрощенно (без уворотов и стрельбы)
+CHUNK_SIZE = 256  # Сторона куска фона
+CHUNK_CACHE = 48  # Сколько кусков фона держать в памяти
+
+# Препятствия и поиск пути
+NAV_CELL = 32  # Сторона клетки сетки препятствий
+FLOW_RADIUS = 900  # Поле направлений строится в этом радиусе вокруг игрока
+
+# Частицы
+MAX_PARTICLES = 20000  # Больше - вытесняются самые старые
+
+# Перемотка времени
+REWIND_SECONDS = 60  # Сколько последних секунд хранится
+REWIND_KEYFRAME = 30  # Полный кадр раз в столько тиков, между ними - разности
+
+# Сетевая игра
+NET_PORT = 5555
+SNAPSHOT_RATE = 30  # Снимков в секунду каждому клиенту
+NET_MARGIN = 150  # Враги, предметы и пули дальше этого за краем экрана игрока не отправляются
+NET_TIMEOUT = 5  # Секунд без пакетов до отключения игрока
+INTERP_DELAY = 2  # Чужие объекты рисуются с отставанием на столько интервалов между снимками
+
+# Фиксированный шаг симуляции
+TICK_RATE = 60  # Тиков в секунду
+MAX_TICKS_PER_FRAME = 5  # Ограничение догоняющих шагов после долгого кадра
+
+# Цвета
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+YELLOW = (255, 255, 0)
+PURPLE = (128, 0, 128)
+ORANGE = (255, 165, 0)
+CYAN = (0, 255, 255)
+WALL_COLOR = (70, 70, 80)
+
+# Кэш поворотов спрайтов
+ROTATION_STEPS = 72  # Количество углов (шаг 5 градусов)
+ROTATION_BUDGET = 4 * 1024 * 1024  # Байт на один тип спрайта
@@ -0,0 +1,245 @@
+# Пространственный хэш (равномерная сетка) для широкой фазы столкновений
+import math
+
+import numpy as np
+
+# Смещение, чтобы отрицательные координаты клеток давали корректный ключ
+KEY_OFFSET = 1 << 20
+KEY_STRIDE = 1 << 21
+# При малом числе объектов сетка не строится, запрос проверяет всех
+BRUTE_FORCE_LIMIT = 16
+
+
+def contact_time(px, py, dx, dy, limit):
+    # Первое касание двух движущихся кругов за шаг, t от 0 до 1: p - положение
+    # одного относительно другого в начале шага, d - относительное смещение
+    # за шаг, limit - сумма радиусов. 0 - касались уже в начале, None - нет.
+    # Решается |p + d*t| = limit, т.е. a*t^2 + 2*b*t + c = 0
+    c = px * px + py * py - limit * limit
+    if c < 0:
+        return 0.0
+    b = px * dx + py * dy
+    if b >= 0:
+        return None  # Не сближаются
+    a = dx * dx + dy * dy
+    disc = b * b - a * c
+    if disc <= 0:
+        return None  # Проходят мимо
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1 else None
+
+
+def contact_times(px, py, dx, dy, limit):
+    # То же для массивов; нет касания - inf
+    c = px * px + py * py - limit * limit
+    b = px * dx + py * dy
+    a = dx * dx + dy * dy
+    disc = b * b - a * c
+    hit = (b < 0) & (disc > 0)
+    t = np.full(len(c), np.inf)
+    t[hit] = (-b[hit] - np.sqrt(disc[hit])) / a[hit]
+    t[t > 1] = np.inf
+    t[c < 0] = 0.0
+    return t
+
+
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}  # ключ клетки -> индексы объектов
+        self.brute = False
+        self.ids = np.zeros(0, np.int64)
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.radius = np.zeros(0)
+        self.sx = self.x  # Положения в начале шага
+        self.sy = self.y
+        self.mx = self.x  # Середины пути за шаг
+        self.my = self.y
+        self.shift = np.zeros(0)  # Половины пути за шаг
+        self.max_radius = 0.0
+        self.max_shift = 0.0  # Половина наибольшего смещения за шаг
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _key(self, cx, cy):
+        return (cx + KEY_OFFSET) * KEY_STRIDE + (cy + KEY_OFFSET)
+
+    def build(self, xs, ys, radii=0, ids=None, starts=None):
+        # Полная перестройка за тик: O(n log n) на сортировку ключей.
+        # starts - (xs, ys) тех же объектов в начале шага: тогда объект лежит
+        # в сетке по середине пути, и его можно искать query_swept/query_ahead
+        if len(xs) == 0:
+            self.cells = {}
+            self.brute = False
+            self.ids = np.zeros(0, np.int64)
+            return
+        self.x = np.asarray(xs, np.float64)
+        self.y = np.asarray(ys, np.float64)
+        n = len(self.x)
+        if np.ndim(radii) == 0:
+            self.radius = np.full(n, radii, np.float64)
+        else:
+            self.radius = np.asarray(radii, np.float64)
+        self.ids = np.arange(n) if ids is None else np.asarray(ids, np.int64)
+        self.cells = {}
+        self.brute = 0 < n <= BRUTE_FORCE_LIMIT
+        if starts is None:
+            self.sx, self.sy = self.x, self.y
+        else:
+            self.sx = np.asarray(starts[0], np.float64)
+            self.sy = np.asarray(starts[1], np.float64)
+        if self.brute:
+            # Для нескольких объектов обычный перебор на списках быстрее NumPy
+            self.small = list(zip(self.ids.tolist(), self.x.tolist(), self.y.tolist(), self.radius.tolist(),
+                                  self.sx.tolist(), self.sy.tolist()))
+            return
+        if starts is None:
+            self.mx, self.my = self.x, self.y
+            self.shift = np.zeros(n)
+            self.max_shift = 0.0
+            self.max_radius = float(self.radius.max())
+        else:
+            self.mx, self.my = (self.x + self.sx) / 2, (self.y + self.sy) / 2
+            self.shift = np.hypot(self.x - self.sx, self.y - self.sy) / 2
+            self.max_shift = float(self.shift.max())
+            self.max_radius = float((self.radius + self.shift).max())
+        cx = np.floor(self.mx / self.cell_size).astype(np.int64)
+        cy = np.floor(self.my / self.cell_size).astype(np.int64)
+        keys = self._key(cx, cy)
+        order = np.argsort(keys, kind="stable")
+        keys, starts = np.unique(keys[order], return_index=True)
+        ends = np.append(starts[1:], n)
+        for key, start, end in zip(keys.tolist(), starts.tolist(), ends.tolist()):
+            self.cells[key] = order[start:end]
+
+    def build_objects(self, objects):
+        self.build([o.x for o in objects], [o.y for o in objects], [o.radius for o in objects])
+
+    def query(self, x, y, r, padded=True):
+        # Объекты, пересекающие круг (x, y, r). Если padded=False,
+        # радиус самого объекта не учитывается (проверяется только центр)
+        if self.brute:
+            found = []
+            for i, ox, oy, orad, _, _ in self.small:
+                limit = r + orad if padded else r
+                if (ox - x) ** 2 + (oy - y) ** 2 < limit * limit:
+                    found.append(i)
+            return found
+        idx = self._candidates(x, y, r + self.max_radius if padded else r + self.max_shift)
+        if idx is None:
+            return []
+        return self._narrow(idx, x, y, r, padded)
+
+    def query_swept(self, x0, y0, x1, y1, r):
+        # Объекты, которых за шаг касается круг радиуса r, движущийся из
+        # (x0, y0) в (x1, y1), с учетом их собственного движения (starts в
+        # build): [(время касания 0-1, индекс)] по возрастанию времени
+        dx, dy = x1 - x0, y1 - y0
+        if self.brute:
+            found = []
+            for i, ox, oy, orad, sx, sy in self.small:
+                t = contact_time(x0 - sx, y0 - sy, dx - (ox - sx), dy - (oy - sy), r + orad)
+                if t is not None:
+                    found.append((t, i))
+            found.sort()
+            return found
+        mx, my, half = (x0 + x1) / 2, (y0 + y1) / 2, math.hypot(dx, dy) / 2
+        idx = self._candidates(mx, my, r + half + self.max_radius)
+        if idx is None:
+            return []
+        # Сначала дешевая проверка кругов, в которые укладывается весь путь за шаг,
+        # точное время касания - только для оставшихся
+        ox, oy = self.mx[idx] - mx, self.my[idx] - my
+        limit = r + half + self.radius[idx] + self.shift[idx]
+        idx = idx[ox * ox + oy * oy < limit * limit]
+        found = []
+        for i in idx.tolist():
+            sx, sy = float(self.sx[i]), float(self.sy[i])
+            t = contact_time(x0 - sx, y0 - sy, dx - (float(self.x[i]) - sx), dy - (float(self.y[i]) - sy),
+                             r + float(self.radius[i]))
+            if t is not None:
+                found.append((t, int(self.ids[i])))
+        found.sort()
+        return found
+
+    def query_ahead(self, x, y, r, horizon):
+        # Прогноз: объекты, которые, продолжая движение последнего шага,
+        # за horizon шагов подойдут центром ближе r к точке (x, y). Уже
+        # близкие, но удаляющиеся не считаются: [(через сколько шагов, индекс)]
+        if self.brute:
+            found = []
+            for i, ox, oy, _, sx, sy in self.small:
+                dx, dy = (ox - sx) * horizon, (oy - sy) * horizon
+                t = contact_time(ox - x, oy - y, dx, dy, r)
+                if t is not None and (t > 0 or (ox - x) * dx + (oy - y) * dy < 0):
+                    found.append((t * horizon, i))
+            found.sort()
+            return found
+        idx = self._candidates(x, y, r + self.max_shift * (1 + 2 * horizon))
+        if idx is None:
+            return []
+        # Дальше r плюс путь за horizon шагов объект не успеет подойти
+        px, py = self.x[idx] - x, self.y[idx] - y
+        limit = r + 2 * self.shift[idx] * horizon
+        near = px * px + py * py < limit * limit
+        px, py, idx = px[near], py[near], idx[near]
+        dx, dy = (self.x[idx] - self.sx[idx]) * horizon, (self.y[idx] - self.sy[idx]) * horizon
+        t = contact_times(px, py, dx, dy, r)
+        t[(t == 0) & (px * dx + py * dy >= 0)] = np.inf
+        hit = np.isfinite(t)
+        t, ids = t[hit] * horizon, self.ids[idx[hit]]
+        order = np.lexsort((ids, t))
+        return list(zip(t[order].tolist(), ids[order].tolist()))
+
+    def _candidates(self, x, y, reach):
+        # Индексы объектов из клеток, задетых квадратом вокруг круга (x, y, reach)
+        if not self.cells:
+            return None
+        size = self.cell_size
+        x0, x1 = int((x - reach) // size), int((x + reach) // size)
+        y0, y1 = int((y - reach) // size), int((y + reach) // size)
+        found = []
+        for cx in range(x0, x1 + 1):
+            base = (cx + KEY_OFFSET) * KEY_STRIDE + KEY_OFFSET
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get(base + cy)
+                if cell is not None:
+                    found.append(cell)
+        if not found:
+            return None
+        return found[0] if len(found) == 1 else np.concatenate(found)
+
+    def _narrow(self, idx, x, y, r, padded):
+        # Узкая фаза: сравнение квадратов расстояний
+        dx = self.x[idx] - x
+        dy = self.y[idx] - y
+        limit = r + self.radius[idx] if padded else r
+        idx = idx[dx * dx + dy * dy < limit * limit]
+        idx.sort()
+        return self.ids[idx].tolist()
+
+
+def benchmark(counts=(250, 500, 1000, 2000, 4000), ticks=20, width=800, height=600):
+    # Время одного тика "все пули против всех врагов" при росте числа объектов
+    import time
+    rng = np.random.default_rng(0)
+    grid = SpatialHash()
+    results = []
+    for n in counts:
+        bx, by = rng.uniform(0, width, n), rng.uniform(0, height, n)
+        ex, ey = rng.uniform(0, width, n // 10), rng.uniform(0, height, n // 10)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            grid.build(bx, by, 5)
+            for x, y in zip(ex.tolist(), ey.tolist()):
+                grid.query(x, y, 15)
+        elapsed = (time.perf_counter() - start) / ticks
+        results.append((n, elapsed))
+        print(f"{n:6d} пуль, {n // 10:5d} врагов: {elapsed * 1000:.3f} мс/тик")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,104 @@
+# Кэш спрайтов: после прогрева игра не читает диск
+import os
+import shutil
+
+import pygame
+import pytest
+
+from assets import (sprites, get_rotations, bake_atlas, Atlas, SpriteCache,
+                    ASSETS_ZIP, GAME_SPRITES, ROTATED_SPRITES)
+from effects import get_explosion
+from projectiles import EXPLOSION_RADIUS
+from render import Renderer
+from settings import WIDTH, HEIGHT
+from world import World, nearest_enemy_policy
+
+
+@pytest.fixture
+def screen():
+    pygame.display.init()
+    pygame.font.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.quit()
+
+
+def test_no_disk_reads_after_warm_up(screen):
+    renderer = Renderer(screen, pygame.font.Font(None, 36))
+    renderer.warm_up(None)
+    reads = sprites.stats()["disk_reads"]
+    world = World(2)
+    for _ in range(900):
+        world.step(*nearest_enemy_policy(world))
+        renderer.draw(world)
+    assert world.game_time == 900 and world.score > 0
+    assert sprites.stats()["disk_reads"] == reads
+
+
+def test_warm_up_builds_rotations_within_budget(screen):
+    renderer = Renderer(screen, pygame.font.Font(None, 36))
+    renderer.warm_up(None)
+    for name, scale in ROTATED_SPRITES:
+        rotations = get_rotations(name, scale)
+        # Все повороты, а у крупных спрайтов - сколько влезает в бюджет
+        largest = max(surf.get_width() * surf.get_height() * surf.get_bytesize()
+                      for surf in rotations.frames.values())
+        assert len(rotations.frames) == rotations.steps or rotations.used + largest > rotations.budget
+        assert rotations.used <= rotations.budget
+
+
+def test_warm_up_bakes_explosion_frames(screen):
+    renderer = Renderer(screen, pygame.font.Font(None, 36))
+    renderer.warm_up(None)
+    assert None not in get_explosion(EXPLOSION_RADIUS).frames
+
+
+@pytest.fixture
+def baked(tmp_path):
+    # Свой архив и атлас во временной папке, чтобы не трогать файлы игры
+    archive = str(tmp_path / "assets.zip")
+    shutil.copy(ASSETS_ZIP, archive)
+    paths = {"archive": archive, "directory": str(tmp_path / "assets"),
+             "index": str(tmp_path / "atlas.json"), "pixels": str(tmp_path / "atlas.rgba")}
+    bake_atlas(index=paths["index"], pixels=paths["pixels"], archive=archive)
+    return paths
+
+
+def assert_same_pixels(a, b):
+    assert a.get_size() == b.get_size()
+    assert pygame.image.tobytes(a, "RGBA") == pygame.image.tobytes(b, "RGBA")
+
+
+def check_atlas_matches_decoded(baked):
+    cache = SpriteCache(**baked)
+    decoded = SpriteCache(baked["archive"], baked["directory"], atlas=False)
+    for name, scale in GAME_SPRITES:
+        surf = cache.get(name, scale)
+        assert surf.get_parent() is cache.atlas.surface
+        assert_same_pixels(surf, decoded.get(name, scale))
+    # Атлас заменяет архив целиком
+    assert cache.stats()["disk_reads"] == 0 and cache.stats()["atlas"]
+    return cache
+
+
+def test_atlas_mmap_matches_decoded_sprites(baked):
+    # Без окна атлас остается поверх mmap файла с пикселями
+    cache = check_atlas_matches_decoded(baked)
+    assert cache.atlas.buffer is not None
+
+
+def test_converted_atlas_matches_decoded_sprites(baked, screen):
+    cache = check_atlas_matches_decoded(baked)
+    assert cache.atlas.buffer is None
+
+
+def test_stale_atlas_falls_back_to_zip(baked):
+    stat = os.stat(baked["archive"])
+    os.utime(baked["archive"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert Atlas.load(baked["index"], baked["pixels"], baked["archive"]) is None
+    cache = SpriteCache(**baked)
+    decoded = SpriteCache(baked["archive"], baked["directory"], atlas=False)
+    name, scale = GAME_SPRITES[0]
+    surf = cache.get(name, scale)
+    assert surf.get_parent() is None
+    assert_same_pixels(surf, decoded.get(name, scale))
+    assert cache.stats()["disk_reads"] == 1 and not cache.stats()["atlas"]
@@ -0,0 +1,121 @@
+# Пакетное движение врагов (EnemyStore.update) повторяет прежние методы
+# Enemy.move, DrunkenMaster.move и Sniper.move по одному врагу
+import math
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from entities import Enemy, DrunkenMaster, Sniper
+from enemy_ai import EnemyStore
+from projectiles import ProjectilePool, NORMAL
+from world import World, SpawnRules, nearest_enemy_policy
+
+TICKS = 300
+
+
+def chaser_move(enemy, player_x, player_y, rng, shots):
+    dx = player_x - enemy.x
+    dy = player_y - enemy.y
+    distance = max(1, math.sqrt(dx * dx + dy * dy))
+    dx, dy = dx / distance * enemy.speed, dy / distance * enemy.speed
+    if dx != 0 or dy != 0:
+        enemy.angle = math.degrees(math.atan2(dy, dx)) - 90
+    enemy.x += dx
+    enemy.y += dy
+
+
+def drunken_move(enemy, player_x, player_y, rng, shots):
+    # Случайные числа - из того же генератора и в том же порядке, что у хранилища
+    if enemy.dodge_timer > 0:
+        enemy.x += enemy.dodge_dx
+        enemy.y += enemy.dodge_dy
+        enemy.dodge_timer -= 1
+        if enemy.dodge_dx != 0 or enemy.dodge_dy != 0:
+            enemy.angle = math.degrees(math.atan2(enemy.dodge_dy, enemy.dodge_dx)) - 90
+    else:
+        if enemy.direction_change_timer <= 0:
+            enemy.random_angle = rng.uniform(0, 2 * math.pi, 1)[0]
+            enemy.direction_change_timer = rng.integers(10, 31, 1)[0]
+        else:
+            enemy.direction_change_timer -= 1
+        dx = player_x - enemy.x + math.cos(enemy.random_angle) * 50
+        dy = player_y - enemy.y + math.sin(enemy.random_angle) * 50
+        distance = max(1, math.sqrt(dx * dx + dy * dy))
+        dx, dy = dx / distance * enemy.speed, dy / distance * enemy.speed
+        if dx != 0 or dy != 0:
+            enemy.angle = math.degrees(math.atan2(dy, dx)) - 90
+        enemy.x += dx
+        enemy.y += dy
+
+
+def sniper_move(enemy, player_x, player_y, rng, shots):
+    dx = player_x - enemy.x
+    dy = player_y - enemy.y
+    distance = max(1, math.sqrt(dx * dx + dy * dy))
+    if distance < 300:
+        enemy.x -= dx / distance * enemy.speed
+        enemy.y -= dy / distance * enemy.speed
+    elif distance > 400:
+        enemy.x += dx / distance * enemy.speed
+        enemy.y += dy / distance * enemy.speed
+    if dx != 0 or dy != 0:
+        enemy.angle = math.degrees(math.atan2(dy, dx)) - 90
+    if enemy.shoot_cooldown <= 0 and distance < 500:
+        shots.append((enemy.x, enemy.y, dx / distance * 7, dy / distance * 7, enemy.owner))
+        enemy.shoot_cooldown = 60
+    else:
+        enemy.shoot_cooldown -= 1
+
+
+FIELDS = ("x", "y", "speed", "angle", "dodge_dx", "dodge_dy", "random_angle", "dodge_timer",
+          "direction_change_timer", "shoot_cooldown")
+
+
+def player_path(tick):
+    # Игрок ходит по кругу, враги то подходят, то отстают
+    return 400 + 250 * math.cos(tick / 40), 300 + 200 * math.sin(tick / 25)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+@pytest.mark.parametrize("cls, move", [(Enemy, chaser_move), (DrunkenMaster, drunken_move),
+                                       (Sniper, sniper_move)])
+def test_store_update_matches_per_object_move(cls, move, seed):
+    pool = ProjectilePool()
+    args = (pool, random.Random(seed), 1) if cls is Sniper else (random.Random(seed),)
+    enemy = cls(*args)
+    store = EnemyStore(rng=np.random.default_rng(seed))
+    store.append(enemy)
+    reference = SimpleNamespace(owner=getattr(enemy, "owner", 0), **{name: getattr(enemy, name) for name in FIELDS})
+    rng = np.random.default_rng(seed)
+    shots = []
+    for tick in range(TICKS):
+        if cls is DrunkenMaster and tick % 100 == 50:
+            # Уворот посреди пути
+            for target in (enemy, reference):
+                target.dodge_dx, target.dodge_dy, target.dodge_timer = 6.0, -4.0, 15
+        player_x, player_y = player_path(tick)
+        store.update(player_x, player_y, pool)
+        move(reference, player_x, player_y, rng, shots)
+        assert (enemy.x, enemy.y, enemy.angle) == pytest.approx((reference.x, reference.y, reference.angle))
+    n = pool.count
+    fired = [(pool.x[i], pool.y[i], pool.vx[i], pool.vy[i], pool.owner[i]) for i in range(n)]
+    assert [shot[4] for shot in fired] == [shot[4] for shot in shots]
+    assert np.allclose([shot[:4] for shot in fired], [shot[:4] for shot in shots])
+    assert (cls is not Sniper) == (n == 0)
+    assert all(pool.kind[i] == NORMAL for i in range(n))
+
+
+def test_sniper_owner_ids_do_not_depend_on_earlier_worlds():
+    # Номера снайперов у каждого мира свои: второй прогон в том же
+    # процессе совпадает с первым
+    def owners():
+        world = World(3, rules=SpawnRules(sniper_after=0, sniper_chance=1.0))
+        for _ in range(300):
+            world.step(*nearest_enemy_policy(world))
+        return [enemy.owner for enemy in world.enemies], world.projectiles.owner[:world.projectiles.count].tolist()
+
+    first = owners()
+    assert first[0]
+    assert owners() == first
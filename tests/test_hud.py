@@ -0,0 +1,26 @@
+# Интерфейс: текст растеризуется заново, только когда меняется значение
+import pygame
+import pytest
+
+from hud import Hud
+
+
+@pytest.fixture
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 24)
+
+
+def test_hud_renders_only_changed_values(font):
+    hud = Hud(font)
+    hud.add_line("score", "Счет: {}", (10, 10))
+    hud.add_line("time", "Время: {:02d}:{:02d}", (10, 40))
+    for tick in range(120):
+        hud.set("score", 5)
+        hud.set("time", 0, tick // 60)
+        hud.compose()
+    # 1 раз счет и 2 раза время (0:00 и 0:01), остальное - из кэша
+    assert hud.stats() == {"renders": 3, "cached": 237}
+    first = hud.compose()
+    hud.set("score", 6)
+    assert hud.dirty and hud.compose() is first  # Та же поверхность, новый текст
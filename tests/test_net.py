@@ -0,0 +1,103 @@
+# Совместная игра целиком на loopback: сервер и два бота по плохой сети
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from camera import Camera
+from client import NetClient, parse_address, run_bot
+from entities import Player
+from server import GameServer
+
+SECONDS = 4
+
+
+def test_parse_address_resolves_bare_host():
+    assert parse_address("localhost") == ("127.0.0.1", 5555)
+    assert parse_address("localhost:6000") == ("127.0.0.1", 6000)
+
+
+def test_loopback_game_with_loss_and_latency():
+    server = GameServer(2, port=0, seed=3, loss=0.1, latency=60, log=lambda text: None)
+    thread = threading.Thread(target=server.run, kwargs={"report_interval": 0}, daemon=True)
+    thread.start()
+    clients = [None, None]
+
+    def play(index):
+        clients[index] = run_bot(server.address, SECONDS, loss=0.1, latency=60, seed=index, report_interval=0)
+
+    bots = [threading.Thread(target=play, args=(index,)) for index in range(2)]
+    try:
+        for bot in bots:
+            bot.start()
+        for bot in bots:
+            bot.join()
+    finally:
+        server.stopping = True
+        thread.join()
+        server.close()
+
+    # Оба игрока получили свои места, снимки шли всю игру, а предсказание
+    # почти не расходилось с сервером
+    assert sorted(client.slot for client in clients) == [0, 1]
+    for client in clients:
+        assert not client.full
+        assert client.snapshots > SECONDS * server.snapshot_rate * 0.5
+        assert client.last_tick > (SECONDS - 1) * server.tick_rate
+        assert client.max_correction <= 20
+        assert client.corrections <= 10
+
+
+def test_server_tick_rate_keeps_real_time():
+    # Сервер на 30 шагах в секунду: мир идет по 2 тика за шаг, клиент шлет
+    # ввод с той же частотой, и игровое время совпадает с настоящим
+    server = GameServer(1, port=0, seed=4, tick_rate=30, log=lambda text: None)
+    thread = threading.Thread(target=server.run, kwargs={"report_interval": 0}, daemon=True)
+    thread.start()
+    start = time.perf_counter()
+    try:
+        client = run_bot(server.address, SECONDS, seed=0, report_interval=0)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.stopping = True
+        thread.join()
+        server.close()
+
+    assert client.tick_rate == 30 and client.dt == 2
+    assert server.world.dt == 2
+    # Время до начала игры (подключение) - доли секунды
+    assert (elapsed - 0.5) * 60 <= server.world.game_time <= (elapsed + 0.1) * 60
+    assert len(server.clients[0].inputs) < 10
+    assert client.corrections <= 10
+
+
+def test_snapshots_evenly_spaced_when_world_steps_several_ticks():
+    # 30 шагов в секунду и 10 снимков: снимок каждые 3 шага, то есть 6 тиков
+    server = GameServer(1, port=0, seed=4, tick_rate=30, snapshot_rate=10, log=lambda text: None)
+    sent = []
+    server.send_snapshots = lambda: sent.append(server.world.game_time)
+    try:
+        for _ in range(30):
+            server.step()
+    finally:
+        server.close()
+    assert sent == list(range(6, 61, 6))
+
+
+def test_view_interpolates_in_game_ticks():
+    client = NetClient(("127.0.0.1", 9))
+    try:
+        client.slot, client.tick_rate, client.dt, client.snapshot_every = 0, 30, 2, 3
+        client.player = Player()
+        for tick in range(570, 601, 6):
+            client.frames.append(SimpleNamespace(tick=tick, camera=Camera(),
+                                                 players=[SimpleNamespace(x=0, y=0, angle=0)]))
+        client.last_tick = 600
+        # Прошло 0.05 с = 3 тика; отставание INTERP_DELAY снимков по 6 тиков
+        client.last_time = time.perf_counter() - 0.05
+        previous, current, alpha = client.view()
+    finally:
+        client.close()
+    assert (previous.tick, current.tick) == (588, 594)
+    assert alpha == pytest.approx(0.5, abs=0.1)
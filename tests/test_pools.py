@@ -0,0 +1,30 @@
+# Пулы объектов и ручная сборка мусора
+import pytest
+
+from entities import Enemy
+from pools import EntityPool, GcPolicy
+
+
+def test_pool_reuses_released_objects():
+    pool = EntityPool()
+    enemy = pool.acquire(Enemy)
+    pool.release(enemy)
+    assert pool.acquire(Enemy) is enemy
+    assert (pool.created, pool.reused) == (1, 1)
+
+
+@pytest.mark.parametrize("dt", [1, 2, 3, 7])
+def test_manual_gc_collects_once_per_interval(dt):
+    # Шаг мира не обязан делить интервал сборки
+    policy = GcPolicy("manual", interval=600)
+    for game_time in range(dt, 6000 + dt, dt):
+        policy.tick(game_time)
+    assert policy.collections == 10
+
+
+def test_manual_gc_after_rewind():
+    policy = GcPolicy("manual", interval=600)
+    policy.tick(1800)
+    policy.tick(300)  # Перемотка назад: отсчет начинается заново
+    policy.tick(900)
+    assert policy.collections == 3
@@ -0,0 +1,45 @@
+# Профилировщик кадра: статистика и гистограммы за окно
+from profiler import FrameProfiler, percentile
+
+
+def profiler_with(frames_ms):
+    profiler = FrameProfiler(window=len(frames_ms))
+    for ms in frames_ms:
+        profiler.samples["frame"].append(int(ms * 1e6))
+    return profiler
+
+
+def test_histogram_bucket_counts():
+    profiler = profiler_with([0.2, 0.9, 1.0, 2.5, 3.99, 4.0, 50])
+    # Корзины по 1 мс: [0, 1) [1, 2) [2, 3) [3, 4) и >= 4
+    assert profiler.histogram("frame", bucket_ms=1.0, buckets=5) == [2, 1, 1, 1, 2]
+    assert profiler.histogram("frame", bucket_ms=2.0, buckets=3) == [3, 2, 2]
+    assert sum(profiler.histogram("frame")) == 7
+
+
+def test_histogram_window_is_rolling():
+    profiler = profiler_with([10.0] * 4)
+    for _ in range(4):
+        profiler.samples["frame"].append(int(0.5e6))
+    assert profiler.histogram("frame", buckets=3) == [4, 0, 0]
+
+
+def test_histogram_line():
+    profiler = profiler_with([0.5] * 9 + [30])
+    assert profiler.histogram_line("frame", bucket_ms=2.0, buckets=5) == "frame 0-10 мс |@   .|"
+    assert FrameProfiler().histogram_line("frame", buckets=3).endswith("|   |")
+
+
+def test_percentile():
+    values = list(range(101, 0, -1))  # 101..1 в обратном порядке
+    assert percentile(values, 0) == 1
+    assert percentile(values, 50) == 51
+    assert percentile(values, 95) == 96
+    assert percentile(values, 100) == 101
+    assert percentile([7], 99) == 7
+
+
+def test_stats():
+    profiler = profiler_with([1.0] * 19 + [21.0])
+    mean, p95, peak = profiler.stats("frame")
+    assert (mean, p95, peak) == (2.0, 1.0, 21.0)
@@ -0,0 +1,111 @@
+# Пул снарядов ведет себя как прежние списки пуль игрока и снайперов
+import math
+import random
+
+import pytest
+
+from effects import EXPLOSION_TIME
+from projectiles import (ProjectilePool, NORMAL, EXPLOSIVE, OWNER_PLAYER, BULLET_SPEED, GRENADE_SPEED,
+                         EXPLOSION_RADIUS)
+from settings import WIDTH, HEIGHT
+
+
+def legacy_update(bullets):
+    # Шаг списков словарей из версии до пула (Player.update и
+    # Sniper.update_bullets): удаление через list.remove
+    for bullet in bullets[:]:
+        if bullet["type"] == "normal":
+            bullet["x"] += bullet["dx"]
+            bullet["y"] += bullet["dy"]
+            if bullet["x"] < 0 or bullet["x"] > WIDTH or bullet["y"] < 0 or bullet["y"] > HEIGHT:
+                bullets.remove(bullet)
+        elif not bullet["exploded"]:
+            dx = bullet["target_x"] - bullet["x"]
+            dy = bullet["target_y"] - bullet["y"]
+            dist = max(1, math.sqrt(dx * dx + dy * dy))
+            if dist < 10:
+                bullet["exploded"] = True
+            else:
+                bullet["x"] += dx / dist * GRENADE_SPEED
+                bullet["y"] += dy / dist * GRENADE_SPEED
+        else:
+            bullet["timer"] -= 1
+            if bullet["timer"] <= 0:
+                bullets.remove(bullet)
+
+
+def random_shots(seed, count=300, grenades=0.2):
+    # Одни и те же снаряды в пуле и в списке: пули игрока, пули двух
+    # снайперов и гранаты
+    rng = random.Random(seed)
+    pool = ProjectilePool(16)  # Маленький пул: проверяется и рост
+    bullets = []
+    for _ in range(count):
+        x, y = rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)
+        if rng.random() < grenades:
+            tx, ty = rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)
+            pool.spawn(x, y, radius=10, kind=EXPLOSIVE, timer=EXPLOSION_TIME, tx=tx, ty=ty,
+                       blast=EXPLOSION_RADIUS, contact=True)
+            bullets.append({"type": "explosive", "x": x, "y": y, "target_x": tx, "target_y": ty,
+                            "timer": EXPLOSION_TIME, "exploded": False, "owner": OWNER_PLAYER})
+        else:
+            owner = rng.choice([OWNER_PLAYER, 1, 2])
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = BULLET_SPEED if owner == OWNER_PLAYER else 7
+            dx, dy = math.cos(angle) * speed, math.sin(angle) * speed
+            pool.spawn(x, y, dx, dy, radius=5, kind=NORMAL, owner=owner)
+            bullets.append({"type": "normal", "x": x, "y": y, "dx": dx, "dy": dy, "owner": owner})
+    return pool, bullets
+
+
+def pool_state(pool):
+    # (координаты подряд, (владелец, тип) каждого снаряда)
+    n = pool.count
+    return ([value for i in range(n) for value in (pool.x[i], pool.y[i])],
+            [(int(pool.owner[i]), int(pool.kind[i])) for i in range(n)])
+
+
+def legacy_state(bullets):
+    return ([value for b in bullets for value in (b["x"], b["y"])],
+            [(b["owner"], NORMAL if b["type"] == "normal" else EXPLOSIVE) for b in bullets])
+
+
+def assert_same(state, expected):
+    assert state[1] == expected[1]
+    assert state[0] == pytest.approx(expected[0])
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_pool_matches_list_bullets(seed):
+    pool, bullets = random_shots(seed)
+    for _ in range(150):
+        pool.update()
+        legacy_update(bullets)
+        assert_same(pool_state(pool), legacy_state(bullets))
+    assert not bullets and pool.count == 0
+
+
+def test_kill_owner_drops_only_that_sniper():
+    # Пули погибшего снайпера исчезают, остальные летят дальше
+    pool, bullets = random_shots(4)
+    pool.kill_owner(1)
+    pool.compact()
+    bullets = [bullet for bullet in bullets if bullet["owner"] != 1]
+    assert_same(pool_state(pool), legacy_state(bullets))
+    shots, enemy_shots, grenades = pool.partition()
+    assert all(pool.owner[i] == OWNER_PLAYER for i in shots)
+    assert all(pool.owner[i] == 2 for i in enemy_shots)
+    assert all(pool.kind[i] == EXPLOSIVE for i in grenades)
+
+
+def test_update_with_dt_matches_single_ticks():
+    # Шаг в два тика: те же пули на тех же местах, что после двух шагов по
+    # тику (граната за двойной шаг может долететь до цели точнее, поэтому
+    # только пули)
+    one, _ = random_shots(5, grenades=0)
+    two, _ = random_shots(5, grenades=0)
+    for _ in range(60):
+        one.update()
+        one.update()
+        two.update(dt=2)
+        assert_same(pool_state(two), pool_state(one))
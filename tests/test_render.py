@@ -0,0 +1,72 @@
+# Отрисовка по измененным областям: на экран уходят старое и новое место
+# объекта, а полупрозрачная панель не темнеет от кадра к кадру
+import pygame
+import pytest
+
+from entities import Enemy
+from render import DirtyRectRenderer
+from settings import WIDTH, HEIGHT
+from world import World
+
+HUD_PIXEL = (200, 140)  # Пиксель панели интерфейса без текста
+
+
+class Output:
+    # Вместо pygame.display: запоминает, что показано
+    def __init__(self):
+        self.flips = 0
+        self.updates = []
+
+    def flip(self):
+        self.flips += 1
+
+    def update(self, rects):
+        self.updates.append(list(rects))
+
+
+@pytest.fixture
+def screen():
+    pygame.display.init()
+    pygame.font.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.quit()
+
+
+def covered(rects, x, y):
+    return any(pygame.Rect(rect).collidepoint(x, y) for rect in rects)
+
+
+def test_moved_entity_old_and_new_positions_are_updated(screen):
+    output = Output()
+    renderer = DirtyRectRenderer(screen, pygame.font.Font(None, 36), output)
+    renderer.warm_up(None)
+    world = World(1)
+    world.spawning = False
+    enemy = world.pool.acquire(Enemy, world.rng)
+    enemy.x, enemy.y, enemy.speed = 150, 450, 0
+    world.enemies.append(enemy)
+
+    renderer.draw(world)
+    renderer.present()
+    assert output.flips == 1 and not output.updates  # Первый кадр целиком
+    panel = screen.get_at(HUD_PIXEL)
+
+    old = (150, 450)
+    enemy.x, enemy.y = 650, 450
+    renderer.draw(world)
+    renderer.present()
+    assert output.flips == 1
+    [rects] = output.updates
+    assert covered(rects, *old) and covered(rects, 650, 450)
+    # Старое место закрашено фоном, на новом - враг
+    assert screen.get_at(old) == renderer.background.get_at(old)
+    assert screen.get_at((650, 450)) != renderer.background.get_at((650, 450))
+    assert not covered(rects, 400, 100)  # Нетронутая часть экрана не отправляется
+
+    # Панель восстанавливается фоном перед каждым наложением
+    for _ in range(30):
+        renderer.draw(world)
+        renderer.present()
+    assert screen.get_at(HUD_PIXEL) == panel
+    assert panel != renderer.background.get_at(HUD_PIXEL)
+    assert covered(output.updates[-1], *HUD_PIXEL)
@@ -0,0 +1,85 @@
+# Перемотка и быстрое сохранение: после возврата игра идет так же, как без него
+import pytest
+
+from replay import state_digest
+from rewind import RewindBuffer, save_state, load_state
+from world import World, Controls, nearest_enemy_policy
+
+SEED = 11
+TICKS = 600
+MORE = 300
+
+
+def reference(ticks):
+    # Непрерывный прогон: входы и отпечаток после каждого тика
+    world = World(SEED)
+    inputs, digests = [], []
+    for _ in range(ticks):
+        keys, clicks = nearest_enemy_policy(world)
+        world.step(keys, clicks)
+        inputs.append((keys, clicks))
+        digests.append(state_digest(world))
+    return inputs, digests
+
+
+def detour(world, ticks, buffer=None):
+    # Другие входы: игрок уходит вправо и стреляет в сторону
+    for _ in range(ticks):
+        world.step(Controls(right=True), ((3, 0, 0),))
+        if buffer is not None:
+            buffer.record(world)
+
+
+@pytest.mark.parametrize("back", [5, 120])
+def test_rewind_then_resume_matches_uninterrupted_run(back):
+    inputs, digests = reference(TICKS + MORE)
+    world = World(SEED)
+    buffer = RewindBuffer()
+    for keys, clicks in inputs[:TICKS]:
+        world.step(keys, clicks)
+        buffer.record(world)
+    detour(world, back, buffer)
+    assert state_digest(world) != digests[TICKS - 1]
+    buffer.rewind(world, back)
+    assert state_digest(world) == digests[TICKS - 1]
+    for keys, clicks in inputs[TICKS:]:
+        world.step(keys, clicks)
+        buffer.record(world)
+    assert state_digest(world) == digests[-1]
+
+
+def test_save_load_then_continue():
+    inputs, digests = reference(TICKS + MORE)
+    world = World(SEED)
+    for keys, clicks in inputs[:TICKS]:
+        world.step(keys, clicks)
+    data = save_state(world)
+    detour(world, 60)
+    load_state(world, data)
+    assert state_digest(world) == digests[TICKS - 1]
+    # Загрузка в другой мир дает ту же игру
+    other = World(SEED + 1)
+    load_state(other, data)
+    for keys, clicks in inputs[TICKS:]:
+        world.step(keys, clicks)
+        other.step(keys, clicks)
+    assert state_digest(world) == state_digest(other) == digests[-1]
+
+
+def test_history_must_hold_a_keyframe():
+    with pytest.raises(ValueError):
+        RewindBuffer(seconds=0.25, keyframe=30)
+    # Кольцо ровно на один интервал ключевых кадров: старые разности
+    # вытесняются вместе со своим ключевым кадром
+    buffer = RewindBuffer(seconds=0.5, keyframe=30)
+    inputs, digests = reference(100)
+    world = World(SEED)
+    for keys, clicks in inputs:
+        world.step(keys, clicks)
+        buffer.record(world)
+        assert buffer.frames[0][4]
+    length = len(buffer)
+    assert 0 < length <= 30
+    buffer.rewind(world, length - 1)
+    assert state_digest(world) == digests[100 - length]
+    assert buffer.stats()["kb"] < 1024
@@ -0,0 +1,101 @@
+# Сетка широкой фазы против полного перебора на случайных раскладках:
+# и с сеткой, и на пути перебора для малого числа объектов
+import math
+import random
+
+import pytest
+
+from spatial import SpatialHash, contact_time, BRUTE_FORCE_LIMIT
+
+SIZES = [1, 5, BRUTE_FORCE_LIMIT, BRUTE_FORCE_LIMIT + 1, 300]
+
+
+def layout(seed, n, moving):
+    # Объекты по арене с запасом за краями (отрицательные клетки); смещения
+    # за шаг бывают больше клетки
+    rng = random.Random(seed)
+    xs = [rng.uniform(-200, 1000) for _ in range(n)]
+    ys = [rng.uniform(-200, 800) for _ in range(n)]
+    radii = [rng.choice([2, 5, 15, 40]) for _ in range(n)]
+    ids = rng.sample(range(10 * n), n)
+    if moving:
+        starts = ([x - rng.uniform(-90, 90) for x in xs], [y - rng.uniform(-90, 90) for y in ys])
+    else:
+        starts = None
+    grid = SpatialHash()
+    grid.build(xs, ys, radii, ids, starts)
+    objects = list(zip(ids, xs, ys, radii, *(starts or (xs, ys))))
+    return grid, objects, rng
+
+
+def points(rng, count=60):
+    return [(rng.uniform(-250, 1050), rng.uniform(-250, 850), rng.choice([0, 5, 30, 120])) for _ in range(count)]
+
+
+@pytest.mark.parametrize("moving", [False, True])
+@pytest.mark.parametrize("n", SIZES)
+def test_query_matches_brute_force(n, moving):
+    grid, objects, rng = layout(n, n, moving)
+    assert grid.brute == (n <= BRUTE_FORCE_LIMIT)
+    for x, y, r in points(rng):
+        for padded in (True, False):
+            expected = [i for i, ox, oy, orad, _, _ in objects
+                        if (ox - x) ** 2 + (oy - y) ** 2 < (r + orad if padded else r) ** 2]
+            assert sorted(grid.query(x, y, r, padded)) == sorted(expected)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_query_swept_matches_brute_force(n):
+    grid, objects, rng = layout(100 + n, n, True)
+    for x, y, r in points(rng):
+        angle = rng.uniform(0, 2 * math.pi)
+        length = rng.choice([0, 10, 60, 250])
+        x1, y1 = x + math.cos(angle) * length, y + math.sin(angle) * length
+        expected = []
+        for i, ox, oy, orad, sx, sy in objects:
+            t = contact_time(x - sx, y - sy, x1 - x - (ox - sx), y1 - y - (oy - sy), r + orad)
+            if t is not None:
+                expected.append((t, i))
+        found = grid.query_swept(x, y, x1, y1, r)
+        assert [i for _, i in found] == [i for _, i in sorted(expected)]
+        assert [t for t, _ in found] == pytest.approx([t for t, _ in sorted(expected)])
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_query_ahead_matches_brute_force(n):
+    grid, objects, rng = layout(200 + n, n, True)
+    for x, y, r in points(rng):
+        horizon = rng.choice([1, 5, 10])
+        expected = []
+        for i, ox, oy, _, sx, sy in objects:
+            dx, dy = (ox - sx) * horizon, (oy - sy) * horizon
+            t = contact_time(ox - x, oy - y, dx, dy, r)
+            # Уже близкие, но удаляющиеся не в счет
+            if t is not None and (t > 0 or (ox - x) * dx + (oy - y) * dy < 0):
+                expected.append((t * horizon, i))
+        found = grid.query_ahead(x, y, r, horizon)
+        assert [i for _, i in found] == [i for _, i in sorted(expected)]
+        assert [t for t, _ in found] == pytest.approx([t for t, _ in sorted(expected)])
+
+
+def test_cell_size_does_not_change_results():
+    _, objects, rng = layout(7, 300, True)
+    ids, xs, ys, radii, sx, sy = (list(column) for column in zip(*objects))
+    grids = []
+    for cell_size in (8, 64, 500):
+        grid = SpatialHash(cell_size)
+        grid.build(xs, ys, radii, ids, (sx, sy))
+        grids.append(grid)
+    for x, y, r in points(rng):
+        results = [(sorted(grid.query(x, y, r)), grid.query_swept(x, y, x + 40, y - 30, r),
+                    grid.query_ahead(x, y, r, 5)) for grid in grids]
+        assert results[1] == results[0] and results[2] == results[0]
+
+
+def test_empty_grid():
+    grid = SpatialHash()
+    grid.build([], [])
+    assert len(grid) == 0
+    assert grid.query(0, 0, 100) == []
+    assert grid.query_swept(0, 0, 100, 0, 10) == []
+    assert grid.query_ahead(0, 0, 10, 5) == []
@@ -0,0 +1,140 @@
+# Столкновения по пути за шаг: время касания, сетка и мир на редком шаге
+import math
+import random
+
+import numpy as np
+import pytest
+
+from effects import EXPLOSION_TIME
+from entities import Enemy
+from projectiles import EXPLOSIVE
+from spatial import SpatialHash, contact_time, contact_times, BRUTE_FORCE_LIMIT
+from world import World, Controls
+
+
+def test_contact_time_head_on():
+    # Круги радиусов 5 и 5 в 100 друг от друга, сближение на 200 за шаг
+    assert contact_time(-100, 0, 200, 0, 10) == pytest.approx(0.45)
+
+
+def test_contact_time_misses():
+    assert contact_time(-100, 20, 200, 0, 10) is None  # Проходит мимо
+    assert contact_time(-100, 0, -200, 0, 10) is None  # Удаляется
+    assert contact_time(-100, 0, 50, 0, 10) is None  # Не успевает за шаг
+    assert contact_time(3, 4, 1, 0, 10) == 0.0  # Уже касаются
+
+
+def test_contact_times_matches_scalar():
+    rng = random.Random(1)
+    cases = [[rng.uniform(-60, 60) for _ in range(4)] for _ in range(500)]
+    px, py, dx, dy = (np.array(column) for column in zip(*cases))
+    times = contact_times(px, py, dx, dy, 20)
+    for (x, y, vx, vy), t in zip(cases, times.tolist()):
+        expected = contact_time(x, y, vx, vy, 20)
+        assert (math.isinf(t) if expected is None else t == pytest.approx(expected))
+
+
+def bullets_grid(count, x0, x1, y=0.0):
+    # count одинаковых пуль, летящих за шаг из x0 в x1 (остальные далеко)
+    grid = SpatialHash()
+    xs = [x1] + [1000.0 + 40 * i for i in range(count - 1)]
+    starts = ([x0] + xs[1:], [y] * count)
+    grid.build(xs, [y] * count, 5, starts=starts)
+    return grid
+
+
+@pytest.mark.parametrize("count", [1, BRUTE_FORCE_LIMIT + 10])
+def test_query_swept_catches_tunnelling(count):
+    # Пуля пролетает врага радиуса 5 целиком за один шаг: в начале и в конце
+    # шага она далеко, обычный запрос ее не видит
+    grid = bullets_grid(count, -60, 60)
+    assert grid.query(0, 0, 5) == []
+    [(t, index)] = grid.query_swept(0, 0, 0, 0, 5)
+    assert index == 0
+    assert t == pytest.approx(50 / 120)
+
+
+@pytest.mark.parametrize("count", [1, BRUTE_FORCE_LIMIT + 10])
+def test_query_swept_moving_target(count):
+    # Враг уходит с пути пули раньше, чем она долетает
+    grid = bullets_grid(count, -60, 60)
+    assert grid.query_swept(0, 0, 0, 100, 5) == []
+    assert grid.query_swept(10, 0, 200, 0, 5) == []  # Убегает быстрее пули
+    assert len(grid.query_swept(-20, 0, 20, 0, 5)) == 1  # Догоняется
+
+
+def test_query_swept_orders_by_time():
+    grid = SpatialHash()
+    starts = ([0.0, -50.0, -10.0], [0.0, 0.0, 0.0])
+    grid.build([100.0, 150.0, 90.0], [0.0, 0.0, 0.0], 5, ids=[9, 8, 7], starts=starts)
+    found = grid.query_swept(50, 0, 50, 0, 5)
+    assert [index for _, index in found] == [9, 8, 7]
+    assert [t for t, _ in found] == sorted(t for t, _ in found)
+
+
+@pytest.mark.parametrize("count", [1, BRUTE_FORCE_LIMIT + 10])
+def test_query_ahead(count):
+    # Пуля летит по 10 за шаг: через 5 шагов пройдет в 10 от точки (60, 10)
+    grid = bullets_grid(count, -10, 0)
+    [(steps, index)] = grid.query_ahead(60, 10, 20, 10)
+    assert index == 0
+    assert steps == pytest.approx(6 - math.sqrt(300) / 10)
+    assert grid.query_ahead(60, 10, 20, 3) == []  # Не успевает
+    assert grid.query_ahead(-30, 0, 20, 10) == []  # Удаляется
+
+
+def quiet_world(tick_rate):
+    world = World(1, tick_rate=tick_rate)
+    world.spawning = False
+    return world
+
+
+def add_enemy(world, x, y, radius=15, health=10):
+    enemy = world.pool.acquire(Enemy, world.rng)
+    enemy.x, enemy.y, enemy.speed, enemy.radius, enemy.health = x, y, 0, radius, health
+    world.enemies.append(enemy)
+    return enemy
+
+
+@pytest.mark.parametrize("swept, kills", [(True, 1), (False, 0)])
+def test_world_bullet_through_small_enemy(swept, kills):
+    # 12 шагов в секунду: пуля пролетает 50 px за шаг, враг радиуса 2
+    # попадает между двумя ее положениями
+    world = quiet_world(12)
+    world.swept = swept
+    player = world.player
+    add_enemy(world, player.x + 25, player.y, radius=2)
+    world.step(Controls(), ((1, player.x + 200, player.y),))
+    world.step(Controls())
+    assert world.kills["Enemy"] == kills
+
+
+def test_world_hit_goes_to_first_enemy_on_path():
+    # Враги добавлены в обратном порядке: пуля достается ближнему
+    world = quiet_world(12)
+    player = world.player
+    far = add_enemy(world, player.x + 80, player.y, radius=5)
+    near = add_enemy(world, player.x + 30, player.y, radius=5)
+    hits = []
+    world.emit_hit = lambda i: hits.append((world.projectiles.x[i], world.projectiles.y[i]))
+    world.step(Controls(), ((1, player.x + 200, player.y),))
+    assert near not in world.enemies
+    assert far in world.enemies
+    # Пуля перенесена в точку касания (move_to_contact)
+    [(x, y)] = hits
+    assert x == pytest.approx(player.x + 20)
+    assert y == pytest.approx(player.y)
+
+
+@pytest.mark.parametrize("tick_rate", [60, 30, 20])
+def test_explosion_damage_does_not_depend_on_tick_rate(tick_rate):
+    world = quiet_world(tick_rate)
+    player = world.player
+    enemy = add_enemy(world, player.x + 150, player.y, health=10 ** 6)
+    # Граната уже у цели: взрывается на первом шаге
+    world.projectiles.spawn(player.x + 150, player.y + 40, radius=10, kind=EXPLOSIVE, timer=EXPLOSION_TIME,
+                            tx=player.x + 150, ty=player.y + 40, blast=100, contact=False)
+    for _ in range(60):
+        world.step(Controls())
+    assert world.projectiles.count == 0
+    assert 10 ** 6 - enemy.health == 20 * EXPLOSION_TIME
@@ -0,0 +1,590 @@
+# Симуляция игры без привязки к окну: мир обновляется по одному тику
+import random
+import time
+
+import numpy as np
+import pygame
+
+from settings import ARENA_WIDTH, ARENA_HEIGHT, TICK_RATE
+from projectiles import ProjectilePool, NORMAL
+from effects import EXPLOSION_TIME
+from spatial import SpatialHash
+from enemy_ai import EnemyStore
+from profiler import no_mark
+from camera import Camera
+from navigation import ObstacleMap, FlowField, wall_count
+from pools import EntityPool, swap_remove
+from entities import (Player, Enemy, DrunkenMaster, Sniper, Medkit, SpecialAttackItem,
+                      DODGE_RANGE, DODGE_DISTANCE, DODGE_LOOKAHEAD)
+
+PLAYER_SPACING = 60  # Расстояние между игроками в начале совместной игры
+
+
+# Состояние клавиш WASD для симуляции без клавиатуры
+class Controls:
+    def __init__(self, left=False, right=False, up=False, down=False):
+        self.left = left
+        self.right = right
+        self.up = up
+        self.down = down
+
+    @classmethod
+    def from_keys(cls, keys):
+        return cls(keys[pygame.K_a], keys[pygame.K_d], keys[pygame.K_w], keys[pygame.K_s])
+
+    def __getitem__(self, key):
+        if key == pygame.K_a:
+            return self.left
+        if key == pygame.K_d:
+            return self.right
+        if key == pygame.K_w:
+            return self.up
+        if key == pygame.K_s:
+            return self.down
+        return False
+
+
+SPAWN_FIELDS = ("enemy_interval", "drunken_after", "drunken_chance", "sniper_after",
+                "sniper_chance", "item_interval", "medkit_chance")
+ENEMY_TYPES = ("Enemy", "DrunkenMaster", "Sniper")
+
+
+# Настройки появления врагов и предметов (в тиках и вероятностях)
+class SpawnRules:
+    def __init__(self, enemy_interval=60, drunken_after=1800, drunken_chance=0.3,
+                 sniper_after=2700, sniper_chance=0.2, item_interval=600, medkit_chance=0.7):
+        self.enemy_interval = enemy_interval
+        self.drunken_after = drunken_after
+        self.drunken_chance = drunken_chance
+        self.sniper_after = sniper_after
+        self.sniper_chance = sniper_chance
+        self.item_interval = item_interval
+        self.medkit_chance = medkit_chance
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in SPAWN_FIELDS}
+
+
+class World:
+    def __init__(self, seed=None, rules=None, arena=(ARENA_WIDTH, ARENA_HEIGHT), walls=0, players=1,
+                 tick_rate=TICK_RATE, swept=True):
+        # Все случайные события мира идут через его собственные генераторы,
+        # поэтому один и тот же seed и ввод дают один и тот же результат
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        # Шаг мира - dt тиков по 1/60 с: скорости и таймеры заданы в тиках,
+        # поэтому без окна мир можно считать и реже, 20-30 раз в секунду
+        if tick_rate <= 0 or TICK_RATE % tick_rate:
+            raise ValueError(f"tick_rate must divide {TICK_RATE}")
+        self.dt = TICK_RATE // tick_rate
+        # Столкновения с учетом пути за шаг (swept) или только по положениям
+        # в конце шага, как в записях до версии 4
+        self.swept = swept
+        self.rng = random.Random(self.seed)
+        self.rules = rules if rules is not None else SpawnRules()
+        self.sniper_count = 0  # Номер последнего снайпера (владельца пуль)
+        self.projectiles = ProjectilePool()
+        self.camera = Camera(*arena)
+        width, height = self.camera.arena_width, self.camera.arena_height
+        # Стены: walls штук на площадь экрана; у них свой генератор, чтобы
+        # появление врагов не зависело от карты
+        self.walls = walls
+        self.obstacles = ObstacleMap.generate(width, height, wall_count(width, height, walls),
+                                              random.Random(f"walls-{self.seed}"), clear=(width // 2, height // 2))
+        self.flow = FlowField(self.obstacles) if self.obstacles.walls else None
+        # Совместная игра: players игроков рядом с центром арены; камера,
+        # запись и перемотка работают с первым из них
+        self.players = []
+        for index in range(players):
+            player = Player(self.projectiles, (width, height), self.obstacles if self.flow else None)
+            player.x += (2 * index - players + 1) * PLAYER_SPACING // 2
+            self.players.append(player)
+        self.player = self.players[0]
+        self.camera.follow(self.player.x, self.player.y)
+        self.spawn_camera = Camera(*arena)  # Экран другого игрока при появлении врагов
+        self.enemies = EnemyStore(rng=np.random.default_rng(self.seed))
+        self.pool = EntityPool()  # Погибшие враги и подобранные предметы
+        self.medkits = []
+        self.special_items = []
+        self.score = 0
+        self.kills = dict.fromkeys(ENEMY_TYPES, 0)  # Убитые игроком враги по типам
+        self.game_time = 0
+        self.enemy_spawn_timer = 0
+        self.item_spawn_timer = 0
+        self.running = True
+        self.spawning = True  # Появление новых врагов и предметов
+        # Сетки широкой фазы: перестраиваются каждый тик
+        self.enemy_grid = SpatialHash()
+        self.shot_grid = SpatialHash()
+        self.enemy_shot_grid = SpatialHash()
+        self.item_grid = SpatialHash()
+        self.removed = set()
+        # Положения игроков и врагов в начале шага для swept-столкновений
+        self.player_starts = []
+        self.enemy_starts = None
+        # Частицы только для отрисовки: мир их создает по событиям, но от них
+        # ничего не зависит (без окна - None)
+        self.particles = None
+        # Отметки профилировщика (по умолчанию ничего не делают)
+        self.mark = no_mark
+
+    def step(self, keys, clicks=()):
+        # clicks - нажатия мыши за тик: (кнопка, x, y)
+        self.step_players(((keys, clicks),))
+
+    def step_players(self, inputs):
+        # Тик совместной игры: inputs - (клавиши, нажатия) каждого игрока по порядку
+        mark = self.mark
+        self.handle_input(inputs)
+        mark("player")
+        self.spawn()
+        mark("spawn")
+        self.update_items()
+        mark("items")
+        self.move_enemies()
+        mark("enemy_move")
+        self.collide()
+        mark("collision")
+        self.update_particles()
+        mark("particles")
+
+    def handle_input(self, inputs):
+        dt = self.dt
+        self.player_starts = [(player.x, player.y) for player in self.players]
+        for player, (keys, clicks) in zip(self.players, inputs):
+            if player.health <= 0:
+                continue  # Выбывший в совместной игре игрок
+            for button, x, y in clicks:
+                if button == 1:  # Левая кнопка мыши
+                    player.shoot(x, y)
+                elif button == 3 and player.special_attacks > 0:  # Правая кнопка мыши
+                    player.use_special_attack(x, y)
+
+            # Управление игроком
+            player.move(keys, dt)
+            player.update(dt)
+        self.camera.follow(self.player.x, self.player.y)
+        if len(self.players) == 1:
+            self.projectiles.update(self.camera.active_bounds(), dt)
+        else:
+            # Игроки могут быть в разных концах арены: пули живут на всей арене
+            self.projectiles.update((0, 0, self.camera.arena_width, self.camera.arena_height), dt)
+        if self.flow is not None:
+            self.stop_bullets()
+
+    def spawn(self):
+        # Обновление времени игры
+        self.game_time += self.dt
+        if not self.spawning:
+            return
+
+        rules = self.rules
+        view = self.spawn_view()  # Враги появляются за краем экрана, предметы - на экране
+        # Спавн врагов
+        self.enemy_spawn_timer += self.dt
+        if self.enemy_spawn_timer >= rules.enemy_interval:  # По умолчанию каждую секунду
+            # После 30 секунд появляется пьяный мастер (30% шанс)
+            if self.game_time >= rules.drunken_after and self.rng.random() < rules.drunken_chance:
+                self.enemies.append(self.pool.acquire(DrunkenMaster, self.rng, view))
+            # После 45 секунд появляется снайпер (20% шанс)
+            elif self.game_time >= rules.sniper_after and self.rng.random() < rules.sniper_chance:
+                self.enemies.append(self.pool.acquire(Sniper, self.projectiles, self.rng, self.next_sniper_id(), view))
+            else:
+                self.enemies.append(self.pool.acquire(Enemy, self.rng, view))
+            self.enemy_spawn_timer -= rules.enemy_interval
+
+        # Спавн предметов
+        self.item_spawn_timer += self.dt
+        if self.item_spawn_timer >= rules.item_interval:  # Каждые 10 секунд
+            if self.rng.random() < rules.medkit_chance:  # 70% шанс на аптечку
+                item = self.pool.acquire(Medkit, self.rng, view)
+                self.medkits.append(item)
+            else:  # 30% шанс на спец атаку
+                item = self.pool.acquire(SpecialAttackItem, self.rng, view)
+                self.special_items.append(item)
+            if self.flow is not None:
+                item.x, item.y = self.obstacles.nearest_free(item.x, item.y)
+            self.item_spawn_timer -= rules.item_interval
+
+    def spawn_view(self):
+        # Видимая область, у которой появляются враги и предметы; в совместной
+        # игре - экран каждого живого игрока по очереди
+        if len(self.players) == 1:
+            return self.camera.view()
+        living = self.living_players()
+        player = living[self.game_time // self.dt % len(living)]
+        self.spawn_camera.follow(player.x, player.y)
+        return self.spawn_camera.view()
+
+    def player_start(self, player):
+        # Положение игрока в начале шага
+        if len(self.player_starts) != len(self.players):
+            return player.x, player.y
+        return self.player_starts[self.players.index(player)]
+
+    def living_players(self):
+        # Хотя бы один игрок, чтобы врагам было за кем идти
+        return [player for player in self.players if player.health > 0] or self.players[:1]
+
+    def next_sniper_id(self):
+        self.sniper_count += 1
+        return self.sniper_count
+
+    def stop_bullets(self):
+        # Пули (но не гранаты) исчезают в стенах
+        projectiles = self.projectiles
+        n = projectiles.count
+        normal = projectiles.alive[:n] & (projectiles.kind[:n] == NORMAL)
+        x, y = projectiles.x[:n], projectiles.y[:n]
+        stopped = normal & self.obstacles.blocked_at(x, y)
+        if self.dt > 1:
+            # За длинный шаг пуля может перескочить угол стены: проверяем и середину пути
+            half = self.dt / 2
+            stopped |= normal & self.obstacles.blocked_at(x - projectiles.vx[:n] * half,
+                                                          y - projectiles.vy[:n] * half)
+        projectiles.alive[:n] &= ~stopped
+        if self.particles is not None:
+            for i in np.flatnonzero(stopped).tolist():
+                self.particles.dust(projectiles.x[i], projectiles.y[i], projectiles.vx[i], projectiles.vy[i])
+
+    def update_items(self):
+        for items in (self.medkits, self.special_items):
+            for index in range(len(items) - 1, -1, -1):
+                item = items[index]
+                item.update(self.dt)
+                if not item.active:
+                    swap_remove(items, index)
+                    self.pool.release(item)
+
+        # Проверка подбора аптечек и гранат
+        if not self.medkits and not self.special_items:
+            return
+        items = [item for item in self.medkits + self.special_items if item.visible]
+        self.item_grid.build_objects(items)
+        for player in self.living_players():
+            if self.swept:
+                # Предметы на всем пути игрока за шаг
+                x0, y0 = self.player_start(player)
+                found = [index for _, index in self.item_grid.query_swept(x0, y0, player.x, player.y,
+                                                                          player.radius)]
+            else:
+                found = self.item_grid.query(player.x, player.y, player.radius)
+            for index in found:
+                item = items[index]
+                if not item.active:
+                    continue  # Уже подобран другим игроком
+                item.active = False
+                if isinstance(item, Medkit):
+                    player.health = min(player.max_health, player.health + item.heal_amount)
+                    owner = self.medkits
+                else:
+                    player.special_attacks += 1
+                    owner = self.special_items
+                swap_remove(owner, owner.index(item))
+                self.pool.release(item)
+
+    def move_enemies(self):
+        # Движение всех врагов одним пакетом
+        # Далекие от экрана враги двигаются упрощенно (только на большой арене);
+        # поле направлений пересчитывается, только когда игрок сменил клетку
+        living = self.living_players()
+        enemies = self.enemies
+        if self.swept:
+            n = len(enemies)
+            self.enemy_starts = (enemies.x[:n].copy(), enemies.y[:n].copy())
+        if self.flow is not None:
+            # Поле строится от одного игрока: в совместной игре - от первого живого
+            self.flow.update(living[0].x, living[0].y)
+        if len(self.players) == 1:
+            enemies.update(self.player.x, self.player.y, self.projectiles, self.camera.far_bounds(), self.flow,
+                           self.dt)
+            return
+        # Каждый враг идет к ближайшему живому игроку
+        target_x, target_y = nearest_players(living, enemies)
+        enemies.update(target_x, target_y, self.projectiles, None, self.flow, self.dt)
+
+    def update_particles(self):
+        if self.particles is not None:
+            self.particles.update()
+
+    def remove_enemy(self, enemy):
+        if self.particles is not None:
+            self.particles.death(enemy.x, enemy.y)
+        self.enemies.remove(enemy)
+        self.removed.add(id(enemy))
+        if isinstance(enemy, Sniper):
+            self.projectiles.kill_owner(enemy.owner)
+        self.pool.release(enemy)
+
+    def kill_enemy(self, enemy, points):
+        self.remove_enemy(enemy)
+        self.score += points
+        self.kills[type(enemy).__name__] += 1
+
+    def emit_hit(self, i):
+        if self.particles is not None:
+            projectiles = self.projectiles
+            self.particles.hit(projectiles.x[i], projectiles.y[i], projectiles.vx[i], projectiles.vy[i])
+
+    def collide(self):
+        self.removed.clear()
+        if self.swept:
+            self.collide_swept()
+        else:
+            self.collide_discrete()
+        if all(player.health <= 0 for player in self.players):
+            self.running = False
+
+    def collide_discrete(self):
+        # Столкновения по положениям в конце шага (записи до версии 4)
+        players = self.living_players()
+        enemies = self.enemies
+        projectiles = self.projectiles
+
+        # Широкая фаза: раскладываем врагов и пули по сеткам
+        alive = enemies[:]
+        count = len(alive)
+        self.enemy_grid.build(enemies.x[:count], enemies.y[:count], enemies.radius[:count])
+        shots, enemy_shots, grenades = projectiles.partition()
+        self.shot_grid.build(projectiles.x[shots], projectiles.y[shots], projectiles.radius[shots], shots)
+        self.enemy_shot_grid.build(projectiles.x[enemy_shots], projectiles.y[enemy_shots],
+                                   projectiles.radius[enemy_shots], enemy_shots)
+
+        # Проверка столкновения с игроками
+        for player in players:
+            for index in self.enemy_grid.query(player.x, player.y, player.radius):
+                if id(alive[index]) not in self.removed:
+                    player.health -= 10
+                    self.remove_enemy(alive[index])
+
+        # Проверка попадания пуль игрока
+        for enemy in enemies[:]:
+            if isinstance(enemy, DrunkenMaster):
+                # Пьяный мастер пытается увернуться от первых двух пуль
+                reach = DODGE_RANGE if enemy.dodge_count > 0 else enemy.radius
+                for i in self.shot_grid.query(enemy.x, enemy.y, reach):
+                    if not projectiles.alive[i]:
+                        continue
+                    if enemy.dodge_count > 0:
+                        if enemy.check_bullet_dodge(projectiles.x[i], projectiles.y[i],
+                                                    projectiles.vx[i], projectiles.vy[i]):
+                            continue  # Пропускаем проверку попадания, если уворот успешен
+
+                    dx = projectiles.x[i] - enemy.x
+                    dy = projectiles.y[i] - enemy.y
+                    limit = projectiles.radius[i] + enemy.radius
+                    if dx * dx + dy * dy < limit * limit:
+                        enemy.health -= 10
+                        projectiles.kill(i)
+                        self.emit_hit(i)
+                        if enemy.health <= 0:
+                            self.kill_enemy(enemy, 15)
+                        break
+            else:
+                for i in self.shot_grid.query(enemy.x, enemy.y, enemy.radius):
+                    if projectiles.alive[i]:
+                        enemy.health -= 10
+                        projectiles.kill(i)
+                        self.emit_hit(i)
+                        if enemy.health <= 0:
+                            self.kill_enemy(enemy, 10)
+                        break
+
+        # Гранаты: взрыв при касании и урон в радиусе взрыва (пьяный мастер уворачивается)
+        for i in grenades:
+            x, y = projectiles.x[i], projectiles.y[i]
+            if projectiles.contact[i] and not projectiles.exploded[i]:
+                for index in self.enemy_grid.query(x, y, projectiles.radius[i]):
+                    enemy = alive[index]
+                    if id(enemy) not in self.removed and not isinstance(enemy, DrunkenMaster):
+                        projectiles.exploded[i] = True
+                        break
+
+            if projectiles.exploded[i]:
+                if projectiles.timer[i] == EXPLOSION_TIME and self.particles is not None:
+                    self.particles.explosion(x, y, projectiles.blast[i])  # Первый тик взрыва
+                for index in self.enemy_grid.query(x, y, projectiles.blast[i], padded=False):
+                    enemy = alive[index]
+                    if id(enemy) in self.removed or isinstance(enemy, DrunkenMaster):
+                        continue
+                    enemy.health -= self.blast_damage(i)
+                    if enemy.health <= 0:
+                        self.kill_enemy(enemy, 15 if isinstance(enemy, Sniper) else 10)
+
+        # Проверка попадания пуль снайперов в игроков
+        for player in players:
+            for i in self.enemy_shot_grid.query(player.x, player.y, player.radius):
+                if projectiles.alive[i]:
+                    player.health -= 15
+                    projectiles.kill(i)
+                    if self.particles is not None:
+                        self.particles.wound(player.x, player.y)
+
+    def collide_swept(self):
+        # Столкновения по всему пути за шаг: круги движутся от положений в
+        # начале шага к текущим, касание находится с точным временем t (0-1),
+        # поэтому быстрые пули не пролетают врагов насквозь и при большом dt
+        players = self.living_players()
+        enemies = self.enemies
+        projectiles = self.projectiles
+        dt = self.dt
+
+        # Широкая фаза: враги и пули лежат в сетках вместе с путем за шаг
+        alive = enemies[:]
+        count = len(alive)
+        ex, ey = enemies.x[:count], enemies.y[:count]
+        starts = self.enemy_starts
+        if starts is None or len(starts[0]) != count:
+            starts = (ex, ey)  # Враги еще не двигались
+        self.enemy_grid.build(ex, ey, enemies.radius[:count], starts=starts)
+        shots, enemy_shots, grenades = projectiles.partition()
+        self.build_shots(self.shot_grid, shots)
+        self.build_shots(self.enemy_shot_grid, enemy_shots)
+
+        # Проверка столкновения с игроками
+        for player in players:
+            x0, y0 = self.player_start(player)
+            for _, index in self.enemy_grid.query_swept(x0, y0, player.x, player.y, player.radius):
+                if id(alive[index]) not in self.removed:
+                    player.health -= 10
+                    self.remove_enemy(alive[index])
+
+        # Пьяный мастер уворачивается от первых двух пуль, которые по прогнозу
+        # пролетят рядом с ним; от увернувшегося эта пуля в этот шаг не попадает
+        dodged = set()
+        for index, enemy in enumerate(alive):
+            if (isinstance(enemy, DrunkenMaster) and enemy.dodge_count > 0 and enemy.dodge_timer <= 0
+                    and id(enemy) not in self.removed):
+                for _, i in self.shot_grid.query_ahead(enemy.x, enemy.y, DODGE_DISTANCE, DODGE_LOOKAHEAD / dt):
+                    if projectiles.alive[i]:
+                        enemy.dodge(projectiles.vx[i], projectiles.vy[i])
+                        dodged.add((index, i))
+                        break
+
+        # Попадания пуль игрока: все касания за шаг по порядку времени, каждая
+        # пуля достается первому задетому врагу
+        hits = []
+        if len(self.shot_grid):
+            paths = zip(starts[0].tolist(), starts[1].tolist(), ex.tolist(), ey.tolist(),
+                        enemies.radius[:count].tolist())
+            for index, (x0, y0, x1, y1, radius) in enumerate(paths):
+                for t, i in self.shot_grid.query_swept(x0, y0, x1, y1, radius):
+                    if (index, i) not in dodged:
+                        hits.append((t, index, i))
+        hits.sort()
+        for t, index, i in hits:
+            enemy = alive[index]
+            if not projectiles.alive[i] or id(enemy) in self.removed:
+                continue
+            enemy.health -= 10
+            projectiles.kill(i)
+            self.move_to_contact(i, t)
+            self.emit_hit(i)
+            if enemy.health <= 0:
+                self.kill_enemy(enemy, 15 if isinstance(enemy, DrunkenMaster) else 10)
+
+        # Гранаты: взрыв в точке касания и урон в радиусе взрыва (пьяный мастер уворачивается)
+        for i in grenades:
+            if projectiles.contact[i] and not projectiles.exploded[i]:
+                x, y = projectiles.x[i], projectiles.y[i]
+                x0, y0 = x - projectiles.vx[i] * dt, y - projectiles.vy[i] * dt
+                for t, index in self.enemy_grid.query_swept(x0, y0, x, y, projectiles.radius[i]):
+                    enemy = alive[index]
+                    if id(enemy) not in self.removed and not isinstance(enemy, DrunkenMaster):
+                        projectiles.exploded[i] = True
+                        self.move_to_contact(i, t)
+                        projectiles.vx[i] = projectiles.vy[i] = 0
+                        break
+
+            if projectiles.exploded[i]:
+                x, y = projectiles.x[i], projectiles.y[i]
+                if projectiles.timer[i] == EXPLOSION_TIME and self.particles is not None:
+                    self.particles.explosion(x, y, projectiles.blast[i])  # Первый тик взрыва
+                for index in self.enemy_grid.query(x, y, projectiles.blast[i], padded=False):
+                    enemy = alive[index]
+                    if id(enemy) in self.removed or isinstance(enemy, DrunkenMaster):
+                        continue
+                    enemy.health -= self.blast_damage(i)
+                    if enemy.health <= 0:
+                        self.kill_enemy(enemy, 15 if isinstance(enemy, Sniper) else 10)
+
+        # Проверка попадания пуль снайперов в игроков
+        for player in players:
+            x0, y0 = self.player_start(player)
+            for t, i in self.enemy_shot_grid.query_swept(x0, y0, player.x, player.y, player.radius):
+                if projectiles.alive[i]:
+                    player.health -= 15
+                    projectiles.kill(i)
+                    if self.particles is not None:
+                        self.particles.wound(player.x, player.y)
+
+    def blast_damage(self, i):
+        # Урон взрыва за шаг: 20 за каждый тик взрыва в этом шаге (таймер идет
+        # от EXPLOSION_TIME до 1), поэтому за весь взрыв урон не зависит от dt
+        timer = int(self.projectiles.timer[i])
+        return 20 * (min(timer + self.dt - 1, EXPLOSION_TIME) - max(timer, 1) + 1)
+
+    def build_shots(self, grid, shots):
+        # Пуля в начале шага была на vx*dt, vy*dt позади
+        if not shots:
+            grid.build((), ())
+            return
+        projectiles = self.projectiles
+        shots = np.asarray(shots)
+        x, y = projectiles.x[shots], projectiles.y[shots]
+        starts = (x - projectiles.vx[shots] * self.dt, y - projectiles.vy[shots] * self.dt)
+        grid.build(x, y, projectiles.radius[shots], shots, starts)
+
+    def move_to_contact(self, i, t):
+        # Снаряд переносится в точку касания (t - доля шага)
+        back = (1 - t) * self.dt
+        projectiles = self.projectiles
+        projectiles.x[i] -= projectiles.vx[i] * back
+        projectiles.y[i] -= projectiles.vy[i] * back
+
+
+def nearest_players(players, enemies):
+    # Координаты ближайшего из players игрока для каждого врага
+    n = len(enemies)
+    px = np.array([player.x for player in players], np.float64)
+    py = np.array([player.y for player in players], np.float64)
+    dx = px[:, None] - enemies.x[:n]
+    dy = py[:, None] - enemies.y[:n]
+    nearest = (dx * dx + dy * dy).argmin(axis=0)
+    return px[nearest], py[nearest]
+
+
+# Простой бот: стоит на месте и стреляет в ближайшего врага
+def nearest_enemy_policy(world):
+    player = world.player
+    n = len(world.enemies)
+    clicks = ()
+    if n:
+        dx = world.enemies.x[:n] - player.x
+        dy = world.enemies.y[:n] - player.y
+        i = int((dx * dx + dy * dy).argmin())
+        clicks = ((1, int(world.enemies.x[i]), int(world.enemies.y[i])),)
+    return Controls(), clicks
+
+
+def run_headless(ticks, policy=nearest_enemy_policy, world=None):
+    # Прогон без окна с максимальной скоростью; ticks и done - в тиках
+    # по 1/60 с, даже если мир считается реже (World.tick_rate)
+    world = world if world is not None else World()
+    start = time.perf_counter()
+    done = 0
+    while done < ticks and world.running:
+        keys, clicks = policy(world)
+        world.step(keys, clicks)
+        done += world.dt
+    elapsed = time.perf_counter() - start
+    return world, done, elapsed
+
+
+if __name__ == "__main__":
+    import sys
+
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    tick_rate = int(sys.argv[2]) if len(sys.argv) > 2 else TICK_RATE
+    world, done, elapsed = run_headless(ticks, world=World(tick_rate=tick_rate))
+    print(f"{done} тиков за {elapsed:.2f} с ({done / max(elapsed, 1e-9):.0f} тиков/с), "
+          f"счет {world.score}, время {world.game_time // 60} с")